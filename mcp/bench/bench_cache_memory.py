@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Measure the memory of the resource cache per cached synset.
+
+Fills a cache with synthetic synsets shaped like the recorded synset-3047
+fixture (labels, definitions, hypernym, hyponym and sense lists pointing at
+other synsets of the same cache) and reports the bytes per synset held as
+parsed JSON-LD dicts, as the cache used to keep them, and as the compact
+EntityRecords it keeps now. Objects shared between entries, such as interned
+IDs and key tuples, are counted once. Also reports the time to compact an
+entity and to materialize it back into JSON-LD.
+
+Usage (from the mcp directory):
+    uv run bench/bench_cache_memory.py
+    uv run bench/bench_cache_memory.py --synsets 50000 --hyponyms 20
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dannet_mcp_server as server  # noqa: E402
+from stub_server import FIXTURES  # noqa: E402
+
+
+def deep_size(roots):
+    """Bytes of all objects reachable from roots, each counted once."""
+    seen, stack, total = set(), list(roots), 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, server.EntityRecord):
+            stack.extend((obj.keys, obj.values))
+    return total
+
+
+def synthetic_synsets(template, n, hyponyms, seed=0):
+    """n synsets as JSON strings, like the responses of /dannet/data/synset-N."""
+    rng = random.Random(seed)
+    ref = lambda: f"dn:synset-{rng.randrange(n)}"  # noqa: E731
+    words = ["hund", "kat", "hest", "bil", "hus", "træ", "bog", "stol", "sko", "vej"]
+    for i in range(n):
+        entity = dict(template)
+        entity["@id"] = f"dn:synset-{i}"
+        entity["rdfs:label"] = {"@value": f"{{{rng.choice(words)}_{i}§1}}", "@language": "da"}
+        entity["skos:definition"] = {"@value": " ".join(rng.choice(words) for _ in range(12)), "@language": "da"}
+        entity["wn:hypernym"] = ref()
+        entity["wn:hyponym"] = [ref() for _ in range(rng.randrange(1, 2 * hyponyms))]
+        entity["wn:ili"] = f"ili:i{rng.randrange(120000)}"
+        entity["ontolex:isEvokedBy"] = [f"dn:word-{rng.randrange(3 * n)}" for _ in range(rng.randrange(1, 4))]
+        entity["ontolex:lexicalizedSense"] = [f"dn:sense-{rng.randrange(3 * n)}" for _ in range(rng.randrange(1, 4))]
+        yield json.dumps(entity, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--synsets", type=int, default=10000, help="Synsets in the cache (default: 10000)")
+    parser.add_argument("--hyponyms", type=int, default=4, help="Mean hyponyms per synset (default: 4)")
+    args = parser.parse_args()
+
+    with open(FIXTURES, encoding="utf-8") as f:
+        template = next(e["body"] for e in json.load(f) if e["path"] == "/dannet/data/synset-3047")
+    # Every response is parsed on its own, so equal strings are separate objects in it
+    entities = [server.intern_context("bench", json.loads(body))
+                for body in synthetic_synsets(template, args.synsets, args.hyponyms)]
+
+    start = time.perf_counter()
+    records = [server.compact_entity(entity) for entity in entities]
+    compact_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for record in records:
+        server.materialize_entity(record)
+    materialize_time = time.perf_counter() - start
+    assert all(server.materialize_entity(r) == e for r, e in zip(records, entities))
+
+    before = deep_size(entities) / len(entities)
+    after = deep_size(records) / len(records)
+    print(f"{args.synsets} synsets, mean JSON size {sum(map(server.payload_size, entities)) / len(entities):.0f} bytes\n")
+    print(f"{'representation':<16} {'bytes/synset':>13}")
+    print(f"{'JSON-LD dicts':<16} {before:13.0f}")
+    print(f"{'EntityRecords':<16} {after:13.0f}  ({(after / before - 1) * 100:+.1f}%)")
+    print(f"\ncompact {compact_time / len(records) * 1e6:.1f} µs, "
+          f"materialize {materialize_time / len(records) * 1e6:.1f} µs per synset")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Measure speculative prefetch on a scripted agent session, against the stub server.
+
+Runs the same browsing session (word lookup, then its synsets, then their
+hypernyms and hyponyms) with prefetch off and with the given policy, and reports
+the session's tool latency and the prefetcher's figures: entities fetched,
+used by a later call, and wasted. Use it to tune --prefetch-policy,
+--prefetch-concurrency and --prefetch-rate.
+
+Usage (from the mcp directory):
+    uv run bench/bench_prefetch.py
+    uv run bench/bench_prefetch.py --policy get_word_synsets=3,get_synset_info=8 --think 200
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dannet_mcp_server as server  # noqa: E402
+from stub_server import StubDanNet, serve  # noqa: E402
+
+
+def session(loop, think):
+    """Browse like an agent would; returns the duration of each tool call."""
+    durations = []
+
+    def call(name, arguments):
+        start = time.perf_counter()
+        _, structured = loop.run_until_complete(server.mcp.call_tool(name, arguments))
+        durations.append(time.perf_counter() - start)
+        time.sleep(think)
+        # Results that are not JSON objects come wrapped as {"result": ...}
+        return structured["result"] if list(structured) == ["result"] else structured
+
+    results = call("get_word_synsets", {"query": "hund"})
+    synsets = [r["synset_id"] for r in (results if isinstance(results, list) else [])][:3]
+    for synset_id in synsets:
+        info = call("get_synset_info", {"synset_id": synset_id})
+        hypernym = info.get("wn:hypernym")
+        if isinstance(hypernym, str):
+            call("get_synset_info", {"synset_id": hypernym})
+        hyponyms = info.get("wn:hyponym", [])
+        for hyponym in (hyponyms if isinstance(hyponyms, list) else [hyponyms])[:2]:
+            call("get_synset_info", {"synset_id": hyponym})
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--policy", default=server.DEFAULT_PREFETCH_POLICY, help="Prefetch policy (TOOL=N,...)")
+    parser.add_argument("--concurrency", type=int, default=2, help="Prefetch concurrency (default: 2)")
+    parser.add_argument("--rate", type=float, default=10.0, help="Prefetch requests per second (default: 10)")
+    parser.add_argument("--latency", type=float, default=50.0, help="Injected stub latency per request (ms)")
+    parser.add_argument("--think", type=float, default=100.0, help="Agent think time between calls (ms)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    server.DATA_DIR = tempfile.mkdtemp(prefix="dannet-prefetch-")
+    httpd, base_url = serve(StubDanNet(latency=args.latency / 1000))
+    server.mcp.register_pending_tools()
+    loop = asyncio.new_event_loop()
+
+    print(f"{'prefetch':<10} {'calls':>5} {'total ms':>9} {'mean ms':>8} {'fetched':>8} {'used':>5} {'wasted':>6}")
+    for label, enabled in (("off", False), ("on", True)):
+        server.dannet_client = server.DanNetClient(base_url)
+        server._resource_cache.clear()
+        server.prefetcher = (server.Prefetcher(server.Prefetcher.parse_policy(args.policy), args.concurrency, args.rate)
+                             if enabled else None)
+        durations = session(loop, args.think / 1000)
+        line = f"{label:<10} {len(durations):5d} {sum(durations) * 1000:9.1f} {sum(durations) / len(durations) * 1000:8.1f}"
+        if server.prefetcher:
+            stats = server.prefetcher.stats()
+            line += f" {stats['fetched']:8d} {stats['used']:5d} {stats['fetched'] - stats['used']:6d}"
+        print(line)
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
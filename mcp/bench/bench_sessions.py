@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Check per-session server selection over HTTP, against two stub servers.
+
+Launches dannet_mcp_server.py --http pointed at stub A and opens two MCP
+sessions. One session stays on A while the other switches to stub B and back,
+and the script checks that
+- each session's tools use its own server,
+- switching neither changes the other session's server nor drops its cache
+  (a synset fetched before the switch is not requested from A again),
+- switching back to a server reuses the entries cached for it.
+Reports the latency of switch_dannet_server and the entity requests each stub
+received. Exits with status 1 when a check fails.
+
+Usage (from the mcp directory):
+    uv run bench/bench_sessions.py
+    uv run bench/bench_sessions.py --switches 200 --latency 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_tools import percentile  # noqa: E402
+from stub_server import StubDanNet, serve  # noqa: E402
+
+SERVER = os.path.join(os.path.dirname(__file__), "..", "dannet_mcp_server.py")
+
+
+class CountingStub(StubDanNet):
+    """A stub counting the entity requests it answers."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = Counter()
+
+    def respond(self, path, params):
+        if path.startswith("/dannet/data/"):
+            with self.lock:
+                self.requests[path] += 1
+        return super().respond(path, params)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def call(session, name, arguments):
+    result = await session.call_tool(name, arguments)
+    if result.isError:
+        raise RuntimeError(f"{name} failed: {result.content}")
+    return json.loads(result.content[0].text)
+
+
+async def run(mcp_url, stubs, switches):
+    a, b = stubs
+    synset = "/dannet/data/synset-3047"
+    checks = []
+
+    def check(name, ok):
+        checks.append((name, bool(ok)))
+
+    # The server's transport security only allows the bare host names
+    connect = lambda: streamablehttp_client(mcp_url, headers={"Host": "127.0.0.1"})  # noqa: E731
+    async with connect() as (r1, w1, _), connect() as (r2, w2, _):
+        async with ClientSession(r1, w1) as first, ClientSession(r2, w2) as second:
+            await first.initialize()
+            await second.initialize()
+
+            await call(first, "get_synset_info", {"synset_id": "synset-3047"})
+            check("first session fetched from A", a.requests[synset] == 1)
+
+            await call(second, "switch_dannet_server", {"server": b.base_url})
+            await call(second, "get_synset_info", {"synset_id": "synset-3047"})
+            check("second session fetches from B after switching", b.requests[synset] == 1)
+            current = await call(second, "get_current_dannet_server", {})
+            check("second session reports B", current["server_url"] == b.base_url and current["scope"] == "session")
+
+            current = await call(first, "get_current_dannet_server", {})
+            check("first session still reports A", current["server_url"] == a.base_url and current["scope"] == "default")
+            await call(first, "get_synset_info", {"synset_id": "synset-3047"})
+            check("first session's cache survived the switch", a.requests[synset] == 1)
+
+            await call(second, "switch_dannet_server", {"server": a.base_url})
+            await call(second, "get_synset_info", {"synset_id": "synset-3047"})
+            check("switching back reuses A's cached entries", a.requests[synset] == 1)
+
+            durations = []
+            for i in range(switches):
+                start = time.perf_counter()
+                await call(second, "switch_dannet_server", {"server": (b, a)[i % 2].base_url})
+                durations.append(time.perf_counter() - start)
+            await call(first, "get_synset_info", {"synset_id": "synset-3047"})
+            check("first session unaffected by repeated switches",
+                  a.requests[synset] == 1 and b.requests[synset] == 1)
+    return checks, sorted(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--switches", type=int, default=50, help="Timed switches (default: 50)")
+    parser.add_argument("--latency", type=float, default=20.0, help="Injected stub latency per request (ms)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    stubs = [CountingStub(latency=args.latency / 1000) for _ in range(2)]
+    servers = [serve(stub)[0] for stub in stubs]
+    port = free_port()
+    env = dict(os.environ, DANNET_MCP_DATA_DIR=tempfile.mkdtemp(prefix="dannet-sessions-"))
+    proc = subprocess.Popen([sys.executable, SERVER, "--http", "--port", str(port), "--base-url", stubs[0].base_url],
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1.0)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline or proc.poll() is not None:
+                    sys.exit("The server did not start")
+                time.sleep(0.1)
+        checks, durations = asyncio.run(run(f"http://127.0.0.1:{port}/mcp", stubs, args.switches))
+    finally:
+        proc.terminate()
+        proc.wait()
+        for server in servers:
+            server.shutdown()
+
+    for name, ok in checks:
+        print(f"{'ok' if ok else 'FAIL':<5} {name}")
+    print(f"\nswitch_dannet_server: p50 {percentile(durations, 50) * 1000:.1f} ms, "
+          f"p95 {percentile(durations, 95) * 1000:.1f} ms over {len(durations)} switches "
+          f"(stub latency {args.latency:g} ms)")
+    print(f"entity requests: A {sum(stubs[0].requests.values())}, B {sum(stubs[1].requests.values())}")
+    if not all(ok for _, ok in checks):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
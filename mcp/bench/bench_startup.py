@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Measure MCP server startup: time to the first tool response over stdio.
+
+Launches dannet_mcp_server.py as a stdio subprocess the way desktop clients do,
+speaks JSON-RPC to it directly and records, per launch, the time until the
+initialize response, the tools/list response and the first tools/call response.
+
+Two scenarios are run:
+- explicit: --base-url pointing at the local stub server; the first call is
+  get_synset_info, so it includes creating the HTTP client and one request
+- auto: no server given, so the local server is probed; the first call is
+  validate_synset_structure, which needs no backend, so a probe blocking
+  startup shows up directly
+
+Usage (from the mcp directory):
+    uv run bench/bench_startup.py                        # compare with bench/startup_baseline.json
+    uv run bench/bench_startup.py --launches 20
+    uv run bench/bench_startup.py --save-baseline bench/startup_baseline.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_tools import SYNSET, percentile  # noqa: E402
+from stub_server import StubDanNet, serve  # noqa: E402
+
+SERVER = os.path.join(os.path.dirname(__file__), "..", "dannet_mcp_server.py")
+BASELINE = os.path.join(os.path.dirname(__file__), "startup_baseline.json")
+
+
+def launch(extra_args, env, tool, arguments):
+    """Start the server, run initialize / tools/list / tools/call; returns the timings in ms."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, SERVER, *extra_args], env=env, text=True,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def request(id, method, params):
+        proc.stdin.write(json.dumps({"jsonrpc": "2.0", "id": id, "method": method, "params": params}) + "\n")
+        proc.stdin.flush()
+        while True:
+            message = json.loads(proc.stdout.readline())
+            if message.get("id") == id:
+                if "error" in message:
+                    raise RuntimeError(f"{method} failed: {message['error']}")
+                return message
+            # Notifications (e.g. log messages) are skipped
+
+    try:
+        request(1, "initialize", {"protocolVersion": "2025-06-18", "capabilities": {},
+                                  "clientInfo": {"name": "bench_startup", "version": "1"}})
+        initialized = time.perf_counter()
+        proc.stdin.write(json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"}) + "\n")
+        request(2, "tools/list", {})
+        listed = time.perf_counter()
+        result = request(3, "tools/call", {"name": tool, "arguments": arguments})
+        called = time.perf_counter()
+        if result["result"].get("isError"):
+            raise RuntimeError(f"{tool} failed: {result['result']['content']}")
+    finally:
+        proc.stdin.close()
+        proc.wait(timeout=10)
+    return {"initialize": (initialized - start) * 1000,
+            "tools_list": (listed - start) * 1000,
+            "first_tool": (called - start) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--launches", type=int, default=10, help="Launches per scenario (default: 10)")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline to compare with")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="Allowed relative slowdown of the median before counting as regressed (default: 0.3)")
+    args = parser.parse_args()
+
+    httpd, base_url = serve(StubDanNet())
+    data_dir = tempfile.mkdtemp(prefix="dannet-startup-")
+    env = {**os.environ, "DANNET_MCP_DATA_DIR": data_dir, "DANNET_MCP_LOCAL": ""}
+    scenarios = {
+        "explicit": (["--base-url", base_url], "get_synset_info", {"synset_id": "synset-3047"}),
+        "auto": ([], "validate_synset_structure", {"synset_data": SYNSET}),
+    }
+
+    results = {}
+    for name, (extra_args, tool, arguments) in scenarios.items():
+        runs = [launch(extra_args, env, tool, arguments) for _ in range(args.launches)]
+        results[name] = {}
+        for phase in ("initialize", "tools_list", "first_tool"):
+            values = sorted(run[phase] for run in runs)
+            results[name][phase] = {"p50": percentile(values, 50), "p95": percentile(values, 95)}
+    httpd.shutdown()
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"{'scenario':<10} {'phase':<12} {'p50 ms':>8} {'p95 ms':>8}" + ("  Δp50" if baseline else ""))
+    regressions = []
+    for name, phases in results.items():
+        for phase, stats in phases.items():
+            line = f"{name:<10} {phase:<12} {stats['p50']:8.1f} {stats['p95']:8.1f}"
+            before = (baseline or {}).get(name, {}).get(phase)
+            if before:
+                line += f"  {(stats['p50'] / before['p50'] - 1) * 100:+6.1f}%"
+                if stats["p50"] > before["p50"] * (1 + args.tolerance):
+                    regressions.append(f"{name}/{phase}")
+            print(line)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.save_baseline}")
+    elif regressions:
+        print(f"\nRegressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Benchmark every MCP tool offline, against the local stub DanNet server.
+
+Starts bench/stub_server.py in-process (recorded payloads, injected latency),
+points the MCP server at it and drives each tool through FastMCP's call_tool
+from a pool of worker threads. Reports throughput and p50/p95/p99 latency per
+tool, and compares them against a stored baseline.
+
+Usage (from the mcp directory):
+    uv run bench/bench_tools.py                                 # compare with bench/baseline.json
+    uv run bench/bench_tools.py --latency 50 --concurrency 16
+    uv run bench/bench_tools.py --save-baseline bench/baseline.json
+    uv run bench/bench_tools.py --tools get_synset_info,sparql_query --no-cache
+
+Exits with status 1 when a tool regressed beyond --tolerance, so it can gate CI.
+Tools registered on the server but missing from WORKLOAD are reported, so new
+tools are not silently left out.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dannet_mcp_server as server  # noqa: E402
+from stub_server import StubDanNet, parse_endpoint_latency, serve  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+SYNSET = {
+    "@context": {"dn": "https://wordnet.dk/dannet/data/", "wn": "https://globalwordnet.github.io/schemas/wn#",
+                 "dns": "https://wordnet.dk/dannet/schema/", "dnc": "https://wordnet.dk/dannet/concepts/"},
+    "@id": "dn:synset-3047",
+    "@type": "ontolex:LexicalConcept",
+    "wn:hypernym": "dn:synset-2084",
+    "dns:ontologicalType": {"@set": ["dnc:Animal", "dnc:Object"]},
+    "dns:sentiment": {"marl:hasPolarity": "marl:Neutral", "marl:polarityValue": "0"},
+}
+
+# Arguments per tool; the synset-N and ordN names refer to the synthetic exports
+WORKLOAD = {
+    "get_word_synsets": [{"query": "hund"}, {"query": "svinkeærinde"}],
+    "lemmatize_danish_words": [{"words": ["ord12en", "ord7", "ord300er", "Ord41", "hundene"]}],
+    "get_entity_info": [{"identifier": "synset-3047"}],
+    "get_synset_info": [{"synset_id": "synset-3047"}, {"synset_id": "11677"},
+                        {"synset_id": "synset-3047", "fields": "summary"},
+                        {"synset_id": "synset-3047", "max_bytes": 1000},
+                        {"synset_id": "synset-3047", "fields": "taxonomy", "enrich_labels": True}],
+    "get_relation_page": [{"synset_id": "synset-3047", "relation": "wn:hyponym", "cursor": "indegree:1",
+                           "page_size": 2}],
+    "get_word_info": [{"word_id": "word-11021628"}],
+    "get_sense_info": [{"sense_id": "sense-21033604"}],
+    "get_word_synonyms": [{"word": "hund"}],
+    "get_word_overview": [{"word": "hund"}],
+    "rank_similar_synsets": [{"synset_id": "synset-2500", "metric": "wup"},
+                             {"synset_id": "synset-4000", "metric": "lch", "top_k": 20}],
+    "related_synsets": [{"seed_ids": ["synset-120", "synset-121"]},
+                        {"seed_ids": ["synset-3000"], "relations": ["wn:hypernym", "wn:hyponym"]}],
+    "is_a": [{"pairs": [["synset-4000", "synset-1"], ["synset-12", "synset-4000"], ["synset-999", "synset-998"]]}],
+    "describe_terms": [{"terms": ["dns:usedForObject", "wn:hypernym", "dnc:Animal", "ontolex:isEvokedBy"]}],
+    "autocomplete_danish_word": [{"prefix": "hyg", "max_results": 5}],
+    "switch_dannet_server": [{"server": "{base_url}"}],
+    "get_current_dannet_server": [{}],
+    "get_cache_stats": [{}],
+    "get_profile_report": [{"top_n": 5}],
+    "fetch_ddo_definition": [{"synset_id": "synset-3047"}],
+    "validate_synset_structure": [{"synset_data": SYNSET}],
+    "extract_semantic_data": [{"entity_data": SYNSET}],
+    "analyze_namespace_usage": [{"entity_data": SYNSET}],
+    "sparql_query": [{"query": "SELECT ?synset ?label WHERE { ?synset rdfs:label ?label } LIMIT 40"},
+                     {"query": "SELECT ?hyponym WHERE { dn:synset-3047 wn:hyponym ?hyponym }", "enrich_labels": True}],
+}
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def clear_caches():
+    server._resource_cache.clear()
+    server._schema_cache.clear()
+
+
+def run_tool(name, calls, concurrency, cold, base_url):
+    """Run `calls` calls of a tool on `concurrency` threads; returns its stats."""
+    arguments = [json.loads(json.dumps(args).replace("{base_url}", base_url))
+                 for args in WORKLOAD[name]]
+    local = threading.local()
+    durations, errors = [], []
+
+    def call(i):
+        if not hasattr(local, "loop"):
+            local.loop = asyncio.new_event_loop()
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        try:
+            local.loop.run_until_complete(server.mcp.call_tool(name, arguments[i % len(arguments)]))
+        except Exception as e:
+            errors.append(str(e))
+        durations.append(time.perf_counter() - start)
+
+    # One call per argument set outside the measurement: builds local indexes, fills caches
+    for i in range(len(arguments)):
+        call(i)
+    # Including the ones built in the background
+    for thread in (server._relation_graph_thread, server._form_index_thread):
+        if thread is not None:
+            thread.join()
+    durations.clear()
+    errors.clear()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(calls)))
+    elapsed = time.perf_counter() - start
+
+    durations.sort()
+    return {
+        "calls": calls,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "throughput": calls / elapsed,
+        "p50": percentile(durations, 50) * 1000,
+        "p95": percentile(durations, 95) * 1000,
+        "p99": percentile(durations, 99) * 1000,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Names of tools whose p50 grew beyond tolerance, or p95 beyond twice the
+    tolerance, by more than 1 ms (sub-millisecond tools flap on scheduler noise).
+    """
+    regressions = []
+    for name, stats in results.items():
+        before = baseline.get("tools", {}).get(name)
+        if not before:
+            continue
+        if any(stats[k] > before[k] * (1 + t) and stats[k] - before[k] > 1.0
+               for k, t in (("p50", tolerance), ("p95", 2 * tolerance))):
+            regressions.append(name)
+    return regressions
+
+
+def report(results, baseline):
+    tools = baseline.get("tools", {}) if baseline else {}
+    print(f"{'tool':<28} {'calls/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}"
+          + ("   Δp50    Δp95    Δcalls/s" if tools else ""))
+    for name, s in results.items():
+        line = f"{name:<28} {s['throughput']:9.1f} {s['p50']:8.2f} {s['p95']:8.2f} {s['p99']:8.2f} {s['errors']:6d}"
+        if before := tools.get(name):
+            line += "  " + "  ".join(f"{(s[k] / before[k] - 1) * 100:+6.1f}%" if before[k] else "    n/a"
+                                     for k in ("p50", "p95", "throughput"))
+        print(line)
+        if s["first_error"]:
+            print(f"    first error: {s['first_error'][:120]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=200, help="Measured calls per tool (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Worker threads (default: 8)")
+    parser.add_argument("--latency", type=float, default=20.0, help="Injected stub latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=5.0, help="Extra random stub latency, 0..jitter (ms)")
+    parser.add_argument("--endpoint-latency", action="append", metavar="PREFIX=MS",
+                        help="Latency override for paths starting with PREFIX (repeatable)")
+    parser.add_argument("--synsets", type=int, default=5000, help="Size of the synthetic exports")
+    parser.add_argument("--tools", help="Comma-separated subset of tools to run")
+    parser.add_argument("--no-cache", action="store_true", help="Clear the resource caches before every call")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline to compare with (default: bench/baseline.json)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="Allowed relative p50 slowdown before a tool counts as regressed (default: 0.3)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    server.DATA_DIR = tempfile.mkdtemp(prefix="dannet-bench-")
+    stub = StubDanNet(latency=args.latency / 1000, jitter=args.jitter / 1000,
+                      endpoint_latency=parse_endpoint_latency(args.endpoint_latency), synsets=args.synsets)
+    httpd, base_url = serve(stub)
+    server.dannet_client = server.DanNetClient(base_url)
+
+    server.mcp.register_pending_tools()
+    registered = [t.name for t in server.mcp._tool_manager.list_tools()]
+    missing = [name for name in registered if name not in WORKLOAD]
+    if missing:
+        print(f"No workload for: {', '.join(missing)}", file=sys.stderr)
+    names = args.tools.split(",") if args.tools else [n for n in registered if n in WORKLOAD]
+
+    print(f"Stub at {base_url}: latency {args.latency:g}±{args.jitter:g} ms, "
+          f"{args.calls} calls per tool, concurrency {args.concurrency}\n")
+    results = {}
+    for name in names:
+        results[name] = run_tool(name, args.calls, args.concurrency, args.no_cache, base_url)
+        # switch_dannet_server replaces the client; keep the original for the next tool
+        server.dannet_client = server.DanNetClient(base_url)
+    httpd.shutdown()
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    report(results, baseline)
+
+    config = {k: getattr(args, k) for k in ("calls", "concurrency", "latency", "jitter", "synsets", "no_cache")}
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "tools": results}, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.save_baseline}")
+    elif baseline:
+        if baseline.get("config") != config:
+            print(f"\nNote: baseline was recorded with {baseline.get('config')}")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
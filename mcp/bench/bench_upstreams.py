@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Measure latency-aware routing and failover between upstreams, against stub servers.
+
+Starts a fast and a slow stub DanNet server and routes the MCP server's requests
+between them (as with --upstream fast --upstream slow). Uncached get_synset_info
+calls are made in three phases: both upstreams up, the fast one down (answering
+503, as a proxy in front of a stopped backend does), and the fast one back. Reports tool latency, errors and the requests each upstream
+served per phase. Expect the fast upstream to take the traffic, no errors when
+it goes down, and the traffic to return once a health check finds it back.
+
+Usage (from the mcp directory):
+    uv run bench/bench_upstreams.py
+    uv run bench/bench_upstreams.py --fast 10 --slow 80 --calls 200 --health-interval 0.5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dannet_mcp_server as server  # noqa: E402
+from bench_tools import percentile  # noqa: E402
+from stub_server import StubDanNet, serve  # noqa: E402
+
+
+class OutageStub(StubDanNet):
+    """A stub that can be taken down; keep-alive connections outlive a server shutdown."""
+
+    down = False
+
+    def respond(self, path, params):
+        if self.down:
+            return 503, "text/plain", b"Service Unavailable"
+        return super().respond(path, params)
+
+
+def run_phase(loop, calls):
+    """Uncached get_synset_info calls; returns (durations, errors)."""
+    durations, errors = [], 0
+    for _ in range(calls):
+        server._resource_cache.clear()
+        start = time.perf_counter()
+        try:
+            loop.run_until_complete(server.mcp.call_tool("get_synset_info", {"synset_id": "synset-3047"}))
+        except Exception:
+            errors += 1
+        durations.append(time.perf_counter() - start)
+    return sorted(durations), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fast", type=float, default=10.0, help="Latency of the fast upstream (ms)")
+    parser.add_argument("--slow", type=float, default=40.0, help="Latency of the slow upstream (ms)")
+    parser.add_argument("--calls", type=int, default=100, help="Calls per phase (default: 100)")
+    parser.add_argument("--health-interval", type=float, default=0.5, help="Seconds between health checks")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+    server.DATA_DIR = tempfile.mkdtemp(prefix="dannet-upstreams-")
+    fast_stub, slow_stub = OutageStub(latency=args.fast / 1000), StubDanNet(latency=args.slow / 1000)
+    fast_httpd, fast_url = serve(fast_stub)
+    slow_httpd, slow_url = serve(slow_stub)
+    # The slow one first: the router has to find out which is faster
+    server.upstream_router = server.UpstreamRouter([slow_url, fast_url], args.health_interval)
+    server.dannet_client = server.DanNetClient(slow_url)
+    server.mcp.register_pending_tools()
+    loop = asyncio.new_event_loop()
+    time.sleep(args.health_interval * 2)
+
+    def stop_fast():
+        fast_stub.down = True
+
+    def restart_fast():
+        fast_stub.down = False
+        time.sleep(args.health_interval * 3)
+
+    print(f"fast upstream {args.fast:g} ms, slow upstream {args.slow:g} ms, {args.calls} uncached calls per phase\n")
+    print(f"{'phase':<12} {'p50 ms':>8} {'p95 ms':>8} {'errors':>6} {'fast reqs':>9} {'slow reqs':>9} {'failovers':>9}")
+    before = server.upstream_router.stats()
+    for phase, setup in (("both up", None), ("fast down", stop_fast), ("fast back", restart_fast)):
+        if setup:
+            setup()
+        durations, errors = run_phase(loop, args.calls)
+        stats = server.upstream_router.stats()
+        requests = [u["requests"] - b["requests"] for u, b in zip(stats["upstreams"], before["upstreams"])]
+        print(f"{phase:<12} {percentile(durations, 50) * 1000:8.1f} {percentile(durations, 95) * 1000:8.1f} "
+              f"{errors:6d} {requests[1]:9d} {requests[0]:9d} {stats['failovers'] - before['failovers']:9d}")
+        before = stats
+    fast_httpd.shutdown()
+    slow_httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
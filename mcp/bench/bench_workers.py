@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Measure how HTTP throughput scales with --workers, against the stub server.
+
+For each worker count, launches dannet_mcp_server.py --http --workers N
+pointed at the stub and drives it from several client processes, each running
+concurrent MCP sessions that call a mix of tools whose cost is mostly CPU on
+the server (JSON decoding, projection and regrouping of cached entities, graph
+queries). After an unmeasured warm-up, in which every worker fills its caches
+and builds its indexes, calls are counted for a fixed time. Reports calls per
+second, p50/p95 latency and the speedup over one worker, and the shared cache
+figures of the last run.
+
+The speedup is bounded by the cores of the machine, and the client processes
+compete for them too; keep --clients below the core count for figures closer
+to those of the server alone.
+
+Usage (from the mcp directory):
+    uv run bench/bench_workers.py
+    uv run bench/bench_workers.py --workers 1,2,4,8 --clients 8 --concurrency 8 --duration 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_tools import WORKLOAD, percentile  # noqa: E402
+from stub_server import StubDanNet, serve  # noqa: E402
+
+SERVER = os.path.join(os.path.dirname(__file__), "..", "dannet_mcp_server.py")
+TOOLS = "get_synset_info,related_synsets,is_a,sparql_query,lemmatize_danish_words,get_relation_page"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def drive(url, calls, concurrency, warm_up, duration):
+    """Run `concurrency` sessions calling the tools; returns (durations, errors) after the warm-up."""
+    durations, errors = [], 0
+    start = time.monotonic()
+    measure_from, stop_at = start + warm_up, start + warm_up + duration
+
+    async def session(offset):
+        nonlocal errors
+        # The server's transport security only allows the bare host names
+        async with streamablehttp_client(url, headers={"Host": "127.0.0.1"}) as (read, write, _):
+            async with ClientSession(read, write) as client:
+                await client.initialize()
+                i = offset
+                while time.monotonic() < stop_at:
+                    name, arguments = calls[i % len(calls)]
+                    i += 1
+                    began = time.monotonic()
+                    try:
+                        result = await client.call_tool(name, arguments)
+                        failed = result.isError
+                    except Exception:
+                        failed = True
+                    if began >= measure_from:
+                        durations.append(time.monotonic() - began)
+                        errors += failed
+
+    await asyncio.gather(*(session(n) for n in range(concurrency)))
+    return durations, errors
+
+
+def client_process(args):
+    url, calls, concurrency, warm_up, duration = args
+    logging.getLogger().setLevel(logging.WARNING)
+    return asyncio.run(drive(url, calls, concurrency, warm_up, duration))
+
+
+def wait_for(url, proc):
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline or (proc is not None and proc.poll() is not None):
+                sys.exit("The server did not start")
+            time.sleep(0.2)
+
+
+def shared_cache_stats(url):
+    """get_cache_stats of whichever worker answers, over a fresh session."""
+    async def ask():
+        async with streamablehttp_client(url, headers={"Host": "127.0.0.1"}) as (read, write, _):
+            async with ClientSession(read, write) as client:
+                await client.initialize()
+                result = await client.call_tool("get_cache_stats", {})
+                return json.loads(result.content[0].text).get("shared_cache")
+    return asyncio.run(ask())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", default="1,2,4", help="Worker counts (default: 1,2,4)")
+    parser.add_argument("--clients", type=int, default=4, help="Client processes (default: 4)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Sessions per client process (default: 4)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per run (default: 10)")
+    parser.add_argument("--warm-up", type=float, default=5.0, help="Unmeasured seconds per run (default: 5)")
+    parser.add_argument("--latency", type=float, default=20.0, help="Injected stub latency per request (ms)")
+    parser.add_argument("--synsets", type=int, default=5000, help="Size of the synthetic exports")
+    parser.add_argument("--tools", default=TOOLS, help=f"Comma-separated tools to call (default: {TOOLS})")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    httpd, base_url = serve(StubDanNet(latency=args.latency / 1000, synsets=args.synsets))
+    calls = [(name, arguments) for name in args.tools.split(",") for arguments in WORKLOAD[name]]
+    pool = multiprocessing.get_context("spawn").Pool(args.clients)
+
+    print(f"{os.cpu_count()} cores, {args.clients} client processes x {args.concurrency} sessions, "
+          f"{args.duration:g} s per run, stub latency {args.latency:g} ms\n")
+    print(f"{'workers':>7} {'calls/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'errors':>6} {'speedup':>8}")
+    first = None
+    shared = None
+    for workers in [int(n) for n in args.workers.split(",")]:
+        port = free_port()
+        env = dict(os.environ, DANNET_MCP_DATA_DIR=tempfile.mkdtemp(prefix="dannet-workers-"))
+        proc = subprocess.Popen([sys.executable, SERVER, "--http", "--port", str(port), "--base-url", base_url,
+                                 "--workers", str(workers)],
+                                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        url = f"http://127.0.0.1:{port}/mcp"
+        try:
+            wait_for(f"http://127.0.0.1:{port}/metrics", proc)
+            results = pool.map(client_process, [(url, calls, args.concurrency, args.warm_up, args.duration)]
+                               * args.clients)
+            if workers > 1:
+                shared = (workers, shared_cache_stats(url))
+        finally:
+            proc.terminate()
+            proc.wait()
+        durations = sorted(d for client, _ in results for d in client)
+        errors = sum(e for _, e in results)
+        throughput = len(durations) / args.duration
+        first = first or throughput
+        print(f"{workers:7d} {throughput:9.1f} {percentile(durations, 50) * 1000:8.1f} "
+              f"{percentile(durations, 95) * 1000:8.1f} {errors:6d} {throughput / first:7.2f}x")
+    pool.close()
+    httpd.shutdown()
+    if shared:
+        print(f"\nshared cache with {shared[0]} workers, as seen by worker {shared[1]['worker']}: "
+              f"{shared[1]['entries']} entries, {shared[1]['hits']} hits, {shared[1]['misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
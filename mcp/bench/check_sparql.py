@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Check the SPARQL pre-flight rewrites and the inference routing, offline.
+
+Runs SparqlAnalysis over a set of queries and compares the rewritten query
+with the expected one: LIMIT is added at the end, or before a trailing VALUES
+block (which must stay last); an existing LIMIT is kept; OR-filters over URIs
+become VALUES. Then loads an InferenceRouter from the bundled schema snapshots
+(Turtle and RDF/XML) and checks the model chosen for queries on single
+predicates, in prefixed and full IRI form. Exits with status 1 when a check
+fails.
+
+Usage (from the mcp directory):
+    uv run bench/check_sparql.py
+"""
+
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dannet_mcp_server as server  # noqa: E402
+
+# (name, query, expected rewritten query)
+REWRITES = [
+    ("LIMIT appended when absent",
+     "SELECT ?s WHERE { ?s wn:hypernym dn:synset-1 }",
+     "SELECT ?s WHERE { ?s wn:hypernym dn:synset-1 }\nLIMIT 100"),
+    ("existing LIMIT kept",
+     "SELECT ?s WHERE { ?s wn:hypernym dn:synset-1 } LIMIT 5",
+     "SELECT ?s WHERE { ?s wn:hypernym dn:synset-1 } LIMIT 5"),
+    ("LIMIT inserted before a trailing VALUES block",
+     "SELECT ?s WHERE { ?s wn:hypernym ?o } VALUES ?o { dn:synset-1 dn:synset-2 }",
+     "SELECT ?s WHERE { ?s wn:hypernym ?o } LIMIT 100\nVALUES ?o { dn:synset-1 dn:synset-2 }"),
+    ("LIMIT inserted after ORDER BY, before a trailing VALUES block",
+     "SELECT ?s WHERE { ?s wn:hypernym ?o } ORDER BY ?s\nVALUES ?o { dn:synset-1 }",
+     "SELECT ?s WHERE { ?s wn:hypernym ?o } ORDER BY ?s\nLIMIT 100\nVALUES ?o { dn:synset-1 }"),
+    ("LIMIT before a trailing VALUES block kept",
+     "SELECT ?s WHERE { ?s wn:hypernym ?o } LIMIT 5 VALUES ?o { dn:synset-1 }",
+     "SELECT ?s WHERE { ?s wn:hypernym ?o } LIMIT 5 VALUES ?o { dn:synset-1 }"),
+    ("subquery LIMIT does not count for the outer query",
+     "SELECT ?s WHERE { { SELECT ?s WHERE { ?s wn:hypernym dn:synset-1 } LIMIT 3 } }",
+     "SELECT ?s WHERE { { SELECT ?s WHERE { ?s wn:hypernym dn:synset-1 } LIMIT 3 } }\nLIMIT 100"),
+    ("OR-filter over URIs rewritten to VALUES",
+     "SELECT ?s WHERE { ?s wn:hypernym ?o . FILTER(?o = dn:synset-1 || ?o = dn:synset-2) } LIMIT 5",
+     "SELECT ?s WHERE { ?s wn:hypernym ?o . VALUES ?o { dn:synset-1 dn:synset-2 } } LIMIT 5"),
+]
+
+# (predicate as written in the query, expected route)
+ROUTES = [
+    ("wn:hyponym", "inference"),
+    ("ontolex:isEvokedBy", "inference"),
+    ("ontolex:isSenseOf", "inference"),
+    ("ontolex:isLexicalizedSenseOf", "inference"),
+    ("<http://www.w3.org/ns/lemon/ontolex#isLexicalizedSenseOf>", "inference"),
+    ("skos:broader", "inference"),
+    ("lexinfo:partOfSpeech", "inference"),
+    ("<http://www.lexinfo.net/ontology/3.0/lexinfo#partOfSpeech>", "inference"),
+    ("ontolex:evokes", "auto"),
+    ("ontolex:sense", "auto"),
+    ("wn:definition", "base"),
+]
+
+
+def check(name, ok, detail):
+    print(f"{'ok' if ok else 'FAIL':<5} {name}")
+    if not ok:
+        print(f"      {detail}")
+    return ok
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    server.DATA_DIR = tempfile.mkdtemp(prefix="dannet-check-sparql-")
+    results = []
+    for name, query, expected in REWRITES:
+        rewritten = server.SparqlAnalysis(query).query
+        results.append(check(name, rewritten == expected, f"expected {expected!r}\n      got      {rewritten!r}"))
+
+    router = server.InferenceRouter()
+    # The first route() starts loading the schemas; queries go to auto mode until it is done
+    router.route(server.SparqlAnalysis("SELECT ?o WHERE { dn:synset-1 wn:hypernym ?o }"))
+    router._loading.join()
+    for predicate, expected in ROUTES:
+        route, _ = router.route(server.SparqlAnalysis(f"SELECT ?o WHERE {{ dn:synset-1 {predicate} ?o }}"))
+        results.append(check(f"{predicate} routes to {expected}", route == expected, f"got {route}"))
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
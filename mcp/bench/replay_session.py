@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded MCP session offline, from a cassette.
+
+A cassette recorded with `dannet_mcp_server.py --record session.jsonl.gz` holds
+every upstream HTTP exchange and every tool call of the session. This script
+re-issues the tool calls against the server code, with upstream requests
+answered from the cassette, and reports latency per tool next to the recorded
+figures. Use it to profile CPU cost, cache behaviour and concurrency of a real
+session without network access.
+
+Usage (from the mcp directory):
+    uv run bench/replay_session.py session.jsonl.gz                       # original timing and latency
+    uv run bench/replay_session.py session.jsonl.gz --latency zero --timing fast --concurrency 8
+    uv run bench/replay_session.py session.jsonl.gz --repeat 5            # warm caches after round 1
+
+Tools working on local exports use the data directory as is (--data-dir); they
+are only hermetic if the exports were downloaded during the recorded session.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dannet_mcp_server as server  # noqa: E402
+from bench_tools import percentile  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("cassette", help="Cassette file written with --record")
+    parser.add_argument("--latency", choices=["original", "zero"], default="original",
+                        help="Upstream latency: as recorded, or none (default: original)")
+    parser.add_argument("--timing", choices=["original", "fast"], default="original",
+                        help="Start calls at their recorded offsets, or as fast as possible (default: original)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Worker threads with --timing fast (default: 8)")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the session this many times (default: 1)")
+    parser.add_argument("--data-dir", help="Local data directory (default: the server's)")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        server.DATA_DIR = os.path.expanduser(args.data_dir)
+    server.cassette_replay = server.ReplayTransport(args.cassette, args.latency)
+    server.dannet_client = server.DanNetClient(server.cassette_replay.base_url or server.REMOTE_URL)
+    calls = [r for r in server.read_cassette(args.cassette) if r["type"] == "call"]
+    calls.sort(key=lambda r: r["t"])
+    if not calls:
+        sys.exit("The cassette holds no tool calls")
+
+    local = threading.local()
+    durations, errors = {}, {}
+
+    def call(record):
+        if not hasattr(local, "loop"):
+            local.loop = asyncio.new_event_loop()
+        start = time.perf_counter()
+        try:
+            local.loop.run_until_complete(server.mcp.call_tool(record["tool"], record["arguments"]))
+        except Exception:
+            errors[record["tool"]] = errors.get(record["tool"], 0) + 1
+        durations.setdefault(record["tool"], []).append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        if args.timing == "fast":
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                list(pool.map(call, calls))
+        else:
+            # Overlapping calls of the recording overlap here too
+            round_start = time.perf_counter()
+            threads = []
+            for record in calls:
+                time.sleep(max(0.0, record["t"] - (time.perf_counter() - round_start)))
+                thread = threading.Thread(target=call, args=(record,))
+                thread.start()
+                threads.append(thread)
+            for thread in threads:
+                thread.join()
+    elapsed = time.perf_counter() - start
+
+    recorded = {}
+    for record in calls:
+        recorded.setdefault(record["tool"], []).append(record["duration"])
+
+    print(f"{len(calls)} calls x {args.repeat} in {elapsed:.2f}s "
+          f"(recorded session: {calls[-1]['t'] + calls[-1]['duration']:.2f}s)\n")
+    print(f"{'tool':<28} {'calls':>6} {'rec p50':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'errors':>6}")
+    for tool, values in sorted(durations.items()):
+        values.sort()
+        rec = sorted(recorded[tool])
+        print(f"{tool:<28} {len(values):6d} {percentile(rec, 50) * 1000:9.2f} {percentile(values, 50) * 1000:8.2f} "
+              f"{percentile(values, 95) * 1000:8.2f} {values[-1] * 1000:8.2f} {errors.get(tool, 0):6d}")
+
+    upstream = sum(h.count for h in server.metrics.upstream_latency.values())
+    print(f"\nUpstream requests: {upstream}, not in cassette: {server.cassette_replay.misses}, "
+          f"resource cache entries: {len(server._resource_cache)}")
+
+
+if __name__ == "__main__":
+    main()
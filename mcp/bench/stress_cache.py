@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Hammer the StripedCache behind the resource and schema caches from many threads.
+
+Throughput: threads doing a mix of lookups and stores on a shared cache, at
+increasing thread counts, next to a dict guarded by a single lock. On a build
+with the GIL, the figures show how much locking costs rather than parallel
+speedup; on a free-threaded build, they show the scaling.
+
+Consistency, each run from all threads at once:
+- racing setdefault calls on the same keys all return the same winner,
+- lookups never see a value stored under another key,
+- iterating, counting and listing keys while others insert never fails, and
+  the final contents are exactly the keys written,
+- concurrent get_record misses on the same synsets, against the stub server,
+  hand every thread the same cached record.
+
+Usage (from the mcp directory):
+    uv run bench/stress_cache.py
+    uv run bench/stress_cache.py --threads 1,2,4,8,16,32 --ops 200000 --write-ratio 0.2
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dannet_mcp_server as server  # noqa: E402
+from stub_server import StubDanNet, serve  # noqa: E402
+
+
+class LockedDict:
+    """The baseline: one dict, one lock for everything."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+
+
+def run_threads(n, target):
+    """Run target(i) on n threads released together; returns the wall time."""
+    barrier = threading.Barrier(n + 1)
+    errors = []
+
+    def run(i):
+        barrier.wait()
+        try:
+            target(i)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return time.perf_counter() - start
+
+
+def throughput(cache, threads, ops, keys, write_ratio):
+    """Operations per second of `threads` threads sharing `ops` lookups and stores."""
+    for k in range(keys):
+        cache[("bench", f"synset-{k}")] = k
+
+    def work(i):
+        rng = random.Random(i)
+        for _ in range(ops // threads):
+            key = ("bench", f"synset-{rng.randrange(keys)}")
+            if rng.random() < write_ratio:
+                cache[key] = i
+            else:
+                cache.get(key)
+
+    return ops / run_threads(threads, work)
+
+
+def check_setdefault(threads, keys):
+    cache = server.StripedCache()
+    winners = [[None] * keys for _ in range(threads)]
+
+    def work(i):
+        for k in range(keys):
+            winners[i][k] = cache.setdefault(("race", k), object())
+
+    run_threads(threads, work)
+    return all(winners[i][k] is winners[0][k] for i in range(threads) for k in range(keys))
+
+
+def check_values(threads, keys, ops):
+    cache = server.StripedCache()
+    mismatches = []
+
+    def work(i):
+        rng = random.Random(i)
+        for n in range(ops):
+            k = rng.randrange(keys)
+            if n % 4 == 0:
+                cache[("value", k)] = (k, i, n)
+            else:
+                value = cache.get(("value", k))
+                if value is not None and value[0] != k:
+                    mismatches.append((k, value))
+
+    run_threads(threads, work)
+    return not mismatches
+
+
+def check_iteration(threads, keys):
+    cache = server.StripedCache()
+    writers = max(1, threads // 2)
+    done = threading.Event()
+
+    def work(i):
+        if i < writers:
+            for k in range(i, keys, writers):
+                cache[("iter", k)] = k
+        else:
+            while not done.is_set():
+                sum(1 for _ in cache)
+                len(cache)
+                cache.keys()
+
+    def stop_when_written():
+        while len(cache) < keys:
+            time.sleep(0.001)
+        done.set()
+
+    threading.Thread(target=stop_when_written, daemon=True).start()
+    run_threads(writers + max(1, threads - writers), work)
+    return len(cache) == keys and set(cache) == {("iter", k) for k in range(keys)}
+
+
+def check_get_record(threads, synsets, latency):
+    httpd, base_url = serve(StubDanNet(latency=latency))
+    client = server.DanNetClient(base_url)
+    ids = [f"synset-{n}" for n in range(1, synsets + 1)]
+    records = [[None] * synsets for _ in range(threads)]
+
+    def work(i):
+        for n, synset_id in enumerate(ids):
+            records[i][n] = client.get_record(synset_id)
+
+    try:
+        run_threads(threads, work)
+    finally:
+        httpd.shutdown()
+    same = all(records[i][n] is records[0][n] for i in range(threads) for n in range(synsets))
+    return same and all(server._resource_cache[(client.base_url, synset_id)] is records[0][n]
+                        for n, synset_id in enumerate(ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", default="1,2,4,8,16", help="Thread counts (default: 1,2,4,8,16)")
+    parser.add_argument("--ops", type=int, default=100000, help="Operations per throughput run (default: 100000)")
+    parser.add_argument("--keys", type=int, default=10000, help="Distinct keys (default: 10000)")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="Fraction of stores (default: 0.1)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    server.DATA_DIR = tempfile.mkdtemp(prefix="dannet-stress-")
+    counts = [int(n) for n in args.threads.split(",")]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{args.ops} operations, {args.keys} keys, {args.write_ratio:.0%} stores, "
+          f"GIL {'enabled' if gil else 'disabled'}\n")
+    print(f"{'threads':>7} {'striped ops/s':>14} {'scaling':>8} {'locked dict ops/s':>18} {'scaling':>8}")
+    first = None
+    for n in counts:
+        striped = throughput(server.StripedCache(), n, args.ops, args.keys, args.write_ratio)
+        locked = throughput(LockedDict(), n, args.ops, args.keys, args.write_ratio)
+        first = first or (striped, locked)
+        print(f"{n:7d} {striped:14,.0f} {striped / first[0]:7.2f}x {locked:18,.0f} {locked / first[1]:7.2f}x")
+
+    most = max(counts)
+    checks = [
+        ("racing setdefault calls agree on one value", check_setdefault(most, 2000)),
+        ("lookups only see values stored under their key", check_values(most, 500, args.ops // most)),
+        ("iteration during inserts; final contents exact", check_iteration(most, args.keys)),
+        ("concurrent get_record misses share one record", check_get_record(most, 20, 0.01)),
+    ]
+    print()
+    for name, ok in checks:
+        print(f"{'ok' if ok else 'FAIL':<5} {name}")
+    if not all(ok for _, ok in checks):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the DanNet web service, serving recorded payloads.
+
+Answers /dannet/data, /dannet/search, /dannet/autocomplete, /dannet/sparql and
+/schema from the exchanges in a fixture file (bench/fixtures/dannet.json), with
+configurable injected latency. The CSV and COR exports (/export/csv/dn and
+/export/rdf/cor) are generated synthetically, so the tools working on local
+copies of the data have a taxonomy of realistic size to work on.
+
+Entities of the synthetic synsets (/dannet/data/synset-N) that no fixture
+covers are generated too, with just a type and a label.
+
+Fixture entries are matched in order; the first entry whose path matches and
+whose params all match is served; entries marked "fallback" are only served
+when nothing else matches. Param values starting with "~" are regular
+expressions searched in the request value, other values must match exactly;
+params absent from an entry are ignored. The string {{base_url}} in a recorded
+body is replaced with the stub's own URL. Instead of a "body", an entry may name
+a "file" (relative to the fixture file) to serve, e.g. a schema from resources/.
+
+Usage (from the mcp directory):
+    uv run bench/stub_server.py --port 3456 --latency 40 --jitter 10
+    uv run bench/stub_server.py --port 3456 --record https://wordnet.dk
+
+With --record, requests that no fixture matches are forwarded to the given
+server and the exchange is appended to the fixture file.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "dannet.json")
+
+WN = "https://globalwordnet.github.io/schemas/wn#"
+DN = "https://wordnet.dk/dannet/data/"
+
+
+def synthetic_csv_export(synsets, seed=0):
+    """
+    Zipped CSV export of a random hypernym forest with one word per synset.
+
+    Every synset-N (N > 1) gets a hypernym among the synsets before it, a few
+    get a second one; wn:similar edges connect random pairs.
+    """
+    rng = random.Random(seed)
+    words, senses, rows, relations = [], [], [], []
+    for n in range(1, synsets + 1):
+        words.append(f"word-{n},ord{n},noun\n")
+        senses.append(f"sense-{n},synset-{n},word-{n},\n")
+        rows.append(f"synset-{n},definition of ord{n},\n")
+        if n > 1:
+            parents = {rng.randrange(max(1, n - 200), n)}
+            if rng.random() < 0.05:
+                parents.add(rng.randrange(1, n))
+            for parent in parents:
+                relations.append(f"synset-{n},{WN}hypernym,synset-{parent}\n")
+                relations.append(f"synset-{parent},{WN}hyponym,synset-{n}\n")
+        if rng.random() < 0.1:
+            other = rng.randrange(1, synsets + 1)
+            relations.append(f"synset-{n},{WN}similar,synset-{other}\n")
+    return _zip({"words.csv": "".join(words), "senses.csv": "".join(senses),
+                 "synsets.csv": "".join(rows), "relations.csv": "".join(relations)})
+
+
+def synthetic_cor_export(synsets):
+    """Zipped COR export giving every synthetic word ordN the forms ordNen and ordNer."""
+    lines = ["@prefix ontolex: <http://www.w3.org/ns/lemon/ontolex#> .",
+             "@prefix owl: <http://www.w3.org/2002/07/owl#> .",
+             "@prefix cor: <https://ordregister.dk/id/> .",
+             f"@prefix dn: <{DN}> .", ""]
+    for n in range(1, synsets + 1):
+        lines.append(f"cor:w{n} owl:sameAs dn:word-{n} ; "
+                     f"ontolex:canonicalForm cor:w{n}-0 ; "
+                     f"ontolex:otherForm cor:w{n}-1 , cor:w{n}-2 .")
+        for i, suffix in enumerate(("", "en", "er")):
+            lines.append(f'cor:w{n}-{i} ontolex:writtenRep "ord{n}{suffix}"@da .')
+    return _zip({"cor.ttl": "\n".join(lines) + "\n"})
+
+
+def synthetic_entity(n, base_url):
+    """Minimal JSON-LD entity of the synthetic synset-N."""
+    return {"@context": {"dn": DN, "ontolex": "http://www.w3.org/ns/lemon/ontolex#",
+                         "rdfs": "http://www.w3.org/2000/01/rdf-schema#"},
+            "@id": f"dn:synset-{n}",
+            "@type": "ontolex:LexicalConcept",
+            "rdfs:label": {"@value": f"{{ord{n}_§1}}", "@language": "da"}}
+
+
+def _zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+class StubDanNet:
+    """Fixture lookup, injected latency and (optionally) recording of misses."""
+
+    def __init__(self, fixtures_path=FIXTURES, latency=0.0, jitter=0.0,
+                 endpoint_latency=None, synsets=5000, record_from=None):
+        self.fixtures_path = fixtures_path
+        with open(fixtures_path, encoding="utf-8") as f:
+            self.fixtures = json.load(f)
+        self.latency = latency
+        self.jitter = jitter
+        self.endpoint_latency = endpoint_latency or {}
+        self.synsets = synsets
+        self.record_from = record_from.rstrip("/") if record_from else None
+        self.exports = {}
+        self.lock = threading.Lock()
+        self.base_url = ""
+
+    def delay(self, path):
+        """Injected latency in seconds for a request path."""
+        base = self.latency
+        for prefix, seconds in self.endpoint_latency.items():
+            if path.startswith(prefix):
+                base = seconds
+        return base + random.uniform(0, self.jitter) if self.jitter else base
+
+    def export(self, path):
+        """Synthetic export archives, generated once."""
+        with self.lock:
+            if path not in self.exports:
+                if path == "/export/csv/dn":
+                    self.exports[path] = synthetic_csv_export(self.synsets)
+                elif path == "/export/rdf/cor":
+                    self.exports[path] = synthetic_cor_export(self.synsets)
+                else:
+                    return None
+            return self.exports[path]
+
+    @staticmethod
+    def matches(entry, path, params):
+        if entry["path"] != path:
+            return False
+        for name, expected in (entry.get("params") or {}).items():
+            value = params.get(name)
+            if value is None:
+                return False
+            if expected.startswith("~"):
+                if not re.search(expected[1:], value):
+                    return False
+            elif value != expected:
+                return False
+        return True
+
+    def lookup(self, path, params):
+        """First matching entry, else the path's fallback (not used when recording)."""
+        fallback = None
+        for entry in self.fixtures:
+            if self.matches(entry, path, params):
+                if not entry.get("fallback"):
+                    return entry
+                fallback = fallback or entry
+        if self.record_from:
+            return self.record(path, params)
+        return fallback
+
+    def record(self, path, params):
+        """Fetch a missing exchange from the upstream server and store it."""
+        response = httpx.get(self.record_from + path, params=params,
+                             follow_redirects=True, timeout=60.0)
+        content_type = response.headers.get("content-type", "application/json")
+        body = response.json() if "json" in content_type else response.text
+        entry = {"path": path, "params": {k: v for k, v in params.items() if k != "format"},
+                 "status": response.status_code, "content_type": content_type, "body": body}
+        with self.lock:
+            self.fixtures.append(entry)
+            with open(self.fixtures_path, "w", encoding="utf-8") as f:
+                json.dump(self.fixtures, f, ensure_ascii=False, indent=1)
+        return entry
+
+    def respond(self, path, params):
+        """(status, content type, body bytes) for a request."""
+        archive = self.export(path) if path.startswith("/export/") else None
+        if archive is not None:
+            return 200, "application/zip", archive
+
+        entry = self.lookup(path, params)
+        if entry is None:
+            synset = re.fullmatch(r"/dannet/data/synset-(\d+)", path)
+            if synset and 1 <= int(synset.group(1)) <= self.synsets:
+                body = json.dumps(synthetic_entity(int(synset.group(1)), self.base_url), ensure_ascii=False)
+                return 200, "application/json", body.encode("utf-8")
+            return 404, "application/json", b'{"error": "Not found"}'
+        if "file" in entry:
+            path = os.path.join(os.path.dirname(self.fixtures_path), entry["file"])
+            with open(path, encoding="utf-8") as f:
+                body = f.read()
+        else:
+            body = entry["body"]
+        if not isinstance(body, str):
+            body = json.dumps(body, ensure_ascii=False)
+        body = body.replace("{{base_url}}", self.base_url)
+        return entry.get("status", 200), entry.get("content_type", "application/json"), body.encode("utf-8")
+
+
+def make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = dict(parse_qsl(url.query))
+            time.sleep(stub.delay(url.path))
+            status, content_type, body = stub.respond(url.path, params)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(stub, host="127.0.0.1", port=0):
+    """Start the stub in a background thread; returns (server, base URL)."""
+    server = ThreadingHTTPServer((host, port), make_handler(stub))
+    server.daemon_threads = True
+    stub.base_url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stub.base_url
+
+
+def parse_endpoint_latency(values):
+    """["/dannet/sparql=150", ...] -> {"/dannet/sparql": 0.15, ...}"""
+    result = {}
+    for value in values or []:
+        prefix, _, ms = value.partition("=")
+        result[prefix] = float(ms) / 1000
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3456)
+    parser.add_argument("--fixtures", default=FIXTURES, help="Recorded exchanges (JSON)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, 0..jitter (ms)")
+    parser.add_argument("--endpoint-latency", action="append", metavar="PREFIX=MS",
+                        help="Latency override for paths starting with PREFIX (repeatable)")
+    parser.add_argument("--synsets", type=int, default=5000, help="Size of the synthetic exports")
+    parser.add_argument("--record", metavar="URL", help="Forward unmatched requests to URL and record them")
+    args = parser.parse_args()
+
+    stub = StubDanNet(args.fixtures, args.latency / 1000, args.jitter / 1000,
+                      parse_endpoint_latency(args.endpoint_latency), args.synsets, args.record)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(stub))
+    stub.base_url = f"http://{args.host}:{args.port}"
+    print(f"Stub DanNet server on {stub.base_url} ({len(stub.fixtures)} fixtures)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
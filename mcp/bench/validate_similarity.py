@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Validate the local taxonomy similarity engine against the server's dnf: functions.
+
+Samples synset pairs from the local taxonomy, scores them with dnf:path, dnf:lch
+and dnf:wup on the DanNet server, and reports every pair where the local score
+differs. Pairs are drawn partly from the ranked neighbours of random synsets, so
+that related (non-zero) pairs are well represented, and every synset with a
+self-referential hypernym is paired with a neighbour, since those are where the
+depth rule of max-depth is easiest to get wrong. Before going to the server,
+the local depths of a small graph with self-loops are checked against the
+values max-depth gives for it.
+
+Usage (from the mcp directory):
+    uv run bench/validate_similarity.py                     # against wordnet.dk
+    uv run bench/validate_similarity.py --base-url http://localhost:3456 --pairs 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import dannet_mcp_server as server  # noqa: E402
+
+METRICS = ("path", "lch", "wup")
+
+
+# Expected max-depth (similarity.clj) of a graph with self-referential hypernyms:
+# the walk follows a self-loop once before the synset leaves its own path
+SELF_LOOP_GRAPH = {"a": {"a"}, "b": {"b", "root"}, "c": {"b"}, "d": {"d", "c"}}
+SELF_LOOP_DEPTHS = {"root": 0, "a": 1, "b": 2, "c": 3, "d": 5}
+
+
+def check_self_loop_depths():
+    """Local depths and taxonomy depth of SELF_LOOP_GRAPH; returns the mismatches."""
+    taxonomy = server.Taxonomy(SELF_LOOP_GRAPH, {s: "noun" for s in SELF_LOOP_DEPTHS}, {})
+    mismatches = [f"max-depth({s}): local={taxonomy.depth[taxonomy.index[s]]} expected={want}"
+                  for s, want in SELF_LOOP_DEPTHS.items() if taxonomy.depth[taxonomy.index[s]] != want]
+    if taxonomy.taxonomy_depth != {"noun": 5}:
+        mismatches.append(f"taxonomy depth: local={taxonomy.taxonomy_depth} expected={{'noun': 5}}")
+    return mismatches
+
+
+def sample_pairs(taxonomy, n, seed):
+    """Half random pairs, half pairs of a synset and one of its top neighbours, plus the self-loops."""
+    rng = random.Random(seed)
+    scored = [s for s in taxonomy.ids
+              if taxonomy.parents[taxonomy.index[s]] or taxonomy.index[s] in taxonomy.self_loops]
+    pairs = [tuple(rng.sample(scored, 2)) for _ in range(n // 2)]
+    while len(pairs) < n:
+        a = rng.choice(scored)
+        neighbours = taxonomy.most_similar(a, "wup", 20)
+        if neighbours:
+            pairs.append((a, rng.choice(neighbours)[0]))
+    for i in sorted(taxonomy.self_loops):
+        a = taxonomy.ids[i]
+        neighbours = taxonomy.most_similar(a, "wup", 20)
+        pairs.append((a, rng.choice(neighbours)[0] if neighbours else rng.choice(scored)))
+    return pairs
+
+
+def server_scores(pairs):
+    """Score pairs with the dnf: functions, a few pairs per query (100-row cap)."""
+    scores = {}
+    for i in range(0, len(pairs), 50):
+        batch = pairs[i:i + 50]
+        values = " ".join(f"(dn:{a} dn:{b})" for a, b in batch)
+        query = f"""
+SELECT ?a ?b ?path ?lch ?wup WHERE {{
+  VALUES (?a ?b) {{ {values} }}
+  BIND(dnf:path(?a, ?b) AS ?path)
+  BIND(dnf:lch(?a, ?b) AS ?lch)
+  BIND(dnf:wup(?a, ?b) AS ?wup)
+}}
+"""
+        result = server.sparql_query(query, max_results=100, distinct=False)
+        for b in result.get("results", {}).get("bindings", []):
+            key = (server.parse_resource_id(b["a"]["value"]),
+                   server.parse_resource_id(b["b"]["value"]))
+            scores[key] = {m: float(b[m]["value"]) if m in b else None for m in METRICS}
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default=server.REMOTE_URL)
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    args = parser.parse_args()
+
+    local = check_self_loop_depths()
+    for mismatch in local:
+        print(f"MISMATCH {mismatch}")
+    if local:
+        sys.exit(1)
+    print("Self-loop depths match max-depth")
+
+    server.dannet_client = server.DanNetClient(args.base_url)
+    start = time.perf_counter()
+    taxonomy = server.get_taxonomy()
+    if taxonomy is None:
+        sys.exit("Could not load the local taxonomy")
+    print(f"Loaded taxonomy ({len(taxonomy.ids)} synsets) in {time.perf_counter() - start:.1f}s")
+
+    pairs = sample_pairs(taxonomy, args.pairs, args.seed)
+    remote = server_scores(pairs)
+
+    mismatches = 0
+    for a, b in pairs:
+        expected = remote.get((a, b))
+        if expected is None:
+            continue
+        for metric in METRICS:
+            local = taxonomy.similarity(a, b, metric)
+            want = expected[metric]
+            if (local is None) != (want is None) or (
+                    local is not None and abs(local - want) > args.tolerance):
+                mismatches += 1
+                print(f"MISMATCH {metric}({a}, {b}): local={local} server={want}")
+
+    print(f"{len(remote)} pairs ({len(taxonomy.self_loops)} self-loop synsets) x {len(METRICS)} metrics "
+          f"compared, {mismatches} mismatches")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,17 +18,47 @@ Usage:
 """
 
 import argparse
+import atexit
+import base64
+import bisect
+import contextlib
+import csv
+import functools
+import gzip
+import heapq
+import io
 import logging
 import json
+import math
 import os
+import random
+import re
+import shutil
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+import xml.etree.ElementTree as ElementTree
+import zipfile
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from functools import lru_cache
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple, Union
 from urllib.parse import urljoin
 
 import httpx
 from pydantic import BaseModel, Field
 from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel.server import request_ctx
 from mcp.server.transport_security import TransportSecuritySettings
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -40,12 +70,209 @@ LOCAL_URL = "http://localhost:3456"
 TIMEOUT = 45.0
 MAX_RETRIES = 3
 
-# Session-scoped cache for get_resource calls; keyed on (base_url, resource_id).
-# A plain dict is sufficient — MCP server processes are short-lived and memory is not a concern.
-_resource_cache: Dict[tuple, Dict] = {}
+# Local copies of the DanNet exports are kept here (see get_form_index)
+DATA_DIR = os.path.expanduser(os.getenv('DANNET_MCP_DATA_DIR', '~/.cache/dannet-mcp'))
+# How often (seconds) the server's dataset version is compared against the local exports
+DATA_VERSION_CHECK_INTERVAL = 3600
+# Seconds before a background index build that produced nothing is started again
+INDEX_RETRY_INTERVAL = 300
+
+# Lock stripes per StripedCache; writers of keys on different stripes never contend
+CACHE_STRIPES = 16
+
+
+class StripedCache:
+    """
+    Dict-like cache safe to share between the threads tools run on.
+
+    Keys are spread over CACHE_STRIPES dicts, each with its own lock. Lookups
+    take no lock: a single dict read is atomic, also on free-threaded builds.
+    Stores, setdefault and removals lock the key's stripe. Iteration, len and
+    keys work on a snapshot taken one stripe at a time, so they never fail on
+    a concurrent insert and never block all writers at once.
+
+    With max_entries set, each stripe evicts its oldest entries beyond its share
+    of the limit (the worker processes of --workers keep a small cache in front
+    of the shared one).
+    """
+
+    def __init__(self, stripes: int = CACHE_STRIPES, max_entries: Optional[int] = None):
+        self._stripes: List[Dict[Any, Any]] = [{} for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self.max_entries = max_entries
+
+    def _stripe(self, key) -> int:
+        return hash(key) % len(self._stripes)
+
+    def _evict(self, stripe: Dict[Any, Any]) -> None:
+        # Called with the stripe's lock held; dicts keep insertion order
+        if self.max_entries is not None:
+            while len(stripe) > max(1, self.max_entries // len(self._stripes)):
+                del stripe[next(iter(stripe))]
+
+    def get(self, key, default=None):
+        return self._stripes[self._stripe(key)].get(key, default)
+
+    def __getitem__(self, key):
+        return self._stripes[self._stripe(key)][key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._stripes[self._stripe(key)]
+
+    def __setitem__(self, key, value) -> None:
+        i = self._stripe(key)
+        with self._locks[i]:
+            self._stripes[i][key] = value
+            self._evict(self._stripes[i])
+
+    def setdefault(self, key, value):
+        """The cached value of key, storing value first if there is none; racing callers all get the winner."""
+        i = self._stripe(key)
+        with self._locks[i]:
+            value = self._stripes[i].setdefault(key, value)
+            self._evict(self._stripes[i])
+            return value
+
+    def pop(self, key, default=None):
+        i = self._stripe(key)
+        with self._locks[i]:
+            return self._stripes[i].pop(key, default)
+
+    def update(self, items: Dict[Any, Any]) -> None:
+        for key, value in items.items():
+            self[key] = value
+
+    def clear(self) -> None:
+        for stripe, lock in zip(self._stripes, self._locks):
+            with lock:
+                stripe.clear()
+
+    def keys(self) -> List[Any]:
+        keys: List[Any] = []
+        for stripe, lock in zip(self._stripes, self._locks):
+            with lock:
+                keys.extend(stripe)
+        return keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self._stripes)
+
+
+# Cache for get_resource calls, shared by all sessions; keyed on (base_url, resource_id),
+# so sessions using different servers (see switch_dannet_server) never mix entries.
+# Entities are kept as compact EntityRecords and only turned back into JSON-LD
+# dicts when a tool returns them (see compact_entity)
+_resource_cache = StripedCache()
+
+# One shared key tuple per distinct set of entity properties (see compact_entity)
+_record_shapes: Dict[tuple, tuple] = {}
+
+# JSON size of each cached entity, measured once for the payload metrics
+_payload_sizes = StripedCache()
+
+# Cached entities are stored without their JSON-LD @context; the prefix mappings of
+# all of them are kept once per base URL instead (see intern_context)
+_contexts: Dict[str, Dict[str, str]] = {}
+
+# Labels of referenced resources for enrich_labels; keyed on (base_url, resource),
+# None when the resource has no label. Bounded, as every labelled page adds to it
+LABEL_CACHE_ENTRIES = 50_000
+_label_cache = StripedCache(max_entries=LABEL_CACHE_ENTRIES)
 
 # Schema files never change between deployments, so cache them permanently for the process lifetime.
-_schema_cache: Dict[str, str] = {}
+_schema_cache = StripedCache()
+
+# Schemas bundled with the server, as served for the dataset version in its
+# manifest.json; refreshed copies for newer versions go to DATA_DIR/schemas
+SCHEMA_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schemas")
+
+# Entities each worker process of --workers keeps itself, in front of the shared cache
+WORKER_CACHE_ENTRIES = 5000
+# Seconds a worker waits for another one's write lock on the shared cache
+SHARED_CACHE_TIMEOUT = 5.0
+# A replacement worker dying within this many seconds stops the server instead of being replaced again
+WORKER_MIN_UPTIME = 10.0
+
+
+class SharedCache:
+    """
+    Entity cache shared by the worker processes of --workers: a SQLite database in WAL mode.
+
+    Sits behind each worker's own resource cache, so an entity one worker fetched
+    is read from here by the others instead of being requested again. Values are
+    the JSON-LD responses as received. It is best effort: when the database is
+    busy or failing, lookups miss and stores are skipped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.counts = {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection per thread; readers in WAL mode do not wait for writers
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=SHARED_CACHE_TIMEOUT, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS entities (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._local.connection = connection
+        return connection
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def get(self, key: tuple) -> Any:
+        try:
+            row = self._connection().execute("SELECT value FROM entities WHERE key = ?",
+                                             ("\t".join(key),)).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Shared cache lookup failed: {e}")
+            self._count("errors")
+            return None
+        self._count("hits" if row else "misses")
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: tuple, value: Any) -> None:
+        try:
+            self._connection().execute("INSERT OR IGNORE INTO entities VALUES (?, ?)",
+                                       ("\t".join(key), json.dumps(value, ensure_ascii=False)))
+        except sqlite3.Error as e:
+            logger.debug(f"Shared cache store failed: {e}")
+            self._count("errors")
+            return
+        self._count("stores")
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            entries = self._connection().execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        with self._lock:
+            return {"path": self.path, "entries": entries, **self.counts}
+
+
+# Set in the worker processes of --workers
+shared_cache: Optional[SharedCache] = None
+worker_index: Optional[int] = None
+
+
+def load_shared(cache_key: tuple, fetch: Callable[[], Any]) -> Any:
+    """An entity for the resource cache: from the shared cache of --workers if there, else fetched (and shared)."""
+    if shared_cache is None:
+        return fetch()
+    data = shared_cache.get(cache_key)
+    if data is None:
+        data = fetch()
+        if data:
+            shared_cache.put(cache_key, data)
+    return data
 
 
 class DanNetError(Exception):
@@ -87,7 +314,8 @@ def with_retry(entity_not_found_msg=None):
         def wrapper(*args, **kwargs):
             for attempt in range(MAX_RETRIES):
                 try:
-                    return func(*args, **kwargs)
+                    with tracer.span(func.__name__, attempt=attempt + 1):
+                        return func(*args, **kwargs)
                     
                 except httpx.HTTPStatusError as e:
                     if e.response.status_code == 404:
@@ -226,15 +454,17 @@ def _make_sparql_request(client: DanNetClient, url: str, params: Dict) -> Dict:
 class DanNetClient:
     """HTTP client for DanNet API with format negotiation support"""
 
-    def __init__(self, base_url: str = REMOTE_URL):
+    def __init__(self, base_url: str = REMOTE_URL, http_client: Optional[httpx.Client] = None):
         """
         Initialize DanNet client.
 
         Args:
             base_url: DanNet service URL
+            http_client: HTTP client to send requests with, so that clients for
+                different servers can share its connection pools (default: a new one)
         """
         self.base_url = base_url.rstrip('/')
-        self.client = httpx.Client(timeout=TIMEOUT)
+        self.client = http_client or httpx.Client(timeout=TIMEOUT, transport=upstream_transport())
 
     @with_retry()
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
@@ -266,12 +496,25 @@ class DanNetClient:
 
     def get_resource(self, resource_id: str) -> Dict:
         """Get a specific resource (synset, word, etc.) by ID, with session-scoped LRU cache."""
+        return materialize_entity(self.get_record(resource_id))
+
+    def get_record(self, resource_id: str) -> Any:
+        """The cached EntityRecord of a resource, fetching it on a miss (see get_resource)."""
         cache_key = (self.base_url, resource_id)
-        if cache_key in _resource_cache:
-            return _resource_cache[cache_key]
-        result = self._make_request(f"/dannet/data/{resource_id}")
-        _resource_cache[cache_key] = result
-        return result
+        with tracer.span("resource cache", key=resource_id) as span:
+            record = _resource_cache.get(cache_key)
+            if record is None and prefetcher is not None and prefetcher.wait(cache_key):
+                record = _resource_cache.get(cache_key)
+            if record is not None:
+                span.set(hit=True)
+                observe_cache_lookup(cache_key, True)
+                return record
+            span.set(hit=False)
+            observe_cache_lookup(cache_key, False)
+            data = load_shared(cache_key, lambda: self._make_request(f"/dannet/data/{resource_id}"))
+            record = compact_entity(intern_context(self.base_url, data))
+            # A concurrent miss on the same key may have stored it first; keep one record
+            return _resource_cache.setdefault(cache_key, record)
 
     def autocomplete(self, prefix: str) -> List[str]:
         """Get autocomplete suggestions for a word prefix"""
@@ -290,11 +533,934 @@ class DanNetClient:
             return []
 
 
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+# Every tool call and every upstream HTTP request is timed and counted. In HTTP
+# mode the numbers are served as Prometheus text on /metrics.
+
+# Latency histogram bucket bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Name of the tool currently executing, used to attribute upstream requests
+current_tool: ContextVar[str] = ContextVar("current_tool", default="none")
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (non-cumulative counts, cumulated on render)."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+def _prometheus_labels(labels: Dict[str, str]) -> str:
+    """Render a Prometheus label set, escaping backslashes, quotes and newlines."""
+    def escape(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return "{" + ",".join(f'{k}="{escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+class Metrics:
+    """
+    Per-tool and per-endpoint counters and latency histograms.
+
+    Updates take a single lock held for a few dict operations, which keeps the
+    overhead negligible next to a tool call or an HTTP round trip.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tool_latency: Dict[str, Histogram] = {}
+        self.tool_errors: Dict[Tuple[str, str], int] = {}
+        self.upstream_latency: Dict[Tuple[str, str], Histogram] = {}
+        self.upstream_bytes: Dict[Tuple[str, str], int] = {}
+        self.upstream_errors: Dict[Tuple[str, str, str], int] = {}
+        self.payload_bytes: Dict[Tuple[str, str], int] = {}
+        self.cache_lookups: Dict[Tuple[str, str], int] = {}
+
+    def observe_tool(self, tool: str, seconds: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.tool_latency.setdefault(tool, Histogram()).observe(seconds)
+            if error:
+                key = (tool, error)
+                self.tool_errors[key] = self.tool_errors.get(key, 0) + 1
+
+    def observe_request(self, endpoint: str, seconds: float, nbytes: int,
+                        error: Optional[str] = None) -> None:
+        key = (current_tool.get(), endpoint)
+        with self._lock:
+            self.upstream_latency.setdefault(key, Histogram()).observe(seconds)
+            self.upstream_bytes[key] = self.upstream_bytes.get(key, 0) + nbytes
+            if error:
+                error_key = key + (error,)
+                self.upstream_errors[error_key] = self.upstream_errors.get(error_key, 0) + 1
+
+    def observe_payload(self, full: int, returned: int) -> None:
+        """Size of an entity before and after projection, attributed to the current tool."""
+        tool = current_tool.get()
+        with self._lock:
+            for stage, nbytes in (("full", full), ("returned", returned)):
+                key = (tool, stage)
+                self.payload_bytes[key] = self.payload_bytes.get(key, 0) + nbytes
+
+    def observe_cache(self, outcome: str) -> None:
+        """A resource cache lookup by the current tool: "hit", "miss", "warmed" or "prefetched"."""
+        key = (current_tool.get(), outcome)
+        with self._lock:
+            self.cache_lookups[key] = self.cache_lookups.get(key, 0) + 1
+
+    @staticmethod
+    def _render_histogram(lines: List[str], name: str, labels: Dict[str, str], h: Histogram) -> None:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), h.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_prometheus_labels({**labels, 'le': le})} {cumulative}")
+        lines.append(f"{name}_sum{_prometheus_labels(labels)} {h.total}")
+        lines.append(f"{name}_count{_prometheus_labels(labels)} {h.count}")
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                "# HELP dannet_mcp_tool_duration_seconds Duration of MCP tool calls.",
+                "# TYPE dannet_mcp_tool_duration_seconds histogram",
+            ]
+            for tool, h in sorted(self.tool_latency.items()):
+                self._render_histogram(lines, "dannet_mcp_tool_duration_seconds", {"tool": tool}, h)
+
+            lines += ["# HELP dannet_mcp_tool_errors_total Failed MCP tool calls by error class.",
+                      "# TYPE dannet_mcp_tool_errors_total counter"]
+            for (tool, error), n in sorted(self.tool_errors.items()):
+                lines.append(f"dannet_mcp_tool_errors_total{_prometheus_labels({'tool': tool, 'error': error})} {n}")
+
+            lines += ["# HELP dannet_mcp_upstream_request_duration_seconds Duration of upstream HTTP requests.",
+                      "# TYPE dannet_mcp_upstream_request_duration_seconds histogram"]
+            for (tool, endpoint), h in sorted(self.upstream_latency.items()):
+                self._render_histogram(lines, "dannet_mcp_upstream_request_duration_seconds",
+                                       {"tool": tool, "endpoint": endpoint}, h)
+
+            lines += ["# HELP dannet_mcp_upstream_response_bytes_total Bytes received from upstream.",
+                      "# TYPE dannet_mcp_upstream_response_bytes_total counter"]
+            for (tool, endpoint), n in sorted(self.upstream_bytes.items()):
+                lines.append(f"dannet_mcp_upstream_response_bytes_total"
+                             f"{_prometheus_labels({'tool': tool, 'endpoint': endpoint})} {n}")
+
+            lines += ["# HELP dannet_mcp_upstream_errors_total Failed upstream requests by error class.",
+                      "# TYPE dannet_mcp_upstream_errors_total counter"]
+            for (tool, endpoint, error), n in sorted(self.upstream_errors.items()):
+                labels = {'tool': tool, 'endpoint': endpoint, 'error': error}
+                lines.append(f"dannet_mcp_upstream_errors_total{_prometheus_labels(labels)} {n}")
+
+            lines += ["# HELP dannet_mcp_payload_bytes_total Entity JSON returned by tools, before (full) "
+                      "and after (returned) field projection.",
+                      "# TYPE dannet_mcp_payload_bytes_total counter"]
+            for (tool, stage), n in sorted(self.payload_bytes.items()):
+                lines.append(f"dannet_mcp_payload_bytes_total{_prometheus_labels({'tool': tool, 'stage': stage})} {n}")
+
+            lines += ["# HELP dannet_mcp_resource_cache_lookups_total Resource cache lookups by outcome; "
+                      "warmed/prefetched = first hit on an entry loaded by the warm-up/prefetcher.",
+                      "# TYPE dannet_mcp_resource_cache_lookups_total counter"]
+            for (tool, outcome), n in sorted(self.cache_lookups.items()):
+                labels = {'tool': tool, 'outcome': outcome}
+                lines.append(f"dannet_mcp_resource_cache_lookups_total{_prometheus_labels(labels)} {n}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+# Tool calls can also be traced: every call is a root span, with child spans for
+# nested tool calls, retry attempts, cache lookups and HTTP requests. Complete
+# traces are handed to exporters (JSONL file, OTLP/HTTP collector).
+
+# Innermost open span of the current trace (None outside recorded traces)
+current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed operation within a trace; finished spans are collected on the root."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "root", "name", "kind",
+                 "attributes", "error", "start", "end", "finished")
+
+    def __init__(self, name: str, kind: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.root = parent.root if parent else self
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start = time.time_ns()
+        self.end = 0
+        self.finished: List["Span"] = []
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start,
+            "duration_ms": (self.end - self.start) / 1e6,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoSpan:
+    """Stand-in yielded when the call is not being traced."""
+
+    def set(self, **attributes) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """
+    Span bookkeeping and sampling.
+
+    A trace is recorded with probability sample_rate. With slow_threshold set
+    (seconds), every trace is recorded but unsampled ones are only exported if
+    the root span took at least that long.
+    """
+
+    def __init__(self):
+        self.exporters: List["SpanExporter"] = []
+        self.sample_rate = 1.0
+        self.slow_threshold: Optional[float] = None
+
+    @contextlib.contextmanager
+    def trace(self, name: str, **attributes):
+        """Open the root span of a new trace (one per tool call)."""
+        if not self.exporters or current_span.get() is not None:
+            yield _NO_SPAN
+            return
+        sampled = random.random() < self.sample_rate
+        if not sampled and self.slow_threshold is None:
+            yield _NO_SPAN
+            return
+        root = Span(name, "server", None, attributes)
+        try:
+            with self._open(root):
+                yield root
+        finally:
+            if sampled or (root.end - root.start) / 1e9 >= self.slow_threshold:
+                for exporter in self.exporters:
+                    exporter.submit(root.finished)
+
+    @contextlib.contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes):
+        """Open a child span of the current span; a no-op outside recorded traces."""
+        parent = current_span.get()
+        if parent is None:
+            yield _NO_SPAN
+            return
+        span = Span(name, kind, parent, attributes)
+        with self._open(span):
+            yield span
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _open(span: Span):
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end = time.time_ns()
+            current_span.reset(token)
+            span.root.finished.append(span)
+
+    def close(self) -> None:
+        for exporter in self.exporters:
+            exporter.close()
+
+
+class SpanExporter(ABC):
+    """
+    Writes finished traces from a background thread, so tool calls never wait on I/O.
+
+    Subclasses implement write, which receives each batch of spans in that thread.
+    """
+
+    def __init__(self):
+        self._queue: deque = deque()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, spans: List[Span]) -> None:
+        self._queue.append(spans)
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            batch: List[Span] = []
+            while self._queue:
+                batch.extend(self._queue.popleft())
+            if batch:
+                try:
+                    self.write(batch)
+                except Exception as e:
+                    logger.warning(f"Exporting {len(batch)} spans failed: {e}")
+
+    @abstractmethod
+    def write(self, spans: List[Span]) -> None:
+        """Export a batch of finished spans."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends one JSON object per span to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        super().__init__()
+
+    def write(self, spans: List[Span]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpSpanExporter(SpanExporter):
+    """Posts spans to an OpenTelemetry collector using OTLP/HTTP with JSON encoding."""
+
+    KINDS = {"internal": 1, "server": 2, "client": 3}
+
+    def __init__(self, endpoint: str):
+        self.url = endpoint.rstrip('/') + "/v1/traces"
+        super().__init__()
+
+    def write(self, spans: List[Span]) -> None:
+        otlp_spans = []
+        for span in spans:
+            otlp = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": self.KINDS[span.kind],
+                "startTimeUnixNano": str(span.start),
+                "endTimeUnixNano": str(span.end),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                otlp["parentSpanId"] = span.parent_id
+            otlp_spans.append(otlp)
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "dannet-mcp"}}]},
+            "scopeSpans": [{"scope": {"name": "dannet_mcp_server"}, "spans": otlp_spans}],
+        }]}
+        httpx.post(self.url, json=payload, timeout=10.0).raise_for_status()
+
+
+tracer = Tracer()
+
+# Path prefixes of the DanNet endpoints, most specific first
+_ENDPOINTS = ("/dannet/data", "/dannet/search", "/dannet/autocomplete", "/dannet/sparql",
+              "/dannet/external", "/schema", "/export")
+
+
+def endpoint_class(url: httpx.URL) -> str:
+    """Group a request URL by DanNet endpoint (or by host for other sites, e.g. DDO)."""
+    for prefix in _ENDPOINTS:
+        if url.path.startswith(prefix):
+            return prefix
+    return url.host
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """httpx transport recording latency, response size and errors per request."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = endpoint_class(request.url)
+        with tracer.span(f"{request.method} {endpoint}", "client", url=str(request.url)) as span:
+            start = time.perf_counter()
+            try:
+                response = self._transport.handle_request(request)
+                response.read()
+            except Exception as e:
+                metrics.observe_request(endpoint, time.perf_counter() - start, 0, type(e).__name__)
+                raise
+            error = f"HTTP {response.status_code}" if response.status_code >= 400 else None
+            metrics.observe_request(endpoint, time.perf_counter() - start, len(response.content), error)
+            span.set(status=response.status_code, bytes=len(response.content))
+            if response.is_redirect:
+                span.set(redirect=response.headers.get("location", ""))
+            return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+# Upstream traffic can be recorded to a cassette (gzipped JSONL) and replayed
+# from it, to reproduce a session offline. A cassette starts with a header line,
+# followed by one line per HTTP exchange and per tool call, in completion order.
+
+# Response headers kept in a cassette; bodies are stored decoded
+_CASSETTE_HEADERS = ("content-type", "location")
+
+
+class CassetteRecorder:
+    """Appends HTTP exchanges and tool calls to a cassette file."""
+
+    def __init__(self, path: str, base_url: str):
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._start = time.monotonic()
+        self._write({"type": "header", "version": 1, "base_url": base_url,
+                     "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def record_exchange(self, request: httpx.Request, response: httpx.Response, elapsed: float) -> None:
+        record = {
+            "type": "http",
+            "t": round(time.monotonic() - self._start - elapsed, 6),
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k in _CASSETTE_HEADERS},
+            "elapsed": round(elapsed, 6),
+        }
+        try:
+            record["body"] = response.content.decode('utf-8')
+        except UnicodeDecodeError:
+            record["body_b64"] = base64.b64encode(response.content).decode('ascii')
+        self._write(record)
+
+    def record_call(self, tool: str, arguments: Dict[str, Any], duration: float, error: Optional[str]) -> None:
+        self._write({
+            "type": "call",
+            "t": round(time.monotonic() - self._start - duration, 6),
+            "tool": tool,
+            "arguments": arguments,
+            "duration": round(duration, 6),
+            "error": error,
+        })
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """httpx transport writing every exchange to a cassette."""
+
+    def __init__(self, transport: httpx.BaseTransport, recorder: CassetteRecorder):
+        self._transport = transport
+        self._recorder = recorder
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = self._transport.handle_request(request)
+        response.read()
+        self._recorder.record_exchange(request, response, time.perf_counter() - start)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+def read_cassette(path: str):
+    """Yield the records of a cassette file (the header first)."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """
+    httpx transport answering requests from a cassette instead of the network.
+
+    Repeated requests for the same URL get the recorded responses in order, the
+    last one being repeated once they run out. With latency="original" every
+    response is delayed by the time it originally took; with "zero" it isn't.
+    Requests missing from the cassette get a 404.
+    """
+
+    def __init__(self, path: str, latency: str = "original"):
+        self.latency = latency
+        self.base_url: Optional[str] = None
+        self._exchanges: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._served: Dict[Tuple[str, str], int] = {}
+        self.misses = 0
+        self._lock = threading.Lock()
+        for record in read_cassette(path):
+            if record["type"] == "header":
+                self.base_url = record["base_url"]
+            elif record["type"] == "http":
+                self._exchanges.setdefault((record["method"], record["url"]), []).append(record)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = (request.method, str(request.url))
+        with self._lock:
+            recorded = self._exchanges.get(key)
+            if recorded:
+                n = self._served.get(key, 0)
+                self._served[key] = n + 1
+                record = recorded[min(n, len(recorded) - 1)]
+            else:
+                self.misses += 1
+        if not recorded:
+            logger.warning(f"No recorded response for {request.method} {request.url}")
+            return httpx.Response(404, json={"error": "Not in cassette"}, request=request)
+
+        if self.latency == "original":
+            time.sleep(record["elapsed"])
+        content = (base64.b64decode(record["body_b64"]) if "body_b64" in record
+                   else record["body"].encode('utf-8'))
+        return httpx.Response(record["status"], headers=record["headers"], content=content, request=request)
+
+
+# Several DanNet servers (wordnet.dk, a local instance, mirrors) can serve the
+# requests for one base URL; each request goes to the fastest healthy one.
+
+# Weight of the newest sample in the moving latency averages
+UPSTREAM_EWMA_ALPHA = 0.3
+# Latency samples older than this (seconds) no longer rank an upstream, so one
+# that was passed over gets tried again
+UPSTREAM_LATENCY_TTL = 60.0
+# Response statuses that count as the upstream failing; the request is retried on the next one
+UPSTREAM_FAILOVER_STATUSES = (502, 503)
+UPSTREAM_HEALTH_TIMEOUT = 3.0
+
+
+def _ewma(average: Optional[float], sample: float) -> float:
+    return sample if average is None else average + UPSTREAM_EWMA_ALPHA * (sample - average)
+
+
+class Upstream:
+    """Health and latency of one upstream DanNet server."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip('/')
+        self.healthy = True
+        self.health_latency: Optional[float] = None
+        # Request class (endpoint_class) -> (latency EWMA in seconds, time of the last sample)
+        self.latency: Dict[str, Tuple[float, float]] = {}
+        self.requests = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+
+    def estimate(self, request_class: str, now: float) -> float:
+        """Expected latency of a request of the class: its recent average, else the health check's."""
+        average, updated = self.latency.get(request_class, (None, 0.0))
+        if average is not None and now - updated < UPSTREAM_LATENCY_TTL:
+            return average
+        return self.health_latency or 0.0
+
+
+class UpstreamRouter(httpx.BaseTransport):
+    """
+    httpx transport sending the requests for one base URL (the first upstream)
+    to the fastest healthy of several servers with the same data.
+
+    Latency is tracked as a moving average per upstream and request class
+    (endpoint_class), and the upstreams are ranked per request: healthy before
+    unhealthy, then by expected latency, then in configured order. A request
+    failing on one upstream with a connection error or a 502/503 marks it
+    unhealthy and moves on to the next. A background thread checks every
+    upstream every health_interval seconds, which brings failed ones back and
+    gives the latency estimate of upstreams that get no traffic. Requests for
+    other URLs (other servers, DDO) pass through unchanged.
+
+    Clients and caches keep using the base URL, so an upstream change is
+    invisible to them. The router is shared by all clients and never closed.
+    """
+
+    def __init__(self, urls: List[str], health_interval: float = 10.0):
+        self.upstreams = [Upstream(url) for url in urls]
+        self.primary = self.upstreams[0].url
+        self.health_interval = health_interval
+        self.failovers = 0
+        self._transport = httpx.HTTPTransport()
+        self._lock = threading.Lock()
+        if health_interval > 0:
+            threading.Thread(target=self._check_health, name="upstream-health", daemon=True).start()
+
+    def ranked(self, request_class: str) -> List[Upstream]:
+        """The upstreams in the order to try them for a request of the class."""
+        now = time.monotonic()
+        with self._lock:
+            return sorted(self.upstreams, key=lambda u: (not u.healthy, u.estimate(request_class, now)))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        path = url[len(self.primary):]
+        if not url.startswith(self.primary) or path[:1] not in ('', '/', '?'):
+            return self._transport.handle_request(request)
+
+        request_class = endpoint_class(request.url)
+        headers = [(k, v) for k, v in request.headers.raw if k.lower() != b'host']
+        candidates = self.ranked(request_class)
+        for n, upstream in enumerate(candidates):
+            last = n == len(candidates) - 1
+            routed = httpx.Request(request.method, upstream.url + path, headers=headers,
+                                   stream=request.stream, extensions=request.extensions)
+            # httpx only fills in Host itself for requests built without a stream
+            routed.headers['Host'] = routed.url.netloc.decode('ascii')
+            start = time.perf_counter()
+            try:
+                response = self._transport.handle_request(routed)
+                response.read()
+            except httpx.TransportError as e:
+                self._failed(upstream, f"{type(e).__name__}: {e}", last)
+                if last:
+                    raise
+                continue
+            if response.status_code in UPSTREAM_FAILOVER_STATUSES:
+                self._failed(upstream, f"HTTP {response.status_code}", last)
+                if not last:
+                    response.close()
+                    continue
+                return response
+            with self._lock:
+                upstream.requests += 1
+                average = upstream.latency.get(request_class, (None, 0.0))[0]
+                upstream.latency[request_class] = (_ewma(average, time.perf_counter() - start), time.monotonic())
+            return response
+
+    def _failed(self, upstream: Upstream, error: str, last: bool) -> None:
+        with self._lock:
+            upstream.requests += 1
+            upstream.failures += 1
+            upstream.healthy = False
+            upstream.last_error = error
+            if not last:
+                self.failovers += 1
+        logger.warning(f"Upstream {upstream.url} failed ({error})" + ("" if last else "; failing over"))
+
+    def _check_health(self) -> None:
+        client = httpx.Client(timeout=UPSTREAM_HEALTH_TIMEOUT)
+        while True:
+            for upstream in self.upstreams:
+                start = time.perf_counter()
+                try:
+                    status = client.get(f"{upstream.url}/").status_code
+                    # Like _detect_available_server: anything but a server error means it is up
+                    error = f"HTTP {status}" if status >= 500 else None
+                except httpx.HTTPError as e:
+                    error = f"{type(e).__name__}: {e}"
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    if error is None:
+                        upstream.health_latency = _ewma(upstream.health_latency, elapsed)
+                        if not upstream.healthy:
+                            logger.info(f"Upstream {upstream.url} is healthy again")
+                    else:
+                        upstream.last_error = error
+                    upstream.healthy = error is None
+                    upstream.checked_at = time.time()
+            time.sleep(self.health_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per upstream: health, request and failure counts and latency averages."""
+        with self._lock:
+            return {
+                "failovers": self.failovers,
+                "upstreams": [{
+                    "url": u.url,
+                    "healthy": u.healthy,
+                    "requests": u.requests,
+                    "failures": u.failures,
+                    "latency_ms": {cls: round(average * 1000, 1) for cls, (average, _) in u.latency.items()},
+                    "health_check_ms": round(u.health_latency * 1000, 1) if u.health_latency is not None else None,
+                    "last_error": u.last_error,
+                    "checked_at": (time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(u.checked_at))
+                                   if u.checked_at else None),
+                } for u in self.upstreams],
+            }
+
+    def close(self) -> None:
+        # Shared by every client (see upstream_transport), so it lives as long as the process
+        pass
+
+
+# Set from the command line (--record / --replay / --upstream)
+cassette_recorder: Optional[CassetteRecorder] = None
+cassette_replay: Optional[ReplayTransport] = None
+upstream_router: Optional[UpstreamRouter] = None
+
+
+def upstream_transport() -> httpx.BaseTransport:
+    """Transport for upstream requests: network, recorded network or cassette replay."""
+    network = upstream_router or httpx.HTTPTransport()
+    if cassette_replay is not None:
+        transport = cassette_replay
+    elif cassette_recorder is not None:
+        transport = RecordingTransport(network, cassette_recorder)
+    else:
+        transport = network
+    return InstrumentedTransport(transport)
+
+
+# A sampled fraction of tool calls (and resource reads) can be profiled: a
+# background thread samples the Python stack of the calling thread, and the
+# stacks are appended per tool to collapsed-stack files ready for flamegraph.pl
+# or speedscope.
+
+# Number of profiled calls kept for get_profile_report
+PROFILE_HISTORY = 200
+
+
+class StackSampler:
+    """
+    Periodically samples the stacks of the threads running a profiled call.
+
+    A CPU-bound thread only hands over the GIL every sys.getswitchinterval()
+    (5 ms by default), which bounds the effective resolution for such calls.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._active: Dict[int, Tuple[Any, Dict[str, int]]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def start(self, thread_id: int, stop_code) -> None:
+        """Start sampling a thread; stacks are cut at the frame running stop_code."""
+        with self._lock:
+            self._active[thread_id] = (stop_code, {})
+        self._wakeup.set()
+
+    def stop(self, thread_id: int) -> Dict[str, int]:
+        """Stop sampling a thread; returns its sample count per folded stack."""
+        with self._lock:
+            _, counts = self._active.pop(thread_id, (None, {}))
+            return counts
+
+    def _run(self) -> None:
+        while True:
+            if not self._active:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                active = list(self._active.items())
+            samples = []
+            for thread_id, (stop_code, counts) in active:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None and frame.f_code is not stop_code:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if stack:
+                    samples.append((thread_id, counts, ";".join(reversed(stack))))
+            # Counted under the lock, and only for threads still sampled: once stop()
+            # has handed out a thread's counts, they are no longer written to
+            with self._lock:
+                for thread_id, counts, key in samples:
+                    entry = self._active.get(thread_id)
+                    if entry is not None and entry[1] is counts:
+                        counts[key] = counts.get(key, 0) + 1
+
+
+class Profiler:
+    """Profiles a sampled fraction of calls and keeps the most recent ones for reporting."""
+
+    def __init__(self, directory: str, sample_rate: float, interval: float):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.sampler = StackSampler(interval)
+        self.recent: deque = deque(maxlen=PROFILE_HISTORY)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, re.sub(r'[^\w.-]', '_', name) + ".folded")
+
+    @contextlib.contextmanager
+    def profile(self, name: str, arguments: Dict[str, Any], stop_code):
+        if random.random() >= self.sample_rate:
+            yield
+            return
+        thread_id = threading.get_ident()
+        self.sampler.start(thread_id, stop_code)
+        started_at = time.time()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            counts = self.sampler.stop(thread_id)
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            self._finish(name, arguments, started_at, wall, cpu, counts)
+
+    def _finish(self, name, arguments, started_at, wall, cpu, counts) -> None:
+        self_samples: Dict[str, int] = {}
+        for stack, n in counts.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            self_samples[leaf] = self_samples.get(leaf, 0) + n
+        hottest = sorted(self_samples.items(), key=lambda item: -item[1])[:5]
+        self.recent.append({
+            "name": name,
+            "arguments": repr(arguments)[:200],
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started_at)),
+            "wall_ms": round(wall * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+            "samples": sum(counts.values()),
+            "hottest_frames": [{"frame": frame, "samples": n} for frame, n in hottest],
+        })
+        if counts:
+            with self._lock, open(self.path(name), 'a', encoding='utf-8') as f:
+                for stack, n in counts.items():
+                    f.write(f"{stack} {n}\n")
+
+
+# Set from the command line (--profile)
+profiler: Optional[Profiler] = None
+
+
+def instrument_tool(fn):
+    """Wrap a tool function so its calls are timed, traced, profiled and attributed in the metrics."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = current_tool.set(fn.__name__)
+        start = time.perf_counter()
+        error = None
+        try:
+            with tracer.trace(fn.__name__, arguments=repr(kwargs or args)[:500]), \
+                    (profiler.profile(fn.__name__, kwargs, wrapper.__code__) if profiler
+                     else contextlib.nullcontext()):
+                result = fn(*args, **kwargs)
+            if prefetcher is not None:
+                prefetcher.after(fn.__name__, result)
+            return result
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            metrics.observe_tool(fn.__name__, duration, error)
+            if cassette_recorder is not None:
+                cassette_recorder.record_call(fn.__name__, kwargs, duration, error)
+            current_tool.reset(token)
+    return wrapper
+
+
+def profile_resource(uri: str, fn):
+    """Wrap a resource function so its reads are profiled like tool calls."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if profiler is None:
+            return fn(*args, **kwargs)
+        with profiler.profile(uri, kwargs, wrapper.__code__):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def trace_nested_tool(fn):
+    """Wrap a tool function so direct calls from other tools show up as child spans."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with tracer.span(fn.__name__):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+class InstrumentedFastMCP(FastMCP):
+    """
+    FastMCP server wrapping @tool() registrations in instrument_tool and @resource() in profile_resource.
+
+    Building the argument schemas of the tools takes most of the time spent
+    importing this module, so @tool() only collects the functions; they are
+    registered by register_pending_tools, which main() runs in the background
+    while the transport starts, and which tools/list and tools/call wait for.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending_tools: List[Tuple[tuple, dict, Any]] = []
+        self._pending_lock = threading.Lock()
+
+    def tool(self, *args, **kwargs):
+        def decorator(fn):
+            self._pending_tools.append((args, kwargs, fn))
+            # Tools calling other tools directly are traced as child spans but not
+            # counted in the metrics, so nested calls are attributed to the outer tool
+            return trace_nested_tool(fn)
+        return decorator
+
+    def register_pending_tools(self) -> None:
+        with self._pending_lock:
+            for args, kwargs, fn in self._pending_tools:
+                super().tool(*args, **kwargs)(instrument_tool(fn))
+            self._pending_tools.clear()
+
+    async def list_tools(self):
+        self.register_pending_tools()
+        return await super().list_tools()
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]):
+        self.register_pending_tools()
+        return await super().call_tool(name, arguments)
+
+    def resource(self, uri, *args, **kwargs):
+        register = super().resource(uri, *args, **kwargs)
+
+        def decorator(fn):
+            register(profile_resource(uri, fn))
+            return fn
+        return decorator
+
+
 # Initialize the DanNet client (will be set in main())
 dannet_client = None
 
 # Create FastMCP server with helpful instructions
-mcp = FastMCP(
+mcp = InstrumentedFastMCP(
     "DanNet",
     transport_security=TransportSecuritySettings(
         allowed_hosts=["localhost", "127.0.0.1", "wordnet.dk", "www.wordnet.dk"],
@@ -320,6 +1486,7 @@ QUICK START WORKFLOW:
    - dannet://dannet-schema → DanNet-specific WordNet relation extensions
    - dannet://ontological-types → Semantic categories (Animal, Human, Object, etc.)
    - dannet://namespaces → Understanding prefixes in the data
+   - describe_terms(["dns:usedForObject", ...]) → What individual properties and types mean
    
 2. Search for words to find synsets:
    - get_word_synsets("hund") → Find all meanings
@@ -368,7 +1535,7 @@ DANNET EXTENSIONS:
 - Cross-linguistic via wn:ili (Inter-Lingual Index) + the Open English WordNet
 
 JSON-LD FORMAT GUIDE:
-- All responses use standard JSON-LD with @context, @id, @type
+- All responses use standard JSON-LD with @id, @type; entities share one @context (dannet://context)
 - Namespace prefixes: dns: (schema), wn: (WordNet), ontolex: (vocabulary)
 - Semantic data directly accessible: dns:ontologicalType["@set"], dns:sentiment["marl:hasPolarity"]
 - Property names use colon format: "dns:sentiment" not ":dns/sentiment"
@@ -397,15 +1564,64 @@ TIPS FOR LLM USAGE:
 )
 
 
+# Base URL chosen in main(), or the background detection of the local server;
+# the client itself is created on first use
+default_base_url: Optional[str] = None
+server_probe: Optional["ServerProbe"] = None
+_client_lock = threading.Lock()
+
+# One client per base URL, shared by every session using that server; all of them
+# send their requests through the same HTTP client and so share its connection pools
+_clients: Dict[str, "DanNetClient"] = {}
+_clients_lock = threading.Lock()
+
+# Servers chosen with switch_dannet_server, per MCP session; sessions without an
+# entry use the default client. Entries go away with their session
+_session_servers: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+
+def current_session() -> Optional[Any]:
+    """The MCP session of the request being handled, or None outside of a request."""
+    try:
+        return request_ctx.get().session
+    except LookupError:
+        return None
+
+
+def client_for(base_url: str) -> DanNetClient:
+    """The shared client for a DanNet server, created on first use."""
+    base_url = base_url.rstrip('/')
+    client = _clients.get(base_url)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(base_url)
+            if client is None:
+                shared = next(iter(_clients.values()), None)
+                client = _clients[base_url] = DanNetClient(base_url, shared.client if shared else None)
+    return client
+
+
 def get_client():
-    """Get the DanNet client, initializing with default URL if not already set"""
+    """Get the DanNet client of the current session, initializing the default one on first use"""
     global dannet_client
+    session = current_session()
+    if session is not None:
+        base_url = _session_servers.get(session)
+        if base_url is not None:
+            return client_for(base_url)
     if dannet_client is None:
-        # Fallback initialization - check environment variable
-        is_local = os.getenv('DANNET_MCP_LOCAL', '').lower() == 'true'
-        base_url = LOCAL_URL if is_local else REMOTE_URL
-        dannet_client = DanNetClient(base_url)
-        logger.info(f"Lazy initialization of DanNet client with base URL: {base_url}")
+        with _client_lock:
+            if dannet_client is None:
+                if default_base_url:
+                    base_url = default_base_url
+                elif server_probe is not None:
+                    base_url = server_probe.base_url()
+                else:
+                    # Fallback initialization - check environment variable
+                    is_local = os.getenv('DANNET_MCP_LOCAL', '').lower() == 'true'
+                    base_url = LOCAL_URL if is_local else REMOTE_URL
+                dannet_client = client_for(base_url)
+                logger.info(f"Lazy initialization of DanNet client with base URL: {base_url}")
     return dannet_client
 
 
@@ -447,8 +1663,9 @@ def validate_jsonld_structure(data: Dict[str, Any]) -> bool:
     if not isinstance(data, dict):
         return False
     
-    # Check for essential JSON-LD properties
-    required_props = ['@context', '@id', '@type']
+    # Check for essential JSON-LD properties; the entity tools leave out @context
+    # unless asked for it (see the dannet://context resource)
+    required_props = ['@id', '@type']
     return all(prop in data for prop in required_props)
 
 
@@ -457,12 +1674,12 @@ def get_namespace_prefixes(data: Dict[str, Any]) -> Dict[str, str]:
     Extract namespace prefixes from JSON-LD @context.
     
     Args:
-        data: JSON-LD data with @context
+        data: JSON-LD data, with @context or as returned without it by the entity tools
         
     Returns:
         Dict mapping prefixes to full namespace URLs
     """
-    context = data.get('@context', {})
+    context = data.get('@context') or entity_context()
     if isinstance(context, dict):
         return {k: v for k, v in context.items() if isinstance(v, str)}
     return {}
@@ -580,6 +1797,2248 @@ def enhanced_error_message(error: Exception, context: str = '') -> str:
     return f"{base_msg}. {guidance}"
 
 
+# ---------------------------------------------------------------------------
+# Local copies of the DanNet exports
+# ---------------------------------------------------------------------------
+# Some lookups (inflected forms, taxonomy walks) need one round trip per token
+# when answered through the web service. The published exports hold the same
+# data, so they are downloaded once into DATA_DIR and indexed in memory.
+
+def _unescape_turtle(s: str) -> str:
+    """Undo the string escapes allowed in Turtle literals and local names."""
+    if '\\' not in s:
+        return s
+    return re.sub(
+        r'\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)',
+        lambda m: (chr(int(m.group(1)[1:], 16)) if len(m.group(1)) > 1
+                   else _TURTLE_ESCAPES.get(m.group(1), m.group(1))),
+        s
+    )
+
+
+_TURTLE_ESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', 'b': '\b', 'f': '\f'}
+
+_TURTLE_TOKEN = re.compile(r'''
+    (?P<ws>\s+|\#[^\n]*)
+  | (?P<iri><[^>\s]*>)
+  | (?P<long>"""(?:[^"\\]|\\.|"(?!""))*"""|\'\'\'(?:[^'\\]|\\.|'(?!''))*\'\'\')
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<at>@[A-Za-z]+(?:-[A-Za-z0-9]+)*)
+  | (?P<dtype>\^\^)
+  | (?P<punct>[;,.\[\]()])
+  | (?P<name>[^\s;,\[\]()"'<>]*[^\s;,\[\]()"'<>.])
+''', re.VERBOSE)
+
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+
+# Characters read at a time when tokenizing a Turtle file
+TURTLE_CHUNK_SIZE = 1 << 20
+
+
+def _turtle_tokens(source: Union[str, io.TextIOBase]):
+    """
+    The token matches of a Turtle document, given as a string or as a text file.
+
+    Files are read in chunks. A match that may be cut off by the end of what has
+    been read is only taken once more has been read or the file has ended: one
+    reaching the end (a name), '""' followed by a third quote (a long string),
+    or one preceded by unmatched text with no line end after it (a short string,
+    which cannot span lines, or an IRI).
+    """
+    if isinstance(source, str):
+        yield from _TURTLE_TOKEN.finditer(source)
+        return
+    buffer, pos, eof = "", 0, False
+    while True:
+        m = _TURTLE_TOKEN.search(buffer, pos)
+        cut_off = (m is None or m.end() >= len(buffer)
+                   or (m.lastgroup == 'string' and m.end() - m.start() == 2
+                       and buffer[m.end():m.end() + 1] == m.group()[0])
+                   or (m.start() > pos and buffer.find('\n', pos) == -1))
+        if cut_off and not eof:
+            chunk = source.read(TURTLE_CHUNK_SIZE)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        if m is None:
+            return
+        pos = m.end()
+        yield m
+
+
+class TurtleParser:
+    """
+    Minimal streaming Turtle parser, sufficient for the DanNet exports and schemas.
+
+    Takes the document as a string or as a text file, which is read in chunks.
+    Yields (subject, predicate, object) triples. IRIs are returned as full URI
+    strings, blank nodes as "_:bN" strings and literals as (value, language,
+    datatype) tuples. Collections are expanded into rdf:first/rdf:rest chains.
+    """
+
+    def __init__(self, source: Union[str, io.TextIOBase]):
+        self._tokens = (m for m in _turtle_tokens(source) if m.lastgroup != 'ws')
+        self._peeked = None
+        self._bnodes = 0
+        self.prefixes: Dict[str, str] = {}
+        self.base = ""
+
+    def _peek(self):
+        if self._peeked is None:
+            m = next(self._tokens, None)
+            self._peeked = (m.lastgroup, m.group()) if m else (None, None)
+        return self._peeked
+
+    def _next(self):
+        token = self._peek()
+        self._peeked = None
+        return token
+
+    def _expect(self, value: str):
+        kind, token = self._next()
+        if token != value:
+            raise DanNetError(f"Turtle syntax error: expected '{value}', got '{token}'")
+
+    def _bnode(self) -> str:
+        self._bnodes += 1
+        return f"_:b{self._bnodes}"
+
+    def _iri(self, token: str) -> str:
+        iri = _unescape_turtle(token[1:-1])
+        if self.base and not re.match(r'[A-Za-z][\w+.-]*:', iri):
+            return urljoin(self.base, iri)
+        return iri
+
+    def _name(self, token: str) -> Any:
+        if token == 'a':
+            return RDF_NS + "type"
+        if token in ('true', 'false'):
+            return (token, None, "http://www.w3.org/2001/XMLSchema#boolean")
+        if re.fullmatch(r'[+-]?\d+', token):
+            return (token, None, "http://www.w3.org/2001/XMLSchema#integer")
+        if re.fullmatch(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?', token):
+            return (token, None, "http://www.w3.org/2001/XMLSchema#decimal")
+        if token.startswith('_:'):
+            return token
+        prefix, _, local = token.partition(':')
+        if prefix not in self.prefixes:
+            raise DanNetError(f"Turtle syntax error: unknown prefix '{prefix}'")
+        return self.prefixes[prefix] + _unescape_turtle(local)
+
+    def _term(self, kind: str, token: str) -> Any:
+        if kind == 'iri':
+            return self._iri(token)
+        if kind == 'name':
+            return self._name(token)
+        raise DanNetError(f"Turtle syntax error: unexpected '{token}'")
+
+    def _literal(self, kind: str, token: str) -> tuple:
+        value = _unescape_turtle(token[3:-3] if kind == 'long' else token[1:-1])
+        lang = datatype = None
+        next_kind, next_token = self._peek()
+        if next_kind == 'at':
+            lang = self._next()[1][1:]
+        elif next_kind == 'dtype':
+            self._next()
+            datatype = self._term(*self._next())
+        return (value, lang, datatype)
+
+    def _object(self, triples: list) -> Any:
+        kind, token = self._next()
+        if kind in ('string', 'long'):
+            return self._literal(kind, token)
+        if token == '[':
+            return self._blank_node_property_list(triples)
+        if token == '(':
+            return self._collection(triples)
+        return self._term(kind, token)
+
+    def _blank_node_property_list(self, triples: list) -> str:
+        node = self._bnode()
+        if self._peek()[1] == ']':
+            self._next()
+            return node
+        self._predicate_object_list(node, triples)
+        self._expect(']')
+        return node
+
+    def _collection(self, triples: list) -> str:
+        items = []
+        while self._peek()[1] != ')':
+            items.append(self._object(triples))
+        self._next()
+        head = RDF_NS + "nil"
+        for item in reversed(items):
+            node = self._bnode()
+            triples.append((node, RDF_NS + "first", item))
+            triples.append((node, RDF_NS + "rest", head))
+            head = node
+        return head
+
+    def _predicate_object_list(self, subject: str, triples: list):
+        while True:
+            predicate = self._term(*self._next())
+            while True:
+                triples.append((subject, predicate, self._object(triples)))
+                if self._peek()[1] != ',':
+                    break
+                self._next()
+            # Semicolons may repeat and may trail the last predicate-object pair
+            if self._peek()[1] != ';':
+                return
+            while self._peek()[1] == ';':
+                self._next()
+            if self._peek()[1] in ('.', ']', None):
+                return
+
+    def _directive(self, keyword: str):
+        keyword = keyword.lstrip('@').lower()
+        if keyword == 'prefix':
+            prefix = self._next()[1]
+            self.prefixes[prefix.rstrip(':')] = self._iri(self._next()[1])
+        elif keyword == 'base':
+            self.base = self._iri(self._next()[1])
+        else:
+            raise DanNetError(f"Turtle syntax error: unknown directive '{keyword}'")
+
+    def triples(self):
+        """Yield every triple of the document in order."""
+        while True:
+            kind, token = self._next()
+            if kind is None:
+                return
+            if kind == 'at' or (kind == 'name' and token.lower() in ('prefix', 'base')):
+                self._directive(token)
+                if kind == 'at':
+                    self._expect('.')
+                continue
+            triples: list = []
+            if token == '[':
+                subject = self._blank_node_property_list(triples)
+                if self._peek()[1] != '.':
+                    self._predicate_object_list(subject, triples)
+            elif token == '(':
+                subject = self._collection(triples)
+                self._predicate_object_list(subject, triples)
+            else:
+                subject = self._term(kind, token)
+                self._predicate_object_list(subject, triples)
+            self._expect('.')
+            yield from triples
+
+
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+
+def _is_rdf_xml(text: str) -> bool:
+    """True for a schema published in RDF/XML rather than Turtle."""
+    return text.lstrip().startswith(('<?xml', '<rdf:', '<!'))
+
+
+def parse_rdf_xml(text: str) -> List[tuple]:
+    """
+    The triples of an RDF/XML document, in the form TurtleParser yields them.
+
+    Minimal, sufficient for the schemas published in RDF/XML (ontolex, skos,
+    lexinfo): typed node elements, rdf:about/rdf:ID/rdf:nodeID, rdf:resource,
+    nested nodes, property attributes, xml:lang, rdf:datatype and the Resource
+    and Collection parse types. Entities declared in the DTD are expanded.
+    """
+    rdf = f"{{{RDF_NS}}}"
+    root = ElementTree.fromstring(text)
+    base = root.get(f"{{{XML_NS}}}base", "")
+    triples: List[tuple] = []
+    bnodes = 0
+
+    def iri(tag: str) -> str:
+        return tag[1:].replace('}', '', 1) if tag.startswith('{') else tag
+
+    def resolve(ref: str) -> str:
+        return urljoin(base, ref) if base else ref
+
+    def blank() -> str:
+        nonlocal bnodes
+        bnodes += 1
+        return f"_:x{bnodes}"
+
+    def node(element, lang: Optional[str]) -> str:
+        lang = element.get(f"{{{XML_NS}}}lang", lang)
+        if element.get(rdf + "about") is not None:
+            subject = resolve(element.get(rdf + "about"))
+        elif element.get(rdf + "ID") is not None:
+            subject = resolve("#" + element.get(rdf + "ID"))
+        elif element.get(rdf + "nodeID") is not None:
+            subject = "_:" + element.get(rdf + "nodeID")
+        else:
+            subject = blank()
+        if element.tag != rdf + "Description":
+            triples.append((subject, RDF_NS + "type", iri(element.tag)))
+        properties(subject, element, lang)
+        return subject
+
+    def properties(subject: str, element, lang: Optional[str]) -> None:
+        for name, value in element.attrib.items():
+            if not name.startswith((rdf, f"{{{XML_NS}}}")):
+                triples.append((subject, iri(name), (value, lang, None)))
+        for prop in element:
+            prop_lang = prop.get(f"{{{XML_NS}}}lang", lang)
+            parse_type = prop.get(rdf + "parseType")
+            if prop.get(rdf + "resource") is not None:
+                value: Any = resolve(prop.get(rdf + "resource"))
+            elif prop.get(rdf + "nodeID") is not None:
+                value = "_:" + prop.get(rdf + "nodeID")
+            elif parse_type == "Resource":
+                value = blank()
+                properties(value, prop, prop_lang)
+            elif parse_type == "Collection":
+                value = RDF_NS + "nil"
+                for item in reversed([node(child, prop_lang) for child in prop]):
+                    cell = blank()
+                    triples.append((cell, RDF_NS + "first", item))
+                    triples.append((cell, RDF_NS + "rest", value))
+                    value = cell
+            elif len(prop):
+                value = node(prop[0], prop_lang)
+            else:
+                datatype = prop.get(rdf + "datatype")
+                value = (prop.text or "", None if datatype else prop_lang, datatype)
+            triples.append((subject, iri(prop.tag), value))
+
+    for element in (root if root.tag == rdf + "RDF" else [root]):
+        node(element, None)
+    return triples
+
+
+def _data_path(*parts: str) -> str:
+    """Path inside the local data directory."""
+    return os.path.join(DATA_DIR, *parts)
+
+
+_data_dir_locks: Dict[str, threading.Lock] = {}
+
+
+@contextlib.contextmanager
+def data_dir_lock(name: str):
+    """
+    Exclusive lock for building `name` in the data directory, so one thread, and
+    with --workers one worker process, downloads or builds it while the others
+    wait and then use the result. Between processes it is an flock on
+    DATA_DIR/name.lock (--workers forks, so is only available on POSIX).
+    """
+    with _data_dir_locks.setdefault(name, threading.Lock()):
+        if worker_index is None:
+            yield
+            return
+        import fcntl
+        os.makedirs(DATA_DIR, exist_ok=True)
+        with open(_data_path(f"{name}.lock"), 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _ensure_export(kind: str, prefix: str) -> Optional[str]:
+    """
+    Make sure the zipped export at /export/{kind}/{prefix} is unpacked in DATA_DIR.
+
+    The export is downloaded from the active DanNet server the first time it is
+    needed. Returns the directory holding the unpacked files, or None if the
+    export is unavailable (callers then fall back to the web service).
+    """
+    target = _data_path(kind, prefix)
+    if os.path.isdir(target) and os.listdir(target):
+        return target
+    with data_dir_lock(f"export-{kind}-{prefix}"):
+        # Downloaded by another thread or worker while this one waited
+        if os.path.isdir(target) and os.listdir(target):
+            return target
+        return _download_export(kind, prefix, target)
+
+
+def _download_export(kind: str, prefix: str, target: str) -> Optional[str]:
+    url = f"{get_client().base_url}/export/{kind}/{prefix}"
+    staging = f"{target}.{os.getpid()}"
+    try:
+        logger.info(f"Downloading DanNet export {url} into {target}")
+        with httpx.Client(timeout=TIMEOUT, follow_redirects=True,
+                          transport=upstream_transport()) as download_client:
+            response = download_client.get(url)
+            response.raise_for_status()
+        # Unpacked next to the target and moved in whole: other worker processes
+        # (--workers) may be reading the previous copy
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.rmtree(staging, ignore_errors=True)
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            archive.extractall(staging)
+        try:
+            os.replace(staging, target)
+        except OSError:
+            # Another process moved its copy in first
+            if not os.listdir(target):
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+        return target
+    except Exception as e:
+        logger.warning(f"DanNet export {url} unavailable: {e}")
+        shutil.rmtree(staging, ignore_errors=True)
+        return None
+
+
+def _read_export_csv(directory: str, filename: str):
+    """Yield the rows of a headerless CSVW table from the DanNet CSV export."""
+    with open(os.path.join(directory, filename), newline='', encoding='utf-8') as f:
+        yield from csv.reader(f)
+
+
+def _build_forms_file(cor_dir: str, path: str) -> None:
+    """
+    Extract (written form, DanNet word ID) pairs from the COR integration export.
+
+    COR words link to their forms via ontolex:canonicalForm/otherForm and to the
+    DanNet word of the same lemma via owl:sameAs. Parsing the Turtle is slow, so
+    the pairs are written to a TSV file once and read from there afterwards.
+    """
+    ontolex = "http://www.w3.org/ns/lemon/ontolex#"
+    form_preds = {ontolex + "canonicalForm", ontolex + "otherForm"}
+    written_rep = ontolex + "writtenRep"
+    same_as = "http://www.w3.org/2002/07/owl#sameAs"
+    dn_word = "https://wordnet.dk/dannet/data/word-"
+
+    forms_of: Dict[str, List[str]] = {}
+    rep_of: Dict[str, str] = {}
+    words_of: Dict[str, List[str]] = {}
+    for filename in os.listdir(cor_dir):
+        if not filename.endswith('.ttl'):
+            continue
+        with open(os.path.join(cor_dir, filename), encoding='utf-8') as f:
+            for s, p, o in TurtleParser(f).triples():
+                if p in form_preds:
+                    forms_of.setdefault(s, []).append(o)
+                elif p == written_rep and isinstance(o, tuple):
+                    rep_of[s] = o[0]
+                elif p == same_as and isinstance(o, str) and o.startswith(dn_word):
+                    words_of.setdefault(s, []).append(parse_resource_id(o))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        for cor_word, word_ids in words_of.items():
+            forms = {rep_of[f] for f in forms_of.get(cor_word, []) if f in rep_of}
+            for form in sorted(forms):
+                for word_id in word_ids:
+                    out.write(f"{form}\t{word_id}\n")
+    os.replace(tmp_path, path)
+
+
+class FormIndex:
+    """
+    In-memory mapping from written forms (lemmas and inflections) to DanNet words.
+
+    Built from the DanNet CSV export (word ID → lemma) and the COR integration
+    export (inflected form → word ID). Lookups fall back to the lowercased form,
+    since sentence-initial tokens are usually capitalised.
+    """
+
+    def __init__(self, lemma_of: Dict[str, str], words_of: Dict[str, List[str]]):
+        self.lemma_of = lemma_of
+        self.words_of = words_of
+
+    def add(self, form: str, word_id: str, lemma: str) -> None:
+        """Record a form → word mapping learned from the web service."""
+        self.lemma_of.setdefault(word_id, lemma)
+        word_ids = self.words_of.setdefault(form, [])
+        if word_id not in word_ids:
+            word_ids.append(word_id)
+
+    def resolve(self, form: str) -> List[Dict[str, str]]:
+        """Candidate {"lemma", "word_id"} entries for a written form."""
+        word_ids = self.words_of.get(form) or self.words_of.get(form.lower()) or []
+        return [{"lemma": self.lemma_of.get(w, form), "word_id": w} for w in word_ids]
+
+    def lemmas(self, form: str) -> List[str]:
+        """Distinct lemmas for a written form, in index order."""
+        return list(dict.fromkeys(c["lemma"] for c in self.resolve(form)))
+
+
+_form_index: Optional[FormIndex] = None
+_form_index_lock = threading.Lock()
+_form_index_thread: Optional[threading.Thread] = None
+_form_index_started_at = 0.0
+
+
+def get_form_index(download: bool = True) -> Optional[FormIndex]:
+    """
+    Get the form index, building it from the local exports on first use.
+
+    With download=False the index is only built from exports already on disk,
+    so latency-sensitive callers never trigger a download.
+    """
+    refresh_stale_data()
+    if _form_index is not None:
+        return _form_index
+    with _form_index_lock:
+        if _form_index is not None:
+            return _form_index
+        return _build_form_index(download)
+
+
+def _build_form_index(download: bool) -> Optional[FormIndex]:
+    global _form_index
+    csv_dir = _data_path("csv", "dn")
+    if download:
+        csv_dir = _ensure_export("csv", "dn")
+    if not csv_dir or not os.path.exists(os.path.join(csv_dir, "words.csv")):
+        return None
+
+    lemma_of: Dict[str, str] = {}
+    words_of: Dict[str, List[str]] = {}
+    for row in _read_export_csv(csv_dir, "words.csv"):
+        word_id, written_reps = row[0], row[1]
+        for lemma in written_reps.split("; "):
+            lemma_of.setdefault(word_id, lemma)
+            words_of.setdefault(lemma, []).append(word_id)
+
+    forms_path = _data_path("forms.tsv")
+    if not os.path.exists(forms_path) and download:
+        with data_dir_lock("forms"):
+            cor_dir = _ensure_export("rdf", "cor") if not os.path.exists(forms_path) else None
+            if cor_dir:
+                logger.info("Building inflected form index from the COR export...")
+                _build_forms_file(cor_dir, forms_path)
+    if os.path.exists(forms_path):
+        with open(forms_path, encoding='utf-8') as f:
+            for line in f:
+                form, word_id = line.rstrip('\n').split('\t')
+                word_ids = words_of.setdefault(form, [])
+                if word_id not in word_ids:
+                    word_ids.append(word_id)
+
+    _form_index = FormIndex(lemma_of, words_of)
+    logger.info(f"Form index ready: {len(words_of)} forms, {len(lemma_of)} words")
+    return _form_index
+
+
+def form_index_if_ready() -> Optional[FormIndex]:
+    """
+    The form index if it is built, else None. The first call starts building it
+    (downloading the exports if needed) in a background thread, like
+    relation_graph_if_ready; until then callers look forms up remotely. A build
+    that ends without an index, e.g. because the download failed, is started
+    again after INDEX_RETRY_INTERVAL.
+    """
+    global _form_index_thread, _form_index_started_at
+    # A build in progress holds the lock; never wait for it here
+    if _form_index is not None or not _form_index_lock.acquire(blocking=False):
+        return _form_index
+    try:
+        if _form_index is None and (_form_index_thread is None or (
+                not _form_index_thread.is_alive()
+                and time.monotonic() - _form_index_started_at >= INDEX_RETRY_INTERVAL)):
+            _form_index_started_at = time.monotonic()
+            _form_index_thread = threading.Thread(target=get_form_index, name="form-index", daemon=True)
+            _form_index_thread.start()
+    finally:
+        _form_index_lock.release()
+    return _form_index
+
+
+def sparql_literal(value: str, lang: str = "da") -> str:
+    """Quote a string as a language-tagged SPARQL literal."""
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"@{lang}'
+
+
+# Rows the SPARQL endpoint returns at most per query
+SPARQL_ROW_CAP = 100
+# Forms per remote lookup query; batches whose answer fills a page are split
+FORM_LOOKUP_BATCH_SIZE = 20
+
+
+def _lookup_forms_remote(forms: List[str]) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Resolve written forms via the COR links in the triplestore.
+
+    The SPARQL endpoint caps results at SPARQL_ROW_CAP rows, so forms are sent
+    in small VALUES batches, and a batch whose answer fills the page may have
+    been cut off: it is split and asked again. A single form with that many
+    candidates is returned truncated, with a warning.
+    """
+    client = get_client()
+    found: Dict[str, List[Dict[str, str]]] = {}
+    pending = [forms[i:i + FORM_LOOKUP_BATCH_SIZE] for i in range(0, len(forms), FORM_LOOKUP_BATCH_SIZE)]
+    while pending:
+        batch = pending.pop()
+        query = f"""
+SELECT DISTINCT ?form ?word ?lemma WHERE {{
+  VALUES ?form {{ {" ".join(sparql_literal(f) for f in batch)} }}
+  ?f ontolex:writtenRep ?form .
+  ?cor ontolex:canonicalForm|ontolex:otherForm ?f .
+  ?cor owl:sameAs ?word .
+  FILTER(STRSTARTS(STR(?word), STR(dn:)))
+  ?word ontolex:canonicalForm/ontolex:writtenRep ?lemma .
+}}
+"""
+        results = routed_sparql_request(client, {"query": query, "format": "json"})
+        bindings = results.get("results", {}).get("bindings", [])
+        if len(bindings) >= SPARQL_ROW_CAP:
+            if len(batch) > 1:
+                pending += [batch[:len(batch) // 2], batch[len(batch) // 2:]]
+                continue
+            logger.warning(f"Remote lookup of '{batch[0]}' hit the {SPARQL_ROW_CAP}-row cap; candidates may be missing")
+        for b in bindings:
+            found.setdefault(b["form"]["value"], []).append({
+                "lemma": b["lemma"]["value"],
+                "word_id": parse_resource_id(b["word"]["value"]),
+            })
+    return found
+
+
+WN_NS = "https://globalwordnet.github.io/schemas/wn#"
+DNS_NS = "https://wordnet.dk/dannet/schema/"
+
+# words.csv holds wn:partOfSpeech names; normalised the same way as the dnf: functions
+_WN_POS = {"noun": "noun", "verb": "verb", "adjective": "adj",
+           "adjective_satellite": "adj", "adverb": "adv"}
+
+
+class Taxonomy:
+    """
+    The DanNet hypernym DAG, indexed for fast taxonomic similarity scoring.
+
+    Mirrors the dnf:path, dnf:lch and dnf:wup SPARQL functions (see similarity.clj):
+    asserted wn:hypernym edges with a per-synset fallback to dns:orthogonalHypernym,
+    max-depth for Wu-Palmer and a per-POS taxonomy depth for Leacock-Chodorow.
+
+    Synsets are numbered and the graph is kept as integer adjacency lists with a
+    precomputed depth array, so scoring one synset against all others is a single
+    breadth-first pass rather than one ancestor walk per pair.
+    """
+
+    def __init__(self, hypernyms: Dict[str, set], pos_of: Dict[str, str],
+                 lemmas_of: Dict[str, List[str]]):
+        nodes = set(hypernyms) | set(pos_of)
+        for parents in hypernyms.values():
+            nodes.update(parents)
+        self.ids: List[str] = sorted(nodes)
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(self.ids)}
+        self.parents: List[Tuple[int, ...]] = [()] * len(self.ids)
+        self.children: List[List[int]] = [[] for _ in self.ids]
+        # Self-referential hypernyms are kept out of the adjacency lists but still
+        # add a level to max-depth, as the walk in similarity.clj follows them once
+        self.self_loops: set = set()
+        for child, parents in hypernyms.items():
+            c = self.index[child]
+            self.parents[c] = tuple(self.index[p] for p in parents if p != child)
+            if child in parents:
+                self.self_loops.add(c)
+            for p in self.parents[c]:
+                self.children[p].append(c)
+        self.pos: List[str] = [pos_of.get(s, "?") for s in self.ids]
+        self.lemmas_of = lemmas_of
+
+        self.depth = array('i', [-1]) * len(self.ids)
+        for i in range(len(self.ids)):
+            self._max_depth(i, set())
+
+        # Only synsets with a hypernym count towards the taxonomy depth (as in
+        # taxonomy-depths), roots having no entry in the hypernym graph
+        self.taxonomy_depth: Dict[str, int] = {}
+        for i, parents in enumerate(self.parents):
+            if parents or i in self.self_loops:
+                pos = self.pos[i]
+                self.taxonomy_depth[pos] = max(self.taxonomy_depth.get(pos, 0), self.depth[i])
+
+    def _max_depth(self, node: int, path: set) -> int:
+        """
+        Longest climb from node to a root; synsets on the current path are skipped (cycles).
+
+        A self-referential hypernym counts as one more step, as in max-depth: 1 for
+        a synset whose only hypernym is itself, 2 + its deepest parent otherwise.
+        """
+        if self.depth[node] >= 0:
+            return self.depth[node]
+        path.add(node)
+        parents = [p for p in self.parents[node] if p not in path]
+        depth = 1 + max(self._max_depth(p, path) for p in parents) if parents else 0
+        if node in self.self_loops:
+            depth += 1
+        path.discard(node)
+        self.depth[node] = depth
+        return depth
+
+    def ancestor_distances(self, node: int) -> Dict[int, int]:
+        """Shortest edge distance from node to each of its ancestors (itself at 0)."""
+        dist = {node: 0}
+        frontier = [node]
+        d = 0
+        while frontier:
+            d += 1
+            next_frontier = []
+            for n in frontier:
+                for p in self.parents[n]:
+                    if p not in dist:
+                        dist[p] = d
+                        next_frontier.append(p)
+            frontier = next_frontier
+        return dist
+
+    def _paths_from(self, node: int) -> Tuple[array, array]:
+        """
+        Shortest path length p and LCS node count k from node to every synset.
+
+        Starts from every ancestor c of node at cost dist(node, c) and walks down
+        the hyponym edges, which yields min(dist(node, c) + dist(other, c)) over
+        the common ancestors c of node and each other synset. Ties between least
+        common subsumers resolve to the deepest one. Unreached synsets keep p = -1.
+        """
+        n = len(self.ids)
+        best_p = array('i', [-1]) * n
+        best_k = array('i', [0]) * n
+        buckets: List[List[int]] = []
+        for ancestor, d in self.ancestor_distances(node).items():
+            best_p[ancestor] = d
+            best_k[ancestor] = self.depth[ancestor] + 1
+            while len(buckets) <= d:
+                buckets.append([])
+            buckets[d].append(ancestor)
+
+        p = 0
+        while p < len(buckets):
+            for u in buckets[p]:
+                if best_p[u] != p:
+                    continue
+                k = best_k[u]
+                for v in self.children[u]:
+                    pv = best_p[v]
+                    if pv == -1 or pv > p + 1:
+                        best_p[v] = p + 1
+                        best_k[v] = k
+                        if len(buckets) <= p + 1:
+                            buckets.append([])
+                        buckets[p + 1].append(v)
+                    elif pv == p + 1 and k > best_k[v]:
+                        best_k[v] = k
+            p += 1
+        return best_p, best_k
+
+    def _score(self, metric: str, p: int, k: int, d: Optional[int]) -> Optional[float]:
+        if metric == "path":
+            return 1.0 / (p + 1) if p >= 0 else 0.0
+        if p < 0:
+            return None
+        if metric == "wup":
+            return 2.0 * k / (p + 2 * k)
+        if metric == "lch":
+            return -math.log((p + 1) / (2.0 * d)) if d else None
+        raise ValueError(f"Unknown similarity metric: {metric}")
+
+    def similarity(self, a: str, b: str, metric: str = "wup") -> Optional[float]:
+        """Score a single synset pair, with the same conventions as the dnf: functions."""
+        ia, ib = self.index[a], self.index[b]
+        da, db = self.ancestor_distances(ia), self.ancestor_distances(ib)
+        common = [c for c in da if c in db]
+        if not common:
+            return self._score(metric, -1, 0, None)
+        p = min(da[c] + db[c] for c in common)
+        k = max(self.depth[c] + 1 for c in common if da[c] + db[c] == p)
+        return self._score(metric, p, k, self.taxonomy_depth.get(self.pos[ia]))
+
+    def most_similar(self, synset: str, metric: str = "wup", top_k: int = 10) -> List[Tuple[str, float]]:
+        """The top_k synsets most similar to synset, best first (synset itself excluded)."""
+        node = self.index[synset]
+        best_p, best_k = self._paths_from(node)
+        d = self.taxonomy_depth.get(self.pos[node])
+        scored = ((self._score(metric, best_p[i], best_k[i], d), i)
+                  for i in range(len(self.ids)) if best_p[i] >= 0 and i != node)
+        top = heapq.nlargest(top_k, ((s, -i) for s, i in scored if s is not None))
+        return [(self.ids[-i], s) for s, i in top]
+
+
+@lru_cache(maxsize=1)
+def _synset_words(csv_dir: str) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """
+    Part of speech and lemmas of every synset, read from the CSV export.
+
+    The export has no wn:lexfile column, so unlike synset->pos in similarity.clj
+    the part of speech is that of the synset's first word (wn:partOfSpeech).
+    """
+    word_pos: Dict[str, str] = {}
+    word_lemma: Dict[str, str] = {}
+    for row in _read_export_csv(csv_dir, "words.csv"):
+        word_lemma[row[0]] = row[1].split("; ")[0]
+        if len(row) > 2 and row[2]:
+            word_pos[row[0]] = _WN_POS.get(row[2].split("; ")[0], "?")
+
+    pos_of: Dict[str, str] = {}
+    lemmas_of: Dict[str, List[str]] = {}
+    for row in _read_export_csv(csv_dir, "senses.csv"):
+        synset, word = row[1], row[2]
+        if word in word_pos:
+            pos_of.setdefault(synset, word_pos[word])
+        if word in word_lemma:
+            lemmas_of.setdefault(synset, []).append(word_lemma[word])
+    return pos_of, lemmas_of
+
+
+_taxonomy: Optional[Taxonomy] = None
+
+
+def get_taxonomy() -> Optional[Taxonomy]:
+    """Get the hypernym taxonomy, building it from the CSV export on first use."""
+    global _taxonomy
+    refresh_stale_data()
+    if _taxonomy is not None:
+        return _taxonomy
+
+    csv_dir = _ensure_export("csv", "dn")
+    if not csv_dir:
+        return None
+
+    hypernyms: Dict[str, set] = {}
+    orthogonal: Dict[str, set] = {}
+    for source, relation, target in _read_export_csv(csv_dir, "relations.csv"):
+        if relation == WN_NS + "hypernym":
+            hypernyms.setdefault(source, set()).add(target)
+        elif relation == DNS_NS + "orthogonalHypernym":
+            orthogonal.setdefault(source, set()).add(target)
+    for synset, parents in orthogonal.items():
+        hypernyms.setdefault(synset, parents)
+
+    pos_of, lemmas_of = _synset_words(csv_dir)
+    _taxonomy = Taxonomy(hypernyms, pos_of, lemmas_of)
+    logger.info(f"Taxonomy ready: {len(_taxonomy.ids)} synsets, depths {_taxonomy.taxonomy_depth}")
+    return _taxonomy
+
+
+class RelationGraph:
+    """
+    Synset-to-synset relations from the CSV export, for random-walk relatedness.
+
+    Edges are stored per relation type as parallel integer arrays. Adjacency lists
+    for a given selection of relation types are assembled on demand, and they and
+    the personalized PageRank results per (seed set, relation selection) are kept
+    in small LRU caches (ADJACENCY_ENTRIES and RANKED_ENTRIES), as every new
+    selection of relation types costs a full set of adjacency lists.
+    """
+
+    ADJACENCY_ENTRIES = 8
+    RANKED_ENTRIES = 512
+
+    def __init__(self, edges: Dict[str, Tuple[array, array]], ids: List[str],
+                 lemmas_of: Dict[str, List[str]]):
+        self.edges = edges
+        self.ids = ids
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(ids)}
+        self.lemmas_of = lemmas_of
+        self._adjacency: OrderedDict[frozenset, List[Tuple[int, ...]]] = OrderedDict()
+        self._ranked: OrderedDict[tuple, List[Tuple[str, float]]] = OrderedDict()
+        # Reentrant: computing a ranking fills the adjacency cache
+        self._lock = threading.RLock()
+        self._indegree: Optional[array] = None
+
+    def _cached(self, cache: OrderedDict, key, cap: int, compute: Callable[[], Any]):
+        """The entry for key in an LRU cache, computed and stored under the lock on a miss."""
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+            value = cache[key] = compute()
+            if len(cache) > cap:
+                cache.popitem(last=False)
+            return value
+
+    def indegree(self, synset_id: str) -> int:
+        """Number of relation edges of any type pointing at a synset."""
+        if self._indegree is None:
+            counts = array('i', bytes(4 * len(self.ids)))
+            for _, targets in self.edges.values():
+                for t in targets:
+                    counts[t] += 1
+            self._indegree = counts
+        i = self.index.get(synset_id)
+        return self._indegree[i] if i is not None else 0
+
+    def top_by_indegree(self, n: int) -> List[str]:
+        """The n synsets with the highest indegree, highest first."""
+        self.indegree("")
+        top = heapq.nlargest(n, range(len(self.ids)), key=self._indegree.__getitem__)
+        return [self.ids[i] for i in top]
+
+    def adjacency(self, relations: frozenset) -> List[Tuple[int, ...]]:
+        """Undirected adjacency lists over the given relation type URIs."""
+        def build() -> List[Tuple[int, ...]]:
+            neighbours: List[set] = [set() for _ in self.ids]
+            for relation in relations:
+                sources, targets = self.edges.get(relation, ((), ()))
+                for s, t in zip(sources, targets):
+                    if s != t:
+                        neighbours[s].add(t)
+                        neighbours[t].add(s)
+            return [tuple(n) for n in neighbours]
+
+        return self._cached(self._adjacency, relations, self.ADJACENCY_ENTRIES, build)
+
+    def personalized_pagerank(self, seeds: List[str], relations: frozenset,
+                              alpha: float = 0.15, epsilon: float = 1e-5) -> Dict[int, float]:
+        """
+        Approximate personalized PageRank (random walk with restart) from seeds.
+
+        Uses the forward push method: probability mass is pushed out from the
+        seeds until every residual is below epsilon per unit of degree, so only
+        the neighbourhood of the seeds is ever touched.
+        """
+        if not seeds:
+            raise DanNetError("At least one seed synset is required")
+        adjacency = self.adjacency(relations)
+        start = 1.0 / len(seeds)
+        rank: Dict[int, float] = {}
+        residual: Dict[int, float] = {self.index[s]: start for s in seeds}
+        queue = deque(residual)
+        while queue:
+            u = queue.popleft()
+            r = residual.pop(u, 0.0)
+            neighbours = adjacency[u]
+            if not neighbours:
+                rank[u] = rank.get(u, 0.0) + r
+                continue
+            rank[u] = rank.get(u, 0.0) + alpha * r
+            share = (1 - alpha) * r / len(neighbours)
+            for v in neighbours:
+                before = residual.get(v, 0.0)
+                residual[v] = before + share
+                threshold = epsilon * max(len(adjacency[v]), 1)
+                if before < threshold <= before + share:
+                    queue.append(v)
+        return rank
+
+    def related(self, seeds: List[str], relations: frozenset, top_k: int) -> List[Tuple[str, float]]:
+        """The top_k synsets by personalized PageRank from seeds, seeds excluded."""
+        def rank() -> List[Tuple[str, float]]:
+            scores = self.personalized_pagerank(seeds, relations)
+            seed_nodes = {self.index[s] for s in seeds}
+            top = heapq.nlargest(top_k, ((score, -i) for i, score in scores.items()
+                                         if i not in seed_nodes))
+            return [(self.ids[-i], score) for score, i in top]
+
+        return self._cached(self._ranked, (frozenset(seeds), relations, top_k), self.RANKED_ENTRIES, rank)
+
+
+_relation_graph: Optional[RelationGraph] = None
+_relation_graph_lock = threading.Lock()
+_relation_graph_thread: Optional[threading.Thread] = None
+_relation_graph_started_at = 0.0
+
+
+def get_relation_graph() -> Optional[RelationGraph]:
+    """Get the synset relation graph, building it from the CSV export on first use."""
+    global _relation_graph
+    refresh_stale_data()
+    if _relation_graph is not None:
+        return _relation_graph
+
+    with _relation_graph_lock:
+        if _relation_graph is not None:
+            return _relation_graph
+        csv_dir = _ensure_export("csv", "dn")
+        if not csv_dir:
+            return None
+
+        index: Dict[str, int] = {}
+        edges: Dict[str, Tuple[array, array]] = {}
+        for source, relation, target in _read_export_csv(csv_dir, "relations.csv"):
+            sources, targets = edges.setdefault(relation, (array('i'), array('i')))
+            sources.append(index.setdefault(source, len(index)))
+            targets.append(index.setdefault(target, len(index)))
+
+        _, lemmas_of = _synset_words(csv_dir)
+        _relation_graph = RelationGraph(edges, list(index), lemmas_of)
+        logger.info(f"Relation graph ready: {len(index)} synsets, {len(edges)} relation types")
+        return _relation_graph
+
+
+def relation_graph_if_ready() -> Optional[RelationGraph]:
+    """
+    The relation graph if it is built, else None. The first call starts building
+    it in a background thread, so callers that can do without it never wait for
+    the CSV export. A build that ends without a graph is started again after
+    INDEX_RETRY_INTERVAL, and at once after the local data is discarded.
+    """
+    global _relation_graph_thread, _relation_graph_started_at
+    # A build in progress holds the lock; never wait for it here
+    if _relation_graph is not None or not _relation_graph_lock.acquire(blocking=False):
+        return _relation_graph
+    try:
+        if _relation_graph is None and (_relation_graph_thread is None or (
+                not _relation_graph_thread.is_alive()
+                and time.monotonic() - _relation_graph_started_at >= INDEX_RETRY_INTERVAL)):
+            _relation_graph_started_at = time.monotonic()
+            _relation_graph_thread = threading.Thread(target=get_relation_graph, name="relation-graph",
+                                                      daemon=True)
+            _relation_graph_thread.start()
+    finally:
+        _relation_graph_lock.release()
+    return _relation_graph
+
+
+class ReachabilityIndex:
+    """
+    Interval labelling of the hypernym DAG for constant-time is-a checks.
+
+    Synsets are numbered in post-order along a spanning forest of the hyponym
+    edges. Every synset then carries the merged intervals of post-order numbers
+    covering itself and all of its descendants: the interval of its own spanning
+    subtree plus those inherited from hyponyms reached through other parents,
+    which is what handles multiple inheritance. X is a kind of Y exactly when
+    X's number falls inside one of Y's intervals. Edges closing a cycle in the
+    data are ignored.
+    """
+
+    def __init__(self, taxonomy: Taxonomy):
+        self.taxonomy = taxonomy
+        n = len(taxonomy.ids)
+        self.post = array('i', [-1]) * n
+        self.intervals: List[Tuple[int, ...]] = [()] * n
+
+        counter = 0
+        on_stack = bytearray(n)
+        roots = [i for i in range(n) if not taxonomy.parents[i]]
+        # Cycles without any root are unreachable from roots; start from them last
+        for start in roots + list(range(n)):
+            if self.post[start] >= 0:
+                continue
+            stack = [(start, iter(taxonomy.children[start]))]
+            on_stack[start] = 1
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is not None:
+                    if self.post[child] < 0 and not on_stack[child]:
+                        on_stack[child] = 1
+                        stack.append((child, iter(taxonomy.children[child])))
+                    continue
+                stack.pop()
+                on_stack[node] = 0
+                self.post[node] = counter
+                self.intervals[node] = self._merge(
+                    [(counter, counter)] + [iv for c in taxonomy.children[node]
+                                            if self.post[c] >= 0
+                                            for iv in zip(self.intervals[c][::2], self.intervals[c][1::2])])
+                counter += 1
+
+    @staticmethod
+    def _merge(intervals: List[Tuple[int, int]]) -> Tuple[int, ...]:
+        """Merge overlapping or adjacent intervals into a flat (lo, hi, lo, hi, ...) tuple."""
+        intervals.sort()
+        merged = [list(intervals[0])]
+        for lo, hi in intervals[1:]:
+            if lo <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+        return tuple(x for iv in merged for x in iv)
+
+    def is_a(self, x: str, y: str) -> bool:
+        """True if synset x is y or a (transitive) hyponym of y."""
+        index = self.taxonomy.index
+        if x not in index or y not in index:
+            return False
+        number = self.post[index[x]]
+        intervals = self.intervals[index[y]]
+        i = bisect.bisect_right(intervals, number, 0, len(intervals)) - 1
+        # An even position is an interval start, so the number lies inside it
+        return i >= 0 and (i % 2 == 0 or intervals[i] == number)
+
+
+_reachability_index: Optional[ReachabilityIndex] = None
+_reachability_lock = threading.Lock()
+
+
+def get_reachability_index() -> Optional[ReachabilityIndex]:
+    """Get the is-a reachability index, building it over the taxonomy on first use."""
+    global _reachability_index
+    taxonomy = get_taxonomy()
+    if taxonomy is None:
+        return None
+    index = _reachability_index
+    if index is not None and index.taxonomy is taxonomy:
+        return index
+
+    with _reachability_lock:
+        if _reachability_index is None or _reachability_index.taxonomy is not taxonomy:
+            _reachability_index = ReachabilityIndex(taxonomy)
+        return _reachability_index
+
+
+def dataset_version() -> Optional[str]:
+    """The owl:versionInfo of the DanNet dataset on the active server."""
+    client = get_client()
+    results = _make_sparql_request(client, f"{client.base_url}/dannet/sparql", {
+        "query": "SELECT ?version WHERE { dn: owl:versionInfo ?version }",
+        "format": "json",
+        "inference": "false",
+    })
+    bindings = results.get("results", {}).get("bindings", [])
+    return bindings[0]["version"]["value"] if bindings else None
+
+
+_data_checked_at: Optional[float] = None
+_data_lock = threading.Lock()
+
+
+def refresh_stale_data() -> None:
+    """
+    Check in the background whether the local exports are stale (see
+    check_data_version), at most once per DATA_VERSION_CHECK_INTERVAL.
+
+    Never blocks the caller: until the check has run, the data at hand is used,
+    and indexes discarded by it are rebuilt from fresh exports on next use.
+    """
+    global _data_checked_at
+    now = time.monotonic()
+    with _data_lock:
+        if _data_checked_at is not None and now - _data_checked_at < DATA_VERSION_CHECK_INTERVAL:
+            return
+        _data_checked_at = now
+    threading.Thread(target=check_data_version, name="data-version", daemon=True).start()
+
+
+def check_data_version() -> None:
+    """
+    Discard the local exports and every index built from them when the server
+    reports a different dataset version than the one they were downloaded for.
+
+    With --workers, only worker 0 changes the shared data directory (exports,
+    VERSION, refreshed schemas); the other workers follow, dropping their indexes
+    and cached schemas once they see it moved to another version.
+    """
+    try:
+        version = dataset_version()
+    except Exception as e:
+        logger.debug(f"Could not check the dataset version: {e}")
+        return
+    if version is None:
+        return
+    if not owns_data_dir():
+        follow_data_dir()
+        return
+    if version != schema_snapshot_version():
+        start_schema_refresh(version)
+
+    with _data_lock:
+        stored = stored_data_version()
+        if stored == version:
+            return
+
+        if stored is not None or os.path.isdir(_data_path("csv")) or os.path.isdir(_data_path("rdf")):
+            logger.info(f"Dataset version changed ({stored} -> {version}); discarding local exports")
+            for name in ("csv", "rdf"):
+                shutil.rmtree(_data_path(name), ignore_errors=True)
+            if os.path.exists(_data_path("forms.tsv")):
+                os.remove(_data_path("forms.tsv"))
+            if os.path.exists(_data_path("inference.json")):
+                os.remove(_data_path("inference.json"))
+            _discard_indexes()
+
+        os.makedirs(DATA_DIR, exist_ok=True)
+        with open(_data_path("VERSION"), 'w', encoding='utf-8') as f:
+            f.write(version)
+
+
+def owns_data_dir() -> bool:
+    """True in the process that changes the data directory: the only one, or worker 0 of --workers."""
+    return worker_index in (None, 0)
+
+
+def stored_data_version() -> Optional[str]:
+    """The dataset version the exports in the data directory were downloaded for."""
+    try:
+        with open(_data_path("VERSION"), encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+# What the data directory held when this worker last looked (see follow_data_dir)
+_followed_versions: Optional[Tuple[Optional[str], Optional[str]]] = None
+
+
+def follow_data_dir() -> None:
+    """
+    In a worker other than worker 0, drop the indexes and cached schemas once
+    worker 0 has moved the data directory to another dataset version.
+    """
+    global _followed_versions, _schema_index
+    with _data_lock:
+        versions = (stored_data_version(), schema_snapshot_version())
+        if _followed_versions is not None and versions[0] != _followed_versions[0]:
+            logger.info(f"Data directory moved to dataset version {versions[0]}; dropping local indexes")
+            _discard_indexes()
+        if _followed_versions is not None and versions[1] != _followed_versions[1]:
+            _schema_cache.clear()
+            _schema_index = None
+        _followed_versions = versions
+
+
+def _discard_indexes() -> None:
+    """Drop every index built from the local exports; they are rebuilt on next use."""
+    global _form_index, _form_index_thread, _taxonomy, _relation_graph, _relation_graph_thread
+    global _reachability_index
+    _form_index = _taxonomy = _relation_graph = _reachability_index = None
+    _relation_graph_thread = _form_index_thread = None
+    _synset_words.cache_clear()
+    inference_router.forget()
+
+
+def _schema_snapshot_dirs() -> List[str]:
+    """Snapshot directories in order of preference: refreshed copies, then the bundled ones."""
+    return [_data_path("schemas"), SCHEMA_SNAPSHOT_DIR]
+
+
+def _read_schema_manifest(directory: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(directory, "manifest.json"), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def schema_snapshot_version() -> Optional[str]:
+    """The dataset version of the schemas served from a snapshot."""
+    for directory in _schema_snapshot_dirs():
+        manifest = _read_schema_manifest(directory)
+        if manifest:
+            return manifest.get("version")
+    return None
+
+
+def snapshot_schema(prefix: str) -> Optional[str]:
+    """The schema of `prefix` from the preferred snapshot, or None if it has none."""
+    for directory in _schema_snapshot_dirs():
+        manifest = _read_schema_manifest(directory)
+        if manifest:
+            name = manifest.get("schemas", {}).get(prefix)
+            if name is None:
+                return None
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                return f.read()
+    return None
+
+
+_schema_refresh_thread: Optional[threading.Thread] = None
+_schema_version_watched = False
+
+
+def refresh_schemas(version: str) -> None:
+    """
+    Download the snapshot's schemas, and any other cached ones, from the active
+    server into DATA_DIR/schemas for dataset `version`, then serve them.
+
+    The copies are only replaced when every download succeeded; otherwise the
+    previous snapshot stays in use until the version is checked again.
+    """
+    global _schema_index
+    client = get_client()
+    prefixes = dict.fromkeys([*_read_schema_manifest(SCHEMA_SNAPSHOT_DIR).get("schemas", {}), *_schema_cache])
+    schemas: Dict[str, str] = {}
+    for prefix in prefixes:
+        try:
+            response = client.client.get(f"{client.base_url}/schema/{prefix}")
+            response.raise_for_status()
+        except Exception as e:
+            logger.info(f"Could not refresh the schemas for dataset version {version}: {e}")
+            return
+        schemas[prefix] = response.text
+
+    target = _data_path("schemas")
+    staging = f"{target}.{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for prefix, text in schemas.items():
+        with open(os.path.join(staging, prefix), 'w', encoding='utf-8') as f:
+            f.write(text)
+    with open(os.path.join(staging, "manifest.json"), 'w', encoding='utf-8') as f:
+        json.dump({"version": version, "schemas": {prefix: prefix for prefix in schemas}}, f, indent=2)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    _schema_cache.update(schemas)
+    _schema_index = None
+    logger.info(f"Refreshed {len(schemas)} schemas for dataset version {version}")
+
+
+def start_schema_refresh(version: str) -> None:
+    """Run refresh_schemas in a background thread, unless a refresh is running."""
+    global _schema_refresh_thread
+    if _schema_refresh_thread is not None and _schema_refresh_thread.is_alive():
+        return
+    _schema_refresh_thread = threading.Thread(target=refresh_schemas, args=(version,), daemon=True)
+    _schema_refresh_thread.start()
+
+
+def watch_schema_version() -> None:
+    """
+    Check the dataset version in the background once the first schema is served
+    from a snapshot, so a newer version gets its schemas (see refresh_stale_data).
+    """
+    global _schema_version_watched
+    if not _schema_version_watched:
+        _schema_version_watched = True
+        refresh_stale_data()
+
+
+def expand_relation(relation: str) -> str:
+    """Expand a relation name ("wn:hypernym", "dns:usedFor" or a full URI) to a URI."""
+    if relation.startswith(('http://', 'https://')):
+        return relation
+    prefix, _, local = relation.rpartition(':')
+    return {"wn": WN_NS, "dns": DNS_NS}.get(prefix, WN_NS) + local
+
+
+def normalize_synset_id(synset_id: str) -> str:
+    """Clean a synset identifier, accepting "dn:synset-1876", "synset-1876" or "1876"."""
+    clean_id = parse_resource_id(synset_id)
+    if not clean_id.startswith('synset-'):
+        clean_id = f"synset-{clean_id}" if clean_id.isdigit() else clean_id
+    return clean_id
+
+
+# SPARQL pre-flight analysis: the performance rules of the sparql_query
+# docstring, checked (and where safe, applied) before the query is sent.
+
+_SPARQL_TOKEN = re.compile(r'''
+    (?P<ws>\s+|\#[^\n]*)
+  | (?P<iri><[^<>"{}|^`\\\s]*>)
+  | (?P<string>"""(?:[^"\\]|\\.|"(?!""))*"""|\'\'\'(?:[^'\\]|\\.|'(?!''))*\'\'\'
+              |"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<var>[?$][A-Za-z0-9_]+)
+  | (?P<lang>@[A-Za-z]+(?:-[A-Za-z0-9]+)*)
+  | (?P<number>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<pname>(?:[A-Za-z_][\w-]*(?:\.[\w-]+)*)?:(?:[\w:%-]|\.(?=[\w:%-]))*)
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<op>\^\^|\|\||&&|!=|<=|>=|[{}()\[\].,;|/^*+?!=<>-])
+''', re.VERBOSE)
+
+# Prefixes predefined by the DanNet endpoint; predicates are compared as these
+# prefixed names, both in queries and in the schemas (see _prefixed_name)
+_SPARQL_NAMESPACES = {
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns#": "rdf",
+    "http://www.w3.org/2000/01/rdf-schema#": "rdfs",
+    "http://www.w3.org/2002/07/owl#": "owl",
+    "http://www.w3.org/ns/lemon/ontolex#": "ontolex",
+    "http://www.w3.org/2004/02/skos/core#": "skos",
+    "http://www.lexinfo.net/ontology/3.0/lexinfo#": "lexinfo",
+    "http://www.gsi.upm.es/ontologies/marl/ns#": "marl",
+    "http://purl.org/dc/terms/": "dc",
+    WN_NS: "wn",
+    DNS_NS: "dns",
+    "https://wordnet.dk/dannet/concepts/": "dnc",
+}
+
+
+def _prefixed_name(uri: str) -> str:
+    """A URI as the prefixed name SparqlAnalysis uses, when in a namespace it knows."""
+    for ns, prefix in _SPARQL_NAMESPACES.items():
+        if uri.startswith(ns):
+            return f"{prefix}:{uri[len(ns):]}"
+    return f"<{uri}>"
+
+# Order-of-magnitude row counts of the triplestore (DanNet + Open English
+# WordNet), used to estimate what an unanchored pattern scans
+SPARQL_GRAPH_ROWS = 10_000_000
+SPARQL_DEFAULT_PREDICATE_ROWS = 100_000
+SPARQL_PREDICATE_ROWS = {
+    "rdf:type": 1_500_000,
+    "rdfs:label": 1_000_000,
+    "ontolex:writtenRep": 600_000,
+    "ontolex:canonicalForm": 300_000,
+    "ontolex:otherForm": 300_000,
+    "ontolex:sense": 400_000,
+    "ontolex:isSenseOf": 400_000,
+    "ontolex:isLexicalizedSenseOf": 400_000,
+    "ontolex:lexicalizedSense": 400_000,
+    "ontolex:evokes": 400_000,
+    "ontolex:isEvokedBy": 400_000,
+    "skos:definition": 200_000,
+    "wn:hypernym": 250_000,
+    "wn:hyponym": 250_000,
+    "wn:partOfSpeech": 230_000,
+    "dns:ontologicalType": 70_000,
+    "dns:sentiment": 10_000,
+}
+SPARQL_CLASS_ROWS = {
+    "ontolex:LexicalConcept": 190_000,
+    "ontolex:LexicalEntry": 230_000,
+    "ontolex:Word": 230_000,
+    "ontolex:LexicalSense": 300_000,
+    "ontolex:Form": 300_000,
+}
+SPARQL_REJECT_ROWS = 1_000_000
+SPARQL_WARN_ROWS = 10_000
+
+_SPARQL_TEXT_FUNCTIONS = {"CONTAINS", "REGEX", "STRSTARTS", "STRENDS", "LCASE", "UCASE"}
+_SPARQL_AGGREGATES = {"COUNT", "SUM", "AVG", "MIN", "MAX", "GROUP_CONCAT", "SAMPLE"}
+
+
+class _SparqlGroup:
+    """One { ... } group graph pattern of a parsed query."""
+
+    __slots__ = ("triples", "values", "binds", "filters", "optionals", "unions", "subqueries", "start", "end")
+
+    def __init__(self, start: int):
+        self.triples: List[tuple] = []     # (subject, (predicate kind, text), object)
+        self.values: Set[str] = set()      # variables bound by VALUES
+        self.binds: List[tuple] = []       # (variables of the expression, target variable)
+        self.filters: List[tuple] = []     # (first token index, last token index)
+        self.optionals: List["_SparqlGroup"] = []
+        self.unions: List[List["_SparqlGroup"]] = []
+        self.subqueries: List["_SparqlGroup"] = []
+        self.start = start                 # token index of "{"
+        self.end = start                   # token index of "}"
+
+
+class SparqlAnalysis:
+    """
+    Pre-flight analysis of a SPARQL SELECT query.
+
+    Tokenizes and parses the query into its group graph patterns and checks the
+    performance rules of the sparql_query tool:
+
+    - anchoring: every connected set of triple patterns (joined by shared
+      variables) should start from a URI, a literal or a VALUES block; an
+      unanchored set is a scan, estimated from SPARQL_PREDICATE_ROWS
+    - cartesian products: two or more unconnected sets in the same group
+      multiply their row counts
+    - text FILTERs (CONTAINS, REGEX, ...) over variables of an unanchored set
+    - a missing LIMIT
+
+    Two rewrites are safe and applied to `query`: FILTER(?v = <a> || ?v = <b>)
+    over URIs becomes VALUES ?v { <a> <b> }, and LIMIT is added when absent (at
+    the end, or before a trailing VALUES block, which must come last).
+    `findings` lists what was detected as {"rule", "severity", "message"} dicts,
+    severity being "rewrite", "warning" or "error"; `estimated_rows` is the
+    estimated number of rows scanned by unanchored patterns (0 when every
+    pattern starts from a known term).
+    """
+
+    def __init__(self, query: str, limit: int = 100):
+        self.original = query
+        self.query = query
+        self.findings: List[Dict[str, str]] = []
+        self.estimated_rows = 0
+        self._tokens = [(m.lastgroup, m.group(), m.start(), m.end())
+                        for m in _SPARQL_TOKEN.finditer(query) if m.lastgroup != 'ws']
+        self._pos = 0
+        self._bnodes = 0
+        self._ordered = False           # ORDER BY, GROUP BY or aggregates: scans run to the end
+        self._exists = False            # FILTER (NOT) EXISTS, whose patterns are not parsed
+        self.where: Optional[_SparqlGroup] = None
+        self._prefixes = {prefix: ns for ns, prefix in _SPARQL_NAMESPACES.items()}
+        self._edits: List[tuple] = []   # (start, end, replacement) character spans
+        try:
+            where, has_limit, values_at = self._parse_query()
+        except (IndexError, DanNetError) as e:
+            # The endpoint reports syntax errors better than this parser can
+            self._finding("syntax", "warning", f"Query not analysed: {e}")
+            return
+        if where is None:
+            return
+        self.where = where
+        self.estimated_rows = self._analyse_group(where, set(), set())
+        if not has_limit:
+            if values_at is not None:
+                self._edits.append((values_at, values_at, f"LIMIT {limit}\n"))
+            else:
+                self._edits.append((len(query.rstrip()), len(query.rstrip()), f"\nLIMIT {limit}"))
+            self._finding("limit", "rewrite", f"Added LIMIT {limit}")
+        for start, end, replacement in sorted(self._edits, reverse=True):
+            self.query = self.query[:start] + replacement + self.query[end:]
+
+    @property
+    def errors(self) -> List[str]:
+        return [f["message"] for f in self.findings if f["severity"] == "error"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"estimated_rows": self.estimated_rows, "findings": self.findings}
+        if self.query != self.original:
+            result["rewritten_query"] = self.query
+        return result
+
+    def _finding(self, rule: str, severity: str, message: str):
+        self.findings.append({"rule": rule, "severity": severity, "message": message})
+
+    def predicates(self, essential: bool = False) -> Optional[Set[str]]:
+        """
+        Predicates (path steps included) of the required triple patterns, i.e.
+        not in OPTIONAL, UNION or MINUS; with `essential`, UNION alternatives are
+        included too, so the set decides whether the result is empty. None when
+        a pattern has a variable predicate, the query uses EXISTS or was not parsed.
+        """
+        if self.where is None or self._exists:
+            return None
+        found: Set[str] = set()
+        groups = [self.where]
+        while groups:
+            group = groups.pop()
+            for _, (kind, p), _ in group.triples:
+                if kind == 'var':
+                    return None
+                found.update(step for step in p.split() if ':' in step or step.startswith('<'))
+            groups += group.subqueries
+            if essential:
+                groups += [g for alternatives in group.unions for g in alternatives]
+        return found
+
+    # -- parsing --------------------------------------------------------------
+
+    def _peek(self, offset: int = 0) -> tuple:
+        i = self._pos + offset
+        return self._tokens[i] if i < len(self._tokens) else (None, None, len(self.original), len(self.original))
+
+    def _next(self) -> tuple:
+        token = self._peek()
+        if token[0] is None:
+            raise DanNetError("unexpected end of query")
+        self._pos += 1
+        return token
+
+    def _keyword(self, *words: str) -> bool:
+        kind, text = self._peek()[:2]
+        return kind == 'name' and text.upper() in words
+
+    def _expect(self, value: str):
+        token = self._next()[1]
+        if token != value:
+            raise DanNetError(f"expected '{value}', got '{token}'")
+
+    def _skip_balanced(self):
+        """Skip a bracketed expression starting at the current token."""
+        depth = 0
+        while True:
+            text = self._next()[1]
+            if text in ('(', '{', '['):
+                depth += 1
+            elif text in (')', '}', ']'):
+                depth -= 1
+            if depth == 0:
+                return
+
+    def _parse_query(self) -> tuple:
+        """Parse prologue, SELECT clause, WHERE group and solution modifiers."""
+        while self._keyword('PREFIX', 'BASE'):
+            if self._next()[1].upper() == 'PREFIX':
+                prefix = self._next()[1]
+                self._prefixes[prefix[:-1]] = self._next()[1][1:-1]
+            else:
+                self._next()
+        if not self._keyword('SELECT'):
+            return None, True, None
+        return self._parse_select()
+
+    def _parse_select(self) -> tuple:
+        """
+        SELECT ... WHERE { ... } modifiers; returns (group, has LIMIT, start of a
+        trailing VALUES block or None).
+        """
+        self._next()
+        while self._peek()[1] != '{' and not self._keyword('WHERE', 'FROM'):
+            if self._keyword(*_SPARQL_AGGREGATES):
+                self._ordered = True
+            self._next()
+        while self._keyword('FROM', 'NAMED'):
+            self._next()
+            if self._peek()[0] in ('iri', 'pname'):
+                self._next()
+        if self._keyword('WHERE'):
+            self._next()
+        group = self._parse_group()
+        has_limit = False
+        values_at = None
+        while self._peek()[0] is not None and self._peek()[1] not in ('}', ')'):
+            if self._keyword('LIMIT'):
+                has_limit = True
+            elif self._keyword('ORDER', 'GROUP', 'HAVING'):
+                self._ordered = True
+            if self._keyword('VALUES'):
+                values_at = self._next()[2]
+                self._parse_values(group)
+            elif self._peek()[1] == '(':
+                self._skip_balanced()
+            else:
+                self._next()
+        return group, has_limit, values_at
+
+    def _parse_group(self) -> _SparqlGroup:
+        group = _SparqlGroup(self._pos)
+        self._expect('{')
+        if self._keyword('SELECT'):
+            # Subquery: analysed as a group of its own
+            inner = self._parse_select()[0]
+            group.subqueries.append(inner)
+        while self._peek()[1] != '}':
+            kind, text = self._peek()[:2]
+            upper = text.upper() if kind == 'name' else None
+            if text == '.':
+                self._next()
+            elif upper == 'FILTER':
+                start = self._pos
+                self._next()
+                if self._peek()[0] == 'name':
+                    if self._keyword('NOT'):
+                        self._next()
+                    self._next()
+                self._skip_balanced()
+                group.filters.append((start, self._pos - 1))
+                self._exists = self._exists or any(
+                    t[0] == 'name' and t[1].upper() == 'EXISTS' for t in self._tokens[start:self._pos])
+            elif upper == 'OPTIONAL':
+                self._next()
+                group.optionals.append(self._parse_group())
+            elif upper == 'MINUS':
+                # MINUS only removes rows; its patterns do not join
+                self._next()
+                self._parse_group()
+            elif upper in ('GRAPH', 'SERVICE'):
+                self._next()
+                if self._keyword('SILENT'):
+                    self._next()
+                self._next()
+                group.unions.append([self._parse_group()])
+            elif upper == 'BIND':
+                self._next()
+                start = self._pos
+                self._skip_balanced()
+                expression = self._tokens[start:self._pos]
+                target = expression[-2][1]
+                group.binds.append(({t[1] for t in expression[:-3] if t[0] == 'var'}, target))
+            elif upper == 'VALUES':
+                self._next()
+                self._parse_values(group)
+            elif text == '{' and self._peek(1)[1].upper() == 'SELECT':
+                self._next()
+                inner = self._parse_select()[0]
+                self._expect('}')
+                group.subqueries.append(inner)
+            elif text == '{':
+                alternatives = [self._parse_group()]
+                while self._keyword('UNION'):
+                    self._next()
+                    alternatives.append(self._parse_group())
+                group.unions.append(alternatives)
+            else:
+                self._parse_triples(group)
+        group.end = self._pos
+        self._next()
+        return group
+
+    def _parse_values(self, group: _SparqlGroup):
+        if self._peek()[1] == '(':
+            self._next()
+            while self._peek()[1] != ')':
+                group.values.add(self._next()[1])
+            self._next()
+        else:
+            group.values.add(self._next()[1])
+        self._skip_balanced()
+
+    def _bnode(self) -> str:
+        self._bnodes += 1
+        return f"_:b{self._bnodes}"
+
+    def _parse_triples(self, group: _SparqlGroup):
+        subject = self._parse_term(group)
+        self._parse_property_list(group, subject)
+        if self._peek()[1] == '.':
+            self._next()
+
+    def _parse_property_list(self, group: _SparqlGroup, subject: str):
+        while self._peek()[1] not in ('.', '}', ']', None) and not self._keyword(
+                'FILTER', 'OPTIONAL', 'MINUS', 'BIND', 'VALUES', 'GRAPH', 'SERVICE'):
+            if self._peek()[0] == 'var':
+                predicate = ('var', self._next()[1])
+            else:
+                predicate = self._parse_path()
+            while True:
+                group.triples.append((subject, predicate, self._parse_term(group)))
+                if self._peek()[1] != ',':
+                    break
+                self._next()
+            if self._peek()[1] != ';':
+                break
+            while self._peek()[1] == ';':
+                self._next()
+
+    def _parse_path(self) -> tuple:
+        """A predicate or property path; ('iri', name) for a plain predicate."""
+        start = self._pos
+        while True:
+            while self._peek()[1] in ('^', '!'):
+                self._next()
+            if self._peek()[1] == '(':
+                self._skip_balanced()
+            else:
+                kind, text = self._next()[:2]
+                if kind not in ('iri', 'pname', 'name'):
+                    raise DanNetError(f"unexpected '{text}' in predicate position")
+            while self._peek()[1] in ('*', '+', '?'):
+                self._next()
+            if self._peek()[1] not in ('/', '|'):
+                break
+            self._next()
+        tokens = self._tokens[start:self._pos]
+        if len(tokens) == 1:
+            return ('iri', self._normalise(tokens[0][1]))
+        return ('path', " ".join(self._normalise(t[1]) for t in tokens))
+
+    def _parse_term(self, group: _SparqlGroup) -> str:
+        kind, text = self._peek()[:2]
+        if text == '[':
+            self._next()
+            node = self._bnode()
+            self._parse_property_list(group, node)
+            self._expect(']')
+            return node
+        if text == '(':
+            self._skip_balanced()
+            return "()"
+        self._next()
+        if kind == 'string' and self._peek()[1] == '^^':
+            self._next()
+            self._next()
+        elif kind == 'string' and self._peek()[0] == 'lang':
+            self._next()
+        elif kind == 'op' and text in ('+', '-') and self._peek()[0] == 'number':
+            self._next()
+        elif kind == 'op':
+            raise DanNetError(f"unexpected '{text}'")
+        return self._normalise(text) if kind in ('iri', 'pname') else text
+
+    def _normalise(self, term: str) -> str:
+        """Full IRIs in a known namespace as prefixed names; 'a' as rdf:type."""
+        if term == 'a':
+            return "rdf:type"
+        if term.startswith('<'):
+            return _prefixed_name(term[1:-1])
+        elif ':' in term:
+            prefix, _, local = term.partition(':')
+            prefix = _SPARQL_NAMESPACES.get(self._prefixes.get(prefix), prefix)
+            return f"{prefix}:{local}"
+        return term
+
+    # -- analysis -------------------------------------------------------------
+
+    @staticmethod
+    def _is_variable(term: str) -> bool:
+        return term[0] in '?$' or term.startswith('_:')
+
+    def _analyse_group(self, group: _SparqlGroup, anchored: Set[str], outer: Set[str]) -> int:
+        """
+        Check one group given the variables already bound (`anchored`) and all
+        variables (`outer`) of the enclosing groups; returns the estimated rows
+        scanned by its unanchored patterns.
+        """
+        parent: Dict[str, str] = {}
+
+        def find(v):
+            while parent.setdefault(v, v) != v:
+                v = parent[v]
+            return v
+
+        def union(a, b):
+            parent[find(a)] = find(b)
+
+        self._rewrite_or_filters(group)
+        strong, weak = set(group.values | anchored), {}
+        for s, (kind, p), o in group.triples:
+            terms = [t for t in (s, o) if self._is_variable(t)] + ([p] if kind == 'var' else [])
+            if not terms:
+                continue
+            for t in terms:
+                union(t, terms[0])
+            if not self._is_variable(s) or (not self._is_variable(o) and p != "rdf:type"):
+                strong.add(terms[0])
+            else:
+                weak.setdefault(terms[0], []).append(self._pattern_rows(kind, p, o))
+        for variables, target in group.binds:
+            find(target)
+            for v in variables:
+                union(v, target)
+        for subquery in group.subqueries:
+            variables = self._group_variables(subquery)
+            for v in variables:
+                union(v, variables[0])
+            if variables:
+                weak.setdefault(variables[0], []).append(self._analyse_group(subquery, set(), set()))
+        for v in strong:
+            find(v)
+
+        components: Dict[str, Set[str]] = {}
+        for v in list(parent):
+            components.setdefault(find(v), set()).add(v)
+        anchored_here = set(anchored)
+        joined, free, total = 0, [], 1
+        for variables in components.values():
+            rows = [r for v in variables for r in weak.get(v, [])]
+            if variables & outer:
+                continue
+            joined += 1
+            # Variables only bound by BIND or VALUES, or by a cheap subquery, count as anchored
+            if variables & strong or not rows or min(rows) < SPARQL_WARN_ROWS:
+                anchored_here |= variables
+                continue
+            free.append((variables, min(rows)))
+            total *= min(rows)
+
+        for variables, rows in free:
+            # Without ORDER BY or aggregates, LIMIT stops the scan early
+            names = " ".join(sorted(v for v in variables if not v.startswith('_:')))
+            self._finding("anchor", "error" if rows >= SPARQL_REJECT_ROWS and self._ordered else "warning",
+                          f"Patterns on {names} start from no known URI or literal and scan up to ~{rows:,} rows"
+                          f"{' before ordering or grouping' if self._ordered else ''}; "
+                          "anchor them on a dn: URI, a literal or a VALUES block")
+        if free and joined > 1:
+            self._finding("cartesian", "error" if total >= SPARQL_REJECT_ROWS else "warning",
+                          f"{joined} unconnected pattern groups form a cartesian product"
+                          f"{f' of ~{total:,} rows' if len(free) > 1 else ''}; join them on a shared variable")
+        self._check_text_filters(group, {v: rows for variables, rows in free for v in variables})
+
+        estimate = total if free else 0
+        variables = outer | set(parent)
+        for optional in group.optionals:
+            estimate += self._analyse_group(optional, anchored_here, variables)
+        for alternatives in group.unions:
+            for alternative in alternatives:
+                estimate += self._analyse_group(alternative, anchored_here, variables)
+        return estimate
+
+    def _pattern_rows(self, kind: str, predicate: str, obj: str) -> int:
+        if kind == 'var':
+            return SPARQL_GRAPH_ROWS
+        if predicate == "rdf:type" and not self._is_variable(obj):
+            return SPARQL_CLASS_ROWS.get(obj, SPARQL_DEFAULT_PREDICATE_ROWS)
+        if kind == 'path':
+            # A path is at least as costly as its first step
+            predicate = predicate.lstrip('^! (').split()[0]
+        return SPARQL_PREDICATE_ROWS.get(predicate, SPARQL_DEFAULT_PREDICATE_ROWS)
+
+    def _group_variables(self, group: _SparqlGroup) -> List[str]:
+        variables = list(group.values)
+        for s, (kind, p), o in group.triples:
+            variables += [t for t in (s, o) if self._is_variable(t)] + ([p] if kind == 'var' else [])
+        for subquery in group.subqueries:
+            variables += self._group_variables(subquery)
+        return list(dict.fromkeys(variables))
+
+    def _check_text_filters(self, group: _SparqlGroup, scanned: Dict[str, int]):
+        """Flag string-matching FILTERs over the variables of a scan."""
+        for start, end in group.filters:
+            tokens = self._tokens[start:end + 1]
+            functions = {t[1].upper() for t in tokens if t[0] == 'name'} & _SPARQL_TEXT_FUNCTIONS
+            rows = max((scanned.get(t[1], 0) for t in tokens if t[0] == 'var'), default=0)
+            if functions and rows:
+                self._finding("text_filter", "error" if rows >= SPARQL_REJECT_ROWS else "warning",
+                              f"FILTER with {', '.join(sorted(functions))} is evaluated on each of ~{rows:,} "
+                              "scanned rows; anchor the patterns instead (get_word_synsets or "
+                              "autocomplete_danish_word give the URIs of a word)")
+
+    def _rewrite_or_filters(self, group: _SparqlGroup):
+        """Replace FILTER(?v = <a> || ?v = <b> ...) over URIs by VALUES ?v { <a> <b> }."""
+        variables = self._group_variables(group)
+        for start, end in list(group.filters):
+            tokens = self._tokens[start:end + 1]
+            values = self._or_filter_values(tokens)
+            # VALUES joins on term identity, so only URIs are safe (literals compare by value)
+            if values is None or values[0] not in variables:
+                continue
+            variable, uris = values
+            group.filters.remove((start, end))
+            group.values.add(variable)
+            self._edits.append((tokens[0][2], tokens[-1][3], f"VALUES {variable} {{ {' '.join(uris)} }}"))
+            self._finding("values", "rewrite", f"Rewrote the FILTER comparing {variable} with URIs "
+                                               f"as VALUES {variable} {{ ... }}")
+
+    @staticmethod
+    def _or_filter_values(tokens: list) -> Optional[tuple]:
+        """(variable, URIs) for FILTER(?v = <a> || ?v = <b> ...), else None."""
+        texts = [t[1] for t in tokens]
+        if texts[1:2] != ['('] or texts[-1] != ')':
+            return None
+        # Parentheses are only allowed around the whole disjunction or single comparisons
+        depth = 0
+        for t in texts[2:-1]:
+            depth += (t == '(') - (t == ')')
+            if depth not in (0, 1):
+                return None
+        body = [t for t in tokens[2:-1] if t[1] not in ('(', ')')]
+        if len(body) % 4 != 3:
+            return None
+        variable, uris = None, []
+        for i in range(0, len(body), 4):
+            left, operator, right = body[i:i + 3]
+            if operator[1] != '=' or (i + 3 < len(body) and body[i + 3][1] != '||'):
+                return None
+            if left[0] != 'var':
+                left, right = right, left
+            if left[0] != 'var' or right[0] not in ('iri', 'pname') or variable not in (None, left[1]):
+                return None
+            variable = left[1]
+            uris.append(right[1])
+        return variable, uris
+
+
+OWL_NS = "http://www.w3.org/2002/07/owl#"
+RDFS_NS = "http://www.w3.org/2000/01/rdf-schema#"
+
+# Schemas read for owl:inverseOf and rdfs:subPropertyOf, the only two kinds of
+# entailment of the server's inference model (see etc/dannet.rules)
+INFERENCE_SCHEMAS = ("wn", "dns", "ontolex", "skos")
+
+# Relations known to be stored in the base model; their inverses are derived
+INFERENCE_ASSERTED_SEED = ("wn:hypernym", "wn:instance_hypernym",
+                           "wn:mero_part", "wn:mero_member", "wn:mero_substance",
+                           "ontolex:evokes", "ontolex:sense", "ontolex:lexicalizedSense")
+
+
+class InferenceRouter:
+    """
+    Chooses the model for SPARQL queries that leave it open (inference=None).
+
+    In that mode the endpoint runs the query on the base model and, when the
+    result is empty, runs it again on the inference model; a query on a derived
+    relation such as wn:hyponym therefore always executes twice. The server's
+    inference only adds inverses (owl:inverseOf) and super-properties
+    (rdfs:subPropertyOf), so the schemas tell which predicates can be derived at
+    all. Given the predicates of a query (SparqlAnalysis.predicates):
+
+    - a required predicate known to be derived: inference model only
+    - only predicates the inference model adds nothing to: base model only
+    - a required predicate whose side of an inverse pair is unknown: base model,
+      then inference if empty, done by the client so the outcome can be learned;
+      the partner of a relation found in the base model is taken to be derived
+    - anything else (variable predicates, other namespaces): the server's auto mode
+
+    Learned classifications are stored in the data directory (inference.json)
+    and dropped with the local exports when the dataset version changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loading: Optional[threading.Thread] = None
+        self.namespaces: Set[str] = {"rdf", "rdfs"}
+        self.inverses: Dict[str, Set[str]] = {}
+        self.super_properties: Set[str] = set()
+        self.asserted: Set[str] = set(INFERENCE_ASSERTED_SEED)
+        self.derived: Set[str] = set()
+        self.learned: Dict[str, str] = {}
+        self.counts = {"inference": 0, "base": 0, "observe": 0, "auto": 0, "double_executions_avoided": 0}
+
+    def _load(self) -> None:
+        """Read the inverse pairs and super-properties from the schemas, and what was learned."""
+        inverses: Dict[str, Set[str]] = {}
+        super_properties: Set[str] = set()
+        namespaces = {"rdf", "rdfs"}
+        for prefix in INFERENCE_SCHEMAS:
+            text = get_schema_resource(prefix)
+            if text.startswith("Error"):
+                logger.debug(f"No schema for inference routing: {text}")
+                continue
+            try:
+                triples = parse_rdf_xml(text) if _is_rdf_xml(text) else TurtleParser(text).triples()
+                for s, p, o in triples:
+                    if not (isinstance(s, str) and isinstance(o, str)):
+                        continue
+                    s, o = _prefixed_name(s), _prefixed_name(o)
+                    if p == OWL_NS + "inverseOf":
+                        inverses.setdefault(s, set()).add(o)
+                        inverses.setdefault(o, set()).add(s)
+                    elif p == RDFS_NS + "subPropertyOf":
+                        super_properties.add(o)
+                namespaces.add(prefix)
+            except (DanNetError, ElementTree.ParseError) as e:
+                logger.debug(f"Could not read the '{prefix}' schema: {e}")
+
+        learned: Dict[str, str] = {}
+        try:
+            with open(_data_path("inference.json"), encoding='utf-8') as f:
+                learned = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        with self._lock:
+            self.namespaces, self.inverses, self.super_properties = namespaces, inverses, super_properties
+            self.derived |= super_properties
+            for predicate in INFERENCE_ASSERTED_SEED:
+                self._classify(predicate, "asserted")
+            for predicate, kind in learned.items():
+                self._classify(predicate, kind)
+                self.learned[predicate] = kind
+
+    def _classify(self, predicate: str, kind: str) -> None:
+        """Record `predicate` as asserted or derived; the partner of an asserted relation is derived."""
+        (self.asserted if kind == "asserted" else self.derived).add(predicate)
+        if kind == "asserted":
+            for partner in self.inverses.get(predicate, ()):
+                if partner != predicate and partner not in self.asserted:
+                    self.derived.add(partner)
+
+    def _learn(self, predicates: Set[str], kind: str) -> None:
+        with self._lock:
+            for predicate in predicates:
+                self._classify(predicate, kind)
+                self.learned[predicate] = kind
+            learned = dict(self.learned)
+        try:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            with open(_data_path("inference.json"), 'w', encoding='utf-8') as f:
+                json.dump(learned, f, indent=1)
+        except OSError as e:
+            logger.debug(f"Could not store learned inference routing: {e}")
+
+    def forget(self) -> None:
+        """Drop what was learned, e.g. for a new dataset version."""
+        with self._lock:
+            self.asserted = set(INFERENCE_ASSERTED_SEED)
+            self.derived = set(self.super_properties)
+            self.learned = {}
+            for predicate in INFERENCE_ASSERTED_SEED:
+                self._classify(predicate, "asserted")
+
+    def route(self, analysis: SparqlAnalysis) -> Tuple[str, Set[str]]:
+        """("inference" | "base" | "observe" | "auto", predicates to learn about)."""
+        with self._lock:
+            if self._loading is None:
+                # Queries go to the server's auto mode until the schemas are in
+                self._loading = threading.Thread(target=self._load, daemon=True)
+                self._loading.start()
+        if self._loading.is_alive():
+            return "auto", set()
+        required, essential = analysis.predicates(), analysis.predicates(essential=True)
+        if required is None or essential is None:
+            return "auto", set()
+        with self._lock:
+            if required & self.derived:
+                return "inference", set()
+            candidates = set(self.inverses) | self.super_properties
+            if all(p.partition(':')[0] in self.namespaces and p not in candidates for p in essential):
+                return "base", set()
+            unknown = {p for p in required & candidates if p not in self.asserted}
+            if unknown:
+                return "observe", unknown
+        return "auto", set()
+
+    def execute(self, analysis: SparqlAnalysis, run: Callable[[Optional[bool]], Dict]) -> Dict:
+        """Run a query through `run(inference)` on the model chosen by route()."""
+        route, unknown = self.route(analysis)
+        with self._lock:
+            self.counts[route] += 1
+            if route == "inference":
+                self.counts["double_executions_avoided"] += 1
+        if route == "auto":
+            return run(None)
+        if route == "inference":
+            return run(True)
+
+        result = run(False)
+        empty = not result.get("results", {}).get("bindings")
+        if route == "base":
+            if empty:
+                with self._lock:
+                    self.counts["double_executions_avoided"] += 1
+            return result
+        if not empty:
+            self._learn(unknown, "asserted")
+            return result
+        result = run(True)
+        # An empty base result only points at a predicate when it is the only unknown one
+        if result.get("results", {}).get("bindings") and len(unknown) == 1:
+            self._learn(unknown, "derived")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counts,
+                "schemas": sorted(self.namespaces - {"rdf", "rdfs"}),
+                "derived": sorted(self.derived - self.super_properties),
+                "learned": dict(self.learned),
+            }
+
+
+inference_router = InferenceRouter()
+
+
+def routed_sparql_request(client: DanNetClient, params: Dict,
+                          analysis: Optional[SparqlAnalysis] = None) -> Dict:
+    """_make_sparql_request for params without "inference", on the model chosen by inference_router."""
+    analysis = analysis or SparqlAnalysis(params["query"])
+
+    def run(inference: Optional[bool]) -> Dict:
+        if inference is None:
+            return _make_sparql_request(client, f"{client.base_url}/dannet/sparql", params)
+        return _make_sparql_request(client, f"{client.base_url}/dannet/sparql",
+                                    {**params, "inference": "true" if inference else "false"})
+
+    return inference_router.execute(analysis, run)
+
+
+# Schemas indexed for describe_terms, with the namespace of their terms
+SCHEMA_NAMESPACES = {
+    "dns": DNS_NS,
+    "dnc": "https://wordnet.dk/dannet/concepts/",
+    "wn": WN_NS,
+    "ontolex": "http://www.w3.org/ns/lemon/ontolex#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+    "lexinfo": "http://www.lexinfo.net/ontology/3.0/lexinfo#",
+    "marl": "http://www.gsi.upm.es/ontologies/marl/ns#",
+    "rdf": RDF_NS,
+    "rdfs": RDFS_NS,
+    "owl": OWL_NS,
+    "dc": "http://purl.org/dc/terms/",
+}
+
+# Fields of a described term, by the predicates they are read from
+SCHEMA_TERM_FIELDS = {
+    RDF_NS + "type": "type",
+    RDFS_NS + "label": "label",
+    "http://www.w3.org/2004/02/skos/core#prefLabel": "label",
+    RDFS_NS + "comment": "comment",
+    "http://www.w3.org/2004/02/skos/core#definition": "comment",
+    RDFS_NS + "domain": "domain",
+    RDFS_NS + "range": "range",
+    RDFS_NS + "subPropertyOf": "super",
+    RDFS_NS + "subClassOf": "super",
+    OWL_NS + "inverseOf": "inverse",
+}
+SCHEMA_TERM_ORDER = ("uri", "schema", *dict.fromkeys(SCHEMA_TERM_FIELDS.values()))
+
+
+class SchemaIndex:
+    """
+    The terms of the schemas in SCHEMA_NAMESPACES, keyed by prefixed name, for
+    describe_terms: their types, labels and comments per language, domain,
+    range, super-properties or -classes and inverses.
+
+    A term is described by the schema of its own namespace first; other schemas
+    only add what that one leaves out. Inverses are recorded in both directions
+    and owl:unionOf domains and ranges are expanded into their members.
+    """
+
+    def __init__(self, schemas: Dict[str, str]):
+        self.namespaces = {uri: prefix for prefix, uri in SCHEMA_NAMESPACES.items()}
+        self.terms: Dict[str, Dict[str, Any]] = {}
+        parsed: List[Tuple[str, Dict[str, Dict[str, list]]]] = []
+        for prefix, text in schemas.items():
+            try:
+                if _is_rdf_xml(text):
+                    triples = parse_rdf_xml(text)
+                else:
+                    parser = TurtleParser(text)
+                    triples = list(parser.triples())
+                    for name, uri in parser.prefixes.items():
+                        if name:
+                            self.namespaces.setdefault(uri, name)
+            except (DanNetError, ElementTree.ParseError) as e:
+                logger.debug(f"Could not index the '{prefix}' schema: {e}")
+                continue
+            graph: Dict[str, Dict[str, list]] = {}
+            for subject, predicate, obj in triples:
+                graph.setdefault(subject, {}).setdefault(predicate, []).append(obj)
+            parsed.append((prefix, graph))
+
+        # Terms of each schema's own namespace first, then what other schemas add
+        for own in (True, False):
+            for prefix, graph in parsed:
+                for subject, properties in graph.items():
+                    if subject.startswith('_:') or subject.startswith(SCHEMA_NAMESPACES[prefix]) != own:
+                        continue
+                    self._add(self.name(subject), subject, prefix, properties, graph)
+
+        for term, entry in list(self.terms.items()):
+            for inverse in entry.get("inverse", []):
+                partner = self.terms.get(inverse)
+                if partner is not None and term not in partner.setdefault("inverse", []):
+                    partner["inverse"].append(term)
+        self.by_local_name: Dict[str, List[str]] = {}
+        for term in self.terms:
+            self.by_local_name.setdefault(term.rpartition(':')[2].lower(), []).append(term)
+
+    def name(self, uri: str) -> str:
+        """`uri` as a prefixed name, if in a known namespace."""
+        for namespace, prefix in self.namespaces.items():
+            if uri.startswith(namespace) and len(uri) > len(namespace):
+                return f"{prefix}:{uri[len(namespace):]}"
+        return uri
+
+    def _resources(self, values: list, graph: Dict[str, Dict[str, list]]) -> List[str]:
+        """Prefixed names of IRI values, with owl:unionOf classes expanded."""
+        names: List[str] = []
+        for value in values:
+            if not isinstance(value, str):
+                continue
+            if not value.startswith('_:'):
+                names.append(self.name(value))
+                continue
+            cell = (graph.get(value, {}).get(OWL_NS + "unionOf") or [None])[0]
+            while isinstance(cell, str) and cell in graph:
+                names += self._resources(graph[cell].get(RDF_NS + "first", []), graph)
+                cell = (graph[cell].get(RDF_NS + "rest") or [None])[0]
+        return names
+
+    def _add(self, term: str, uri: str, prefix: str, properties: Dict[str, list],
+             graph: Dict[str, Dict[str, list]]) -> None:
+        entry = self.terms.get(term)
+        if entry is None:
+            entry = self.terms[term] = {"uri": uri, "schema": prefix}
+        defined = set(entry)
+        for predicate, values in properties.items():
+            field = SCHEMA_TERM_FIELDS.get(predicate)
+            if field is None or field in defined:
+                continue
+            if field in ("label", "comment"):
+                texts = entry.setdefault(field, {})
+                for value in values:
+                    if isinstance(value, tuple):
+                        texts.setdefault(value[1] or "", " ".join(value[0].split()))
+            else:
+                for name in self._resources(values, graph):
+                    if name not in entry.setdefault(field, []):
+                        entry[field].append(name)
+        if len(entry) == 2 and defined == set(entry):
+            del self.terms[term]
+
+    def lookup(self, term: str) -> Optional[Dict[str, Any]]:
+        """The entry of a prefixed name or URI (optionally in angle brackets), or None."""
+        term = term.strip()
+        if term.startswith('<') and term.endswith('>'):
+            term = term[1:-1]
+        return self.terms.get(self.name(term) if term.startswith(('http://', 'https://')) else term)
+
+    def suggest(self, term: str, limit: int = 5) -> List[str]:
+        """Known terms with the same local name as `term`, ignoring case."""
+        local = term.strip('<>').rpartition('#')[2].rpartition('/')[2].rpartition(':')[2].lower()
+        return self.by_local_name.get(local, [])[:limit]
+
+
+_schema_index: Optional[SchemaIndex] = None
+_schema_index_lock = threading.Lock()
+
+
+def get_schema_index() -> SchemaIndex:
+    """The schema term index, built from the schemas of SCHEMA_NAMESPACES on first use."""
+    global _schema_index
+    if _schema_index is not None:
+        return _schema_index
+    with _schema_index_lock:
+        if _schema_index is None:
+            schemas = {}
+            for prefix in SCHEMA_NAMESPACES:
+                text = get_schema_resource(prefix)
+                if not text.startswith("Error accessing"):
+                    schemas[prefix] = text
+            _schema_index = SchemaIndex(schemas)
+            logger.info(f"Schema index ready: {len(_schema_index.terms)} terms from {len(schemas)} schemas")
+        return _schema_index
+
+
 @mcp.tool()
 def get_word_synsets(query: str, language: str = "da") -> Union[List[SearchResult], Dict[str, Any]]:
     """
@@ -626,6 +4085,10 @@ def get_word_synsets(query: str, language: str = "da") -> Union[List[SearchResul
     The single-result case is equivalent to calling get_synset_info() on the synset,
     providing the same comprehensive RDF data structure with all semantic relations.
 
+    Inflected forms (e.g. "hundene") are resolved to their lemma ("hund") from
+    the local form index when it has been built (see lemmatize_danish_words)
+    and language is "da".
+
     Args:
         query: The Danish word or phrase to search for
     
@@ -658,6 +4121,14 @@ def get_word_synsets(query: str, language: str = "da") -> Union[List[SearchResul
         # => {'wn:hypernym': 'dn:synset-11677', 'dns:sentiment': {...}, ...}
     """
     try:
+        # Inflected forms are mapped to their lemma locally when the form index
+        # is available, so the search doesn't depend on server-side resolution
+        index = get_form_index(download=False) if language == "da" else None
+        if index:
+            lemmas = index.lemmas(query)
+            if len(lemmas) == 1:
+                query = lemmas[0]
+
         results = get_client().search(query, language)
         search_results = []
 
@@ -719,7 +4190,388 @@ def get_word_synsets(query: str, language: str = "da") -> Union[List[SearchResul
 
 
 @mcp.tool()
-def get_entity_info(identifier: str, namespace: str = "dn") -> Dict[str, Any]:
+def lemmatize_danish_words(words: List[str]) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Map Danish surface forms (inflections included) to DanNet lemmas and word IDs.
+
+    Useful for processing running text: every token can be resolved in a single
+    call instead of one search per token. Forms are looked up in a local index
+    built from the DanNet CSV export and the COR integration export; only forms
+    missing from the index are looked up remotely. The first call starts building
+    the index in the background (downloading the exports), and all forms are
+    looked up remotely until it is ready.
+
+    Args:
+        words: Surface forms to resolve (e.g. ["hundene", "løb", "hurtigt"])
+
+    Returns:
+        Dict mapping each input form to a list of candidates, each with:
+        - lemma: The dictionary form
+        - word_id: DanNet word identifier (pass to get_word_info)
+        Unknown forms map to an empty list. Homographs yield several candidates.
+
+    Example:
+        lemmatize_danish_words(["hundene", "gik"])
+        # => {"hundene": [{"lemma": "hund", "word_id": "word-11021628"}],
+        #     "gik": [{"lemma": "gå", "word_id": "word-11017906"}]}
+    """
+    try:
+        index = form_index_if_ready()
+        result: Dict[str, List[Dict[str, str]]] = {}
+        unresolved = []
+        for word in dict.fromkeys(words):
+            candidates = index.resolve(word) if index else []
+            result[word] = candidates
+            if not candidates:
+                unresolved.append(word)
+
+        if unresolved:
+            for form, candidates in _lookup_forms_remote(unresolved).items():
+                result[form] = candidates
+                if index:
+                    for candidate in candidates:
+                        index.add(form, candidate["word_id"], candidate["lemma"])
+
+        return result
+
+    except Exception as e:
+        raise RuntimeError(f"Lemmatization failed: {e}")
+
+
+# Field presets for the fields parameter of the entity tools
+ENTITY_FIELD_PRESETS: Dict[str, Tuple[str, ...]] = {
+    "summary": ("@id", "@type", "rdfs:label", "skos:definition", "wn:hypernym", "dns:ontologicalType"),
+    "taxonomy": ("@id", "rdfs:label", "wn:hypernym", "wn:hyponym", "wn:instance_hypernym",
+                 "wn:instance_hyponym", "dns:orthogonalHypernym", "dns:orthogonalHyponym",
+                 "dns:ontologicalType"),
+    "lexical": ("@id", "@type", "rdfs:label", "ontolex:isEvokedBy", "ontolex:lexicalizedSense",
+                "ontolex:evokes", "ontolex:sense", "ontolex:canonicalForm", "ontolex:isSenseOf",
+                "ontolex:isLexicalizedSenseOf", "lexinfo:senseExample", "wn:partOfSpeech"),
+}
+
+
+def payload_size(data: Any) -> int:
+    """Size in bytes of `data` as compact UTF-8 JSON."""
+    return len(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+# Default size budget of an entity returned by get_synset_info/get_entity_info (bytes of JSON)
+ENTITY_BYTE_BUDGET = 40_000
+# Values per page of get_relation_page
+RELATION_PAGE_SIZE = 200
+MAX_RELATION_PAGE_SIZE = 1000
+
+
+def value_order() -> str:
+    """
+    The order in which long relation values are truncated and paged: "indegree"
+    (most connected synsets first) when the relation graph is built, otherwise
+    "listed" (as returned by the server).
+
+    Never starts building the graph, which needs the CSV export: it is built by
+    --warm-up at startup or on first use of related_synsets, and the order
+    switches to "indegree" from then on. Every cursor records the order it was
+    made in, so paging is unaffected by the switch.
+    """
+    return "indegree" if _relation_graph is not None else "listed"
+
+
+def value_ranking(values: List[Any], order: str) -> List[int]:
+    """Positions of relation values in the given order; ties and non-synset values keep the listed order."""
+    if order != "indegree":
+        return list(range(len(values)))
+    graph = relation_graph_if_ready()
+    if graph is None:
+        # Only after the local data was discarded for a new dataset version; rebuilt in the background
+        raise DanNetError("The relation graph for cursor order 'indegree' is being rebuilt; "
+                          "retry shortly, or start over without a cursor")
+    ranks = [-graph.indegree(parse_resource_id(v)) if isinstance(v, str) else 0 for v in values]
+    return sorted(range(len(values)), key=ranks.__getitem__)
+
+
+def truncate_entity(entity: Dict[str, Any], max_bytes: int, size: int) -> Dict[str, Any]:
+    """
+    Fit `entity` (`size` bytes as JSON) into roughly max_bytes by truncating its
+    multi-valued properties.
+
+    The bytes left after the other properties are shared out evenly, so short
+    lists stay complete and the longest lists give up the most. Each truncated
+    list keeps its first values in value_order() (at least one), and is listed
+    under "truncated" with its total and a cursor for get_relation_page. The
+    result depends on the entity and that order, which changes once, from
+    "listed" to "indegree", when the relation graph has been built.
+    """
+    lists = {key: value for key, value in entity.items()
+             if isinstance(value, list) and len(value) > 1}
+    if not lists:
+        return entity
+    item_sizes = {key: [payload_size(v) + 1 for v in value] for key, value in lists.items()}
+    available = max(0, max_bytes - (size - sum(map(sum, item_sizes.values()))))
+
+    # Water-filling, smallest lists first: each gets its size or an even share of what is left
+    allotted: Dict[str, int] = {}
+    remaining = sorted(lists, key=lambda key: (sum(item_sizes[key]), key))
+    for n, key in enumerate(remaining):
+        allotted[key] = min(sum(item_sizes[key]), available // (len(remaining) - n))
+        available -= allotted[key]
+
+    order = value_order()
+    result = dict(entity)
+    truncated: Dict[str, Dict[str, Any]] = {}
+    for key, value in lists.items():
+        if allotted[key] >= sum(item_sizes[key]):
+            continue
+        ranking = value_ranking(value, order)
+        kept, used = 0, 0
+        while kept < len(ranking) and (kept == 0 or used + item_sizes[key][ranking[kept]] <= allotted[key]):
+            used += item_sizes[key][ranking[kept]]
+            kept += 1
+        result[key] = [value[i] for i in ranking[:kept]]
+        truncated[key] = {"total": len(value), "returned": kept, "next_cursor": f"{order}:{kept}"}
+    if truncated:
+        result["truncated"] = truncated
+    return result
+
+
+class Literal(tuple):
+    """A language-tagged literal of a cached entity, stored as (value, language)."""
+    __slots__ = ()
+
+
+class EntityRecord:
+    """
+    Compact form of a JSON-LD object in the resource cache (see compact_entity).
+    `keys` is shared by all records with the same properties, `values` holds the
+    compacted value of each key.
+    """
+    __slots__ = ('keys', 'values')
+
+    def __init__(self, keys: tuple, values: tuple):
+        self.keys = keys
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """The JSON-LD value of `key`, or default."""
+        try:
+            return materialize_entity(self.values[self.keys.index(key)])
+        except ValueError:
+            return default
+
+
+def compact_entity(value: Any) -> Any:
+    """
+    `value` (parsed JSON-LD) in the compact form kept in the resource cache.
+
+    Objects become EntityRecords whose key tuple is shared per set of
+    properties, lists become tuples, {"@value", "@language"} literals become
+    Literals, and property names, language tags and resource IDs (prefixed
+    names and URIs) are interned, so the many entities that refer to the same
+    synsets share one copy of each ID. materialize_entity() reverses this.
+    """
+    if isinstance(value, str):
+        if value.startswith(('http://', 'https://')) or _PREFIXED_NAME.fullmatch(value):
+            return sys.intern(value)
+        return value
+    if isinstance(value, list):
+        return tuple(compact_entity(item) for item in value)
+    if isinstance(value, dict):
+        if tuple(value) == ('@value', '@language') and isinstance(value['@language'], str):
+            return Literal((value['@value'], sys.intern(value['@language'])))
+        keys = tuple(sys.intern(key) for key in value)
+        keys = _record_shapes.setdefault(keys, keys)
+        return EntityRecord(keys, tuple(compact_entity(item) for item in value.values()))
+    return value
+
+
+def materialize_entity(value: Any) -> Any:
+    """The JSON-LD form of a value from compact_entity(); a fresh copy every time."""
+    if isinstance(value, EntityRecord):
+        return {key: materialize_entity(item) for key, item in zip(value.keys, value.values)}
+    if isinstance(value, Literal):
+        return {'@value': value[0], '@language': value[1]}
+    if isinstance(value, tuple):
+        return [item if item.__class__ is str else materialize_entity(item) for item in value]
+    return value
+
+
+def intern_context(base_url: str, entity: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    `entity` without its @context, for the resource cache. The server only puts
+    the prefixes an entity uses in its context, so the mappings are merged into
+    one context per base URL. An entity whose context maps a known prefix to a
+    different namespace keeps its own.
+    """
+    context = entity.get('@context') if isinstance(entity, dict) else None
+    if not isinstance(context, dict):
+        return entity
+    known = _contexts.setdefault(base_url, {})
+    if any(known.get(prefix, uri) != uri for prefix, uri in context.items()):
+        return entity
+    known.update(context)
+    return {key: value for key, value in entity.items() if key != '@context'}
+
+
+def entity_context(base_url: Optional[str] = None) -> Dict[str, str]:
+    """The merged @context of the entities fetched from base_url (default: the active server)."""
+    return dict(_contexts.get(base_url or get_client().base_url, {}))
+
+
+# Resources per label query; the SPARQL endpoint returns at most SPARQL_ROW_CAP rows
+# and schema resources often have a Danish and an English label. Batches whose
+# answer fills a page are split
+LABEL_BATCH_SIZE = 40
+_PREFIXED_NAME = re.compile(r"([A-Za-z][\w.-]*):([\w.%-]*[\w%-])")
+
+
+def referenced_resources(data: Any, prefixes: Dict[str, str]) -> List[str]:
+    """
+    Resources referenced among the values of `data`, in order of appearance:
+    prefixed names with one of the given prefixes and http(s) URIs. The
+    entity's own @id, literal @values and the @context are skipped.
+    """
+    found: Dict[str, None] = {}
+
+    def walk(value: Any) -> None:
+        if isinstance(value, str):
+            if value.startswith(('http://', 'https://')):
+                found[value] = None
+            else:
+                match = _PREFIXED_NAME.fullmatch(value)
+                if match and match.group(1) in prefixes:
+                    found[value] = None
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if key not in ('@context', '@id', '@value', 'truncated'):
+                    walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    walk(data)
+    return list(found)
+
+
+def resolve_labels(resources: List[str]) -> Dict[str, str]:
+    """
+    Labels of resources (prefixed names or full URIs), preferring Danish.
+
+    Labels come from the label cache, from cached DanNet entities, or from
+    SPARQL queries that look up LABEL_BATCH_SIZE resources at a time via VALUES
+    (the approach of the DanNet web frontend). A batch whose answer fills the
+    SPARQL_ROW_CAP page may have lost labels and is split and asked again.
+    Resources without a label are remembered as such and left out of the result.
+    """
+    client = get_client()
+    context = entity_context(client.base_url)
+    labels: Dict[str, str] = {}
+    missing: Dict[str, str] = {}
+    for resource in resources:
+        key = (client.base_url, resource)
+        # False when not cached; None for a resource known to have no label
+        label = _label_cache.get(key, False)
+        if label is False:
+            dn_id = resource[3:] if resource.startswith('dn:') else None
+            entity = _resource_cache.get((client.base_url, dn_id)) if dn_id else None
+            if entity is None:
+                prefix, _, local = resource.partition(':')
+                uri = resource if resource.startswith(('http://', 'https://')) else context.get(prefix, '') + local
+                if uri.startswith(('http://', 'https://')):
+                    missing[uri] = resource
+                continue
+            label = _label_cache[key] = get_language_value(entity.get('rdfs:label')) or None
+        if label:
+            labels[resource] = label
+
+    uris = list(missing)
+    pending = [uris[i:i + LABEL_BATCH_SIZE] for i in range(0, len(uris), LABEL_BATCH_SIZE)]
+    while pending:
+        batch = pending.pop()
+        query = f"""
+SELECT ?resource ?label WHERE {{
+  VALUES ?resource {{ {" ".join(f"<{uri}>" for uri in batch)} }}
+  ?resource rdfs:label ?label .
+}}
+"""
+        with tracer.span("label lookup", resources=len(batch)):
+            results = routed_sparql_request(client, {"query": query, "format": "json"})
+        bindings = results.get("results", {}).get("bindings", [])
+        if len(bindings) >= SPARQL_ROW_CAP:
+            if len(batch) > 1:
+                pending += [batch[:len(batch) // 2], batch[len(batch) // 2:]]
+                continue
+            logger.warning(f"Label lookup of <{batch[0]}> hit the {SPARQL_ROW_CAP}-row cap; labels may be missing")
+        by_uri: Dict[str, List[Dict[str, str]]] = {}
+        for b in bindings:
+            by_uri.setdefault(b["resource"]["value"], []).append(
+                {"@value": b["label"]["value"], "@language": b["label"].get("xml:lang", "")})
+        for uri in batch:
+            resource = missing[uri]
+            if uri in by_uri:
+                labels[resource] = _label_cache[(client.base_url, resource)] = get_language_value(by_uri[uri])
+            else:
+                _label_cache[(client.base_url, resource)] = None
+    return labels
+
+
+def add_labels(result: Dict[str, Any]) -> Dict[str, Any]:
+    """`result` with a "labels" key mapping the resources it references to their labels."""
+    context = result.get('@context') or entity_context()
+    return {**result, 'labels': resolve_labels(referenced_resources(result, context))}
+
+
+def project_entity(entity: EntityRecord, fields: Union[str, List[str], None],
+                   cache_key: tuple, max_bytes: int = 0) -> Dict[str, Any]:
+    """
+    The JSON-LD of a cached `entity` reduced to the keys named by `fields` (keys
+    such as "rdfs:label" and preset names, see ENTITY_FIELD_PRESETS), or all of
+    it when fields is None, and truncated to max_bytes if that is set (see
+    truncate_entity). Only the requested keys are materialized. The sizes
+    before and after are recorded in metrics; the full size is measured once
+    per cached entity.
+    """
+    full = _payload_sizes.get(cache_key)
+    if fields is None:
+        result = materialize_entity(entity)
+        if full is None:
+            full = _payload_sizes[cache_key] = payload_size(result)
+        if max_bytes and full > max_bytes:
+            result = truncate_entity(result, max_bytes, full)
+            metrics.observe_payload(full, payload_size(result))
+            return result
+        metrics.observe_payload(full, full)
+        return result
+    if full is None:
+        full = _payload_sizes[cache_key] = payload_size(materialize_entity(entity))
+
+    keys: List[str] = []
+    for name in [fields] if isinstance(fields, str) else fields:
+        if name in ENTITY_FIELD_PRESETS:
+            keys += ENTITY_FIELD_PRESETS[name]
+        elif name.startswith('@') or ':' in name:
+            keys.append(name)
+        else:
+            raise DanNetError(f"Unknown field or preset '{name}'; use prefixed keys such as 'rdfs:label' "
+                              f"or one of the presets {', '.join(ENTITY_FIELD_PRESETS)}")
+    result = {key: entity.get(key) for key in dict.fromkeys(keys) if key in entity}
+    size = payload_size(result)
+    if max_bytes and size > max_bytes:
+        result = truncate_entity(result, max_bytes, size)
+        size = payload_size(result)
+    metrics.observe_payload(full, size)
+    return result
+
+
+@mcp.tool()
+def get_entity_info(identifier: str, namespace: str = "dn",
+                    fields: Union[str, List[str], None] = None,
+                    max_bytes: int = ENTITY_BYTE_BUDGET,
+                    include_context: bool = False, enrich_labels: bool = False) -> Dict[str, Any]:
     """
     Get comprehensive RDF data for any entity in the DanNet database.
     
@@ -745,15 +4597,30 @@ def get_entity_info(identifier: str, namespace: str = "dn") -> Dict[str, Any]:
                   - "dn": DanNet entities via /dannet/data/ endpoint
                   - Other values: External entities via /dannet/external/{namespace}/ endpoint
                   - Common external namespaces: "ontolex", "ili", "wn", "lexinfo", etc.
+        fields: Only return these keys (default: None = everything). Accepts
+                prefixed keys ("rdfs:label", "wn:hypernym", "@type") and presets:
+                "summary" (id, type, label, definition, hypernym, ontological type),
+                "taxonomy" (hypernyms, hyponyms, ontological type) and
+                "lexical" (words, senses, forms, examples). Presets and keys can be mixed,
+                e.g. ["summary", "wn:similar"].
+        max_bytes: Size budget of the DanNet entity as JSON (default: 40000, 0 = no limit);
+                   see get_synset_info
+        include_context: Inline the JSON-LD @context (default: False). The prefix
+                         mappings are the same for every entity and are available
+                         once from the dannet://context resource.
+        enrich_labels: Add a "labels" dict with the label of every resource the
+                       entity refers to, e.g. {"dn:synset-2084": "{pattedyr_§1}"},
+                       looked up in batches (default: False)
 
     Returns:
         Dict containing JSON-LD format with:
-        - @context → namespace mappings (if applicable)
+        - @context → namespace mappings (only with include_context=True)
         - @id → entity identifier
         - @type → entity type
         - All RDF properties with namespace prefixes (e.g., wn:hypernym, ontolex:evokes)
         - For DanNet synsets: dns:ontologicalType and dns:sentiment (if applicable)
         - Entity-specific convenience fields (synset_id, resource_id, etc.)
+        - labels → labels of the referenced resources (only with enrich_labels=True)
 
     Examples:
         # DanNet entities
@@ -765,6 +4632,9 @@ def get_entity_info(identifier: str, namespace: str = "dn") -> Dict[str, Any]:
         get_entity_info("LexicalConcept", namespace="ontolex")  # OntoLex class definition
         get_entity_info("i76470", namespace="ili")  # Inter-Lingual Index entry
         get_entity_info("noun", namespace="lexinfo")  # Lexinfo part-of-speech
+
+        # Only what is needed
+        get_entity_info("synset-3047", fields="summary")
     """
     try:
         if namespace == "dn":
@@ -778,23 +4648,38 @@ def get_entity_info(identifier: str, namespace: str = "dn") -> Dict[str, Any]:
         client = get_client()
         url = f"{client.base_url}/{endpoint_path}"
 
-        # Use same request pattern as get_resource but with custom path
-        request_params = {"format": "json"}
-
-        # Use the standalone retry-enabled function
-        data = _make_entity_request_standalone(client, url, request_params)
+        # DanNet entities share their cache entries with get_resource
+        cache_key = (client.base_url, identifier if namespace == "dn" else f"{namespace}/{identifier}")
+        with tracer.span("resource cache", key=cache_key[1]) as span:
+            if cache_key not in _resource_cache and prefetcher is not None:
+                prefetcher.wait(cache_key)
+            span.set(hit=cache_key in _resource_cache)
+            data = _resource_cache.get(cache_key)
+            observe_cache_lookup(cache_key, data is not None)
+            if data is None:
+                # Use same request pattern as get_resource but with custom path
+                request_params = {"format": "json"}
+
+                # Use the standalone retry-enabled function
+                data = load_shared(cache_key, lambda: _make_entity_request_standalone(client, url, request_params))
+                if data:
+                    data = _resource_cache.setdefault(cache_key, compact_entity(intern_context(client.base_url, data)))
 
         # Check for valid JSON-LD response
         if not data:
             raise DanNetError(f"No data found for {namespace}/{identifier}")
 
         # JSON-LD format is already clean - just add convenience field
-        result = dict(data)
+        result = project_entity(data, fields, cache_key, max_bytes if namespace == "dn" else 0)
         if namespace == "dn":
             result['resource_id'] = identifier
         else:
             result['resource_id'] = f"{namespace}/{identifier}"
-        
+        if include_context and '@context' not in result:
+            result = {'@context': entity_context(client.base_url), **result}
+        if enrich_labels:
+            result = add_labels(result)
+
         return result
 
     except Exception as e:
@@ -802,7 +4687,9 @@ def get_entity_info(identifier: str, namespace: str = "dn") -> Dict[str, Any]:
 
 
 @mcp.tool()
-def get_synset_info(synset_id: str) -> Dict[str, Any]:
+def get_synset_info(synset_id: str, fields: Union[str, List[str], None] = None,
+                    max_bytes: int = ENTITY_BYTE_BUDGET, include_context: bool = False,
+                    enrich_labels: bool = False) -> Dict[str, Any]:
     """
     Get comprehensive RDF data for a DanNet synset (lexical concept).
 
@@ -852,22 +4739,40 @@ def get_synset_info(synset_id: str) -> Dict[str, Any]:
 
     Args:
         synset_id: Synset identifier (e.g., "synset-1876" or just "1876")
+        fields: Only return these keys (default: None = everything); prefixed keys
+                and the presets "summary", "taxonomy" and "lexical", as in get_entity_info.
+                Top-level synsets have thousands of wn:hyponym values, so prefer
+                fields="summary" when the label, definition and hypernym suffice.
+        max_bytes: Size budget of the result as JSON (default: 40000, 0 = no limit).
+                   Longer multi-valued relations are cut short, keeping the most
+                   connected synsets first, and listed under "truncated" with a
+                   next_cursor; fetch the rest with get_relation_page().
+        include_context: Inline the JSON-LD @context (default: False); the same
+                         mappings are available once from the dannet://context resource
+        enrich_labels: Add a "labels" dict with the label of every referenced
+                       resource (hypernyms, hyponyms, words, ...), so they need no
+                       get_synset_info() call each (default: False)
 
     Returns:
         Dict containing JSON-LD format with:
-        - @context → namespace mappings
+        - @context → namespace mappings (only with include_context=True)
         - @id → entity identifier (e.g., "dn:synset-1876")
         - @type → "ontolex:LexicalConcept"
         - All RDF properties with namespace prefixes (e.g., wn:hypernym)
         - dns:ontologicalType → {"@set": ["dnc:Animal", ...]} (if applicable)
         - dns:sentiment → {"marl:hasPolarity": "marl:Positive", "marl:polarityValue": "3"} (if applicable)
         - synset_id → clean identifier for convenience
+        - truncated → {"wn:hyponym": {"total": 2345, "returned": 150, "next_cursor": "indegree:150"}}
+          (only if relations were cut short to fit max_bytes)
+        - labels → {"dn:synset-2084": "{pattedyr_§1}", ...} (only with enrich_labels=True)
 
     Example:
         info = get_synset_info("synset-52")  # cake synset
         # Check info['wn:hypernym'] for parent concepts
         # Check info['dns:ontologicalType']['@set'] for semantic types
         # Check info['dns:sentiment']['marl:hasPolarity'] for sentiment
+        get_synset_info("synset-52", fields=["summary", "wn:similar"])
+        get_synset_info("synset-52", fields="taxonomy", enrich_labels=True)  # with neighbour labels
     """
     try:
         # Clean the synset_id and ensure proper prefix
@@ -876,13 +4781,18 @@ def get_synset_info(synset_id: str) -> Dict[str, Any]:
             clean_id = f"synset-{clean_id}" if clean_id.isdigit() else clean_id
 
         # Get the JSON-LD data directly from DanNet
-        data = get_client().get_resource(clean_id)
+        client = get_client()
+        data = client.get_record(clean_id)
         if not data:
             raise DanNetError(f"Synset not found: {clean_id}")
             
         # JSON-LD format is already clean - just add convenience field
-        result = dict(data)
+        result = project_entity(data, fields, (client.base_url, clean_id), max_bytes)
         result['synset_id'] = clean_id
+        if include_context and '@context' not in result:
+            result = {'@context': entity_context(client.base_url), **result}
+        if enrich_labels:
+            result = add_labels(result)
         return result
         
     except Exception as e:
@@ -890,7 +4800,79 @@ def get_synset_info(synset_id: str) -> Dict[str, Any]:
 
 
 @mcp.tool()
-def get_word_info(word_id: str) -> Dict[str, Any]:
+def get_relation_page(synset_id: str, relation: str, cursor: Optional[str] = None,
+                      page_size: int = RELATION_PAGE_SIZE, enrich_labels: bool = False) -> Dict[str, Any]:
+    """
+    Page through the values of one relation of a synset.
+
+    get_synset_info() cuts long relations short to fit its size budget; top-level
+    synsets can have thousands of wn:hyponym values. The cut relations are listed
+    under "truncated" in its result, each with a next_cursor to pass here. Pages
+    continue in the order of the cursor: the most connected synsets first once
+    the server has its local relation graph (e.g. with --warm-up), otherwise as
+    listed by DanNet.
+
+    Args:
+        synset_id: Synset identifier (e.g., "synset-1876" or just "1876")
+        relation: Prefixed relation (e.g., "wn:hyponym", "wn:mero_member")
+        cursor: next_cursor from get_synset_info() or the previous page
+                (default: None = from the first value)
+        page_size: Values per page (default: 200, at most 1000)
+        enrich_labels: Add a "labels" dict with the label of each value (default: False)
+
+    Returns:
+        Dict with:
+        - synset_id, relation
+        - values → this page of values (e.g., ["dn:synset-4196", ...])
+        - total → number of values of the relation
+        - next_cursor → cursor of the following page, or None after the last page
+
+    Example:
+        info = get_synset_info("synset-1876")
+        cursor = info["truncated"]["wn:hyponym"]["next_cursor"]
+        while cursor:
+            page = get_relation_page("synset-1876", "wn:hyponym", cursor)
+            cursor = page["next_cursor"]
+    """
+    try:
+        clean_id = parse_resource_id(synset_id)
+        if not clean_id.startswith('synset-'):
+            clean_id = f"synset-{clean_id}" if clean_id.isdigit() else clean_id
+
+        if cursor:
+            order, _, offset = cursor.partition(":")
+            if order not in ("indegree", "listed") or not offset.isdigit():
+                raise DanNetError(f"Invalid cursor '{cursor}'")
+            start = int(offset)
+        else:
+            order, start = value_order(), 0
+        page_size = max(1, min(page_size, MAX_RELATION_PAGE_SIZE))
+
+        data = get_client().get_record(clean_id)
+        if not data:
+            raise DanNetError(f"Synset not found: {clean_id}")
+        values = data.get(relation, [])
+        if not isinstance(values, list):
+            values = [values]
+
+        ranking = value_ranking(values, order)
+        end = min(start + page_size, len(values))
+        result = {
+            "synset_id": clean_id,
+            "relation": relation,
+            "values": [values[i] for i in ranking[start:end]],
+            "total": len(values),
+            "next_cursor": f"{order}:{end}" if end < len(values) else None,
+        }
+        return add_labels(result) if enrich_labels else result
+
+    except Exception as e:
+        raise RuntimeError(f"Failed to get relation page: {e}")
+
+
+@mcp.tool()
+def get_word_info(word_id: str, fields: Union[str, List[str], None] = None,
+                  include_context: bool = False, enrich_labels: bool = False) -> Dict[str, Any]:
     """
     Get comprehensive RDF data for a DanNet word (lexical entry).
 
@@ -921,6 +4903,10 @@ def get_word_info(word_id: str) -> Dict[str, Any]:
 
     Args:
         word_id: Word identifier (e.g., "word-11021628" or just "11021628")
+        fields: Only return these keys (default: None = everything); prefixed keys
+                and the presets "summary", "taxonomy" and "lexical", as in get_entity_info
+        include_context: Inline the JSON-LD @context (default: False), as in get_entity_info
+        enrich_labels: Add the labels of referenced resources (default: False), as in get_entity_info
 
     Returns:
         Dict containing:
@@ -938,11 +4924,13 @@ def get_word_info(word_id: str) -> Dict[str, Any]:
     if not clean_id.startswith('word-'):
         clean_id = f"word-{clean_id}" if clean_id.isdigit() else clean_id
 
-    return get_entity_info(clean_id, namespace="dn")
+    return get_entity_info(clean_id, namespace="dn", fields=fields, include_context=include_context,
+                           enrich_labels=enrich_labels)
 
 
 @mcp.tool()
-def get_sense_info(sense_id: str) -> Dict[str, Any]:
+def get_sense_info(sense_id: str, fields: Union[str, List[str], None] = None,
+                   include_context: bool = False, enrich_labels: bool = False) -> Dict[str, Any]:
     """
     Get comprehensive RDF data for a DanNet sense (lexical sense).
 
@@ -993,6 +4981,10 @@ def get_sense_info(sense_id: str) -> Dict[str, Any]:
 
     Args:
         sense_id: Sense identifier (e.g., "sense-21033604" or just "21033604")
+        fields: Only return these keys (default: None = everything); prefixed keys
+                and the presets "summary", "taxonomy" and "lexical", as in get_entity_info
+        include_context: Inline the JSON-LD @context (default: False), as in get_entity_info
+        enrich_labels: Add the labels of referenced resources (default: False), as in get_entity_info
 
     Returns:
         Dict containing:
@@ -1014,7 +5006,8 @@ def get_sense_info(sense_id: str) -> Dict[str, Any]:
     if not clean_id.startswith('sense-'):
         clean_id = f"sense-{clean_id}" if clean_id.isdigit() else clean_id
 
-    return get_entity_info(clean_id, namespace="dn")
+    return get_entity_info(clean_id, namespace="dn", fields=fields, include_context=include_context,
+                           enrich_labels=enrich_labels)
 
 
 
@@ -1058,8 +5051,7 @@ SELECT DISTINCT ?lemma WHERE {{
   FILTER(!CONTAINS(STR(?lemma), " "))
 }}
 """
-        results = _make_sparql_request(client, f"{client.base_url}/dannet/sparql",
-                                       {"query": query, "format": "json"})
+        results = routed_sparql_request(client, {"query": query, "format": "json"})
         lemmas = [b["lemma"]["value"] for b in results.get("results", {}).get("bindings", [])]
         return ", ".join(sorted(lemmas))
 
@@ -1136,8 +5128,7 @@ SELECT DISTINCT ?synset ?label ?definition ?ontType ?synonymLemma ?hypernym ?hyp
   }}
 }}
 """
-        raw = _make_sparql_request(client, f"{client.base_url}/dannet/sparql",
-                                   {"query": query, "format": "json"})
+        raw = routed_sparql_request(client, {"query": query, "format": "json"})
 
         # Group flat rows by synset URI
         synsets: Dict[str, Dict] = {}
@@ -1176,6 +5167,142 @@ SELECT DISTINCT ?synset ?label ?definition ?ontType ?synonymLemma ?hypernym ?hyp
         raise RuntimeError(f"Failed to get word overview: {e}")
 
 
+@mcp.tool()
+def rank_similar_synsets(synset_id: str, metric: str = "wup", top_k: int = 10) -> List[Dict[str, Any]]:
+    """
+    Rank all DanNet synsets by taxonomic similarity to a synset, computed locally.
+
+    A fast alternative to ranking with the dnf: SPARQL functions over the whole
+    graph (TEMPLATE 11 of sparql_query). Scores are computed from a local copy
+    of the hypernym taxonomy (DanNet CSV export, downloaded on first use) and
+    follow the same definitions as dnf:path, dnf:lch and dnf:wup, including
+    the depth given to self-referential hypernyms. One difference: the CSV
+    export has no wn:lexfile, so the part of speech that selects the lch
+    taxonomy depth is the wn:partOfSpeech of the synset's first word rather
+    than the lexfile prefix the server uses; lch scores differ for the few
+    synsets where the two disagree.
+
+    Args:
+        synset_id: Synset to compare against (e.g. "synset-3047" or "3047")
+        metric: "wup" (Wu-Palmer, default), "lch" (Leacock-Chodorow) or "path"
+        top_k: Number of results to return (default: 10)
+
+    Returns:
+        List of dicts, best first, each containing:
+        - synset_id: The similar synset
+        - score: Similarity score (higher = more similar)
+        - lemmas: Words expressing the synset
+
+    Example:
+        rank_similar_synsets("synset-3047", "wup", 5)
+        # => [{"synset_id": "synset-...", "score": 0.93, "lemmas": ["kat"]}, ...]
+    """
+    try:
+        if metric not in ("path", "lch", "wup"):
+            raise DanNetError(f"Unknown metric '{metric}' - use 'path', 'lch' or 'wup'")
+        taxonomy = get_taxonomy()
+        if taxonomy is None:
+            raise DanNetError("Local taxonomy unavailable (CSV export could not be downloaded)")
+        clean_id = normalize_synset_id(synset_id)
+        if clean_id not in taxonomy.index:
+            raise DanNetError(f"Synset not in taxonomy: {clean_id}")
+
+        return [{"synset_id": s, "score": score, "lemmas": taxonomy.lemmas_of.get(s, [])}
+                for s, score in taxonomy.most_similar(clean_id, metric, top_k)]
+
+    except Exception as e:
+        raise RuntimeError(f"Failed to rank similar synsets: {e}")
+
+
+@mcp.tool()
+def related_synsets(seed_ids: List[str], relations: Optional[List[str]] = None,
+                    top_k: int = 10) -> List[Dict[str, Any]]:
+    """
+    Find synsets related to one or more seed synsets across DanNet's relation graph.
+
+    Unlike taxonomic similarity (rank_similar_synsets), this follows any
+    synset-to-synset relation: thematic roles, part-whole, used-for, causal
+    relations and more. Relatedness is personalized PageRank (random walk with
+    restart) from the seeds over a local copy of the relations (DanNet CSV
+    export, downloaded on first use), treating relations as undirected.
+
+    Args:
+        seed_ids: One or more synsets to start from (e.g. ["synset-3047"])
+        relations: Relation types to walk (e.g. ["wn:mero_part", "dns:usedFor",
+                   "wn:agent"]); prefixes wn: and dns: are understood, bare names
+                   default to wn:. Default: all synset relations. Relation
+                   types absent from the graph are an error listing the known ones.
+        top_k: Number of results to return (default: 10)
+
+    Returns:
+        List of dicts, most related first, each containing:
+        - synset_id: The related synset
+        - score: Personalized PageRank score
+        - lemmas: Words expressing the synset
+
+    Example:
+        related_synsets(["synset-3047"], ["wn:mero_part", "wn:holo_part"])
+        # Parts and wholes of "hund" and their close neighbourhood
+    """
+    try:
+        graph = get_relation_graph()
+        if graph is None:
+            raise DanNetError("Local relation graph unavailable (CSV export could not be downloaded)")
+
+        if not seed_ids:
+            raise DanNetError("At least one seed synset is required")
+        seeds = [normalize_synset_id(s) for s in seed_ids]
+        unknown = [s for s in seeds if s not in graph.index]
+        if unknown:
+            raise DanNetError(f"Synsets have no relations: {', '.join(unknown)}")
+        selected = frozenset(expand_relation(r) for r in relations) if relations else frozenset(graph.edges)
+        unknown = [r for r, uri in zip(relations or [], map(expand_relation, relations or []))
+                   if uri not in graph.edges]
+        if unknown:
+            known = sorted(f"dns:{r[len(DNS_NS):]}" if r.startswith(DNS_NS) else
+                           f"wn:{r[len(WN_NS):]}" if r.startswith(WN_NS) else r for r in graph.edges)
+            raise DanNetError(f"Unknown relation types: {', '.join(unknown)} (known: {', '.join(known)})")
+
+        return [{"synset_id": s, "score": score, "lemmas": graph.lemmas_of.get(s, [])}
+                for s, score in graph.related(seeds, selected, top_k)]
+
+    except Exception as e:
+        raise RuntimeError(f"Failed to find related synsets: {e}")
+
+
+@mcp.tool()
+def is_a(pairs: List[List[str]]) -> List[bool]:
+    """
+    Batch check whether synsets are kinds of other synsets (hypernym reachability).
+
+    Answers "is X a kind of Y?" for many pairs at once from a precomputed
+    index over the local hypernym taxonomy (DanNet CSV export, downloaded on
+    first use), instead of a wn:hypernym+ SPARQL query or a manual chain walk
+    per check. Multiple inheritance is taken into account.
+
+    Args:
+        pairs: List of [x, y] synset pairs, e.g. [["synset-3047", "synset-1234"]]
+
+    Returns:
+        List of booleans in the same order: True if x is y or x has y among its
+        (transitive) hypernyms. Unknown synsets yield False.
+
+    Example:
+        # Is "hund" (synset-3047) an animal, and is it a plant? (look up the
+        # synsets of "dyr" and "plante" with get_word_synsets first)
+        is_a([["synset-3047", dyr_synset_id], ["synset-3047", plante_synset_id]])
+        # => [True, False]
+    """
+    try:
+        index = get_reachability_index()
+        if index is None:
+            raise DanNetError("Local taxonomy unavailable (CSV export could not be downloaded)")
+        return [index.is_a(normalize_synset_id(x), normalize_synset_id(y)) for x, y in pairs]
+
+    except Exception as e:
+        raise RuntimeError(f"Failed to check is-a relations: {e}")
+
+
 @mcp.tool()
 def autocomplete_danish_word(prefix: str, max_results: int = 10) -> str:
     """
@@ -1215,6 +5342,11 @@ def switch_dannet_server(server: str) -> Dict[str, str]:
     without restarting the MCP server. Useful for switching between development
     (local) and production (remote) servers.
 
+    The choice only applies to the current MCP session; other sessions keep their
+    server. Cached entities are kept per server, so switching back and forth
+    does not lose them. Not available when the server runs with several worker
+    processes (--workers), which keep no session state.
+
     Args:
         server: Server to switch to. Options:
                - "local": Use localhost:3456 (development server)
@@ -1227,6 +5359,8 @@ def switch_dannet_server(server: str) -> Dict[str, str]:
         - message: Description of the operation
         - previous_url: The URL that was previously active
         - current_url: The URL that is now active
+        - scope: "session", or "default" when called outside of an MCP session
+          (the server of sessions that have not chosen one is switched)
 
     Example:
         # Switch to local development server
@@ -1242,7 +5376,16 @@ def switch_dannet_server(server: str) -> Dict[str, str]:
 
     try:
         # Store the previous URL for response
-        previous_url = dannet_client.base_url if dannet_client else "None"
+        previous_url = get_client().base_url
+
+        if worker_index is not None:
+            return {
+                "status": "error",
+                "message": "Switching servers is not available with --workers: any worker process may serve "
+                           "the next request. Run the server with the wanted --base-url instead.",
+                "previous_url": previous_url,
+                "current_url": previous_url
+            }
 
         # Determine the target URL
         if server.lower() == "local":
@@ -1259,14 +5402,18 @@ def switch_dannet_server(server: str) -> Dict[str, str]:
                 "current_url": previous_url
             }
 
-        # Create new client instance
-        dannet_client = DanNetClient(new_url)
-        _resource_cache.clear()
+        # Clients and caches are shared per server, so nothing is dropped here
+        client = client_for(new_url)
+        session = current_session()
+        if session is not None:
+            _session_servers[session] = client.base_url
+        else:
+            dannet_client = client
 
         # Test the connection with a simple request
         try:
             # Try to access the base endpoint to verify connectivity
-            test_response = dannet_client.client.get(f"{new_url}/")
+            test_response = client.client.get(f"{client.base_url}/")
             if test_response.status_code not in [200, 404]:  # 404 is okay for root endpoint
                 logger.warning(f"Server responded with status {test_response.status_code}, but continuing...")
         except Exception as conn_error:
@@ -1279,7 +5426,8 @@ def switch_dannet_server(server: str) -> Dict[str, str]:
             "status": "success",
             "message": f"Successfully switched DanNet server from {previous_url} to {new_url}",
             "previous_url": previous_url,
-            "current_url": new_url
+            "current_url": new_url,
+            "scope": "session" if session is not None else "default"
         }
 
     except Exception as e:
@@ -1289,12 +5437,12 @@ def switch_dannet_server(server: str) -> Dict[str, str]:
             "status": "error",
             "message": error_msg,
             "previous_url": previous_url if 'previous_url' in locals() else "Unknown",
-            "current_url": dannet_client.base_url if dannet_client else "Unknown"
+            "current_url": get_client().base_url if dannet_client else "Unknown"
         }
 
 
 @mcp.tool()
-def get_current_dannet_server() -> Dict[str, str]:
+def get_current_dannet_server() -> Dict[str, Any]:
     """
     Get information about the currently active DanNet server.
     
@@ -1303,21 +5451,19 @@ def get_current_dannet_server() -> Dict[str, str]:
         - server_url: The base URL of the current DanNet server
         - server_type: "local", "remote", or "custom"
         - status: Connection status information
+        - scope: "session" when the current session chose its server with
+          switch_dannet_server, else "default"
+        - routing: With several upstreams (--upstream), the failovers so far and
+          per upstream its health, request and failure counts, latency average
+          per request class, last health check and last error; else None
     
     Example:
         info = get_current_dannet_server()
         # Returns: {"server_url": "https://wordnet.dk", "server_type": "remote", "status": "active"}
     """
-    global dannet_client
-
-    if dannet_client is None:
-        return {
-            "server_url": "None",
-            "server_type": "uninitialized",
-            "status": "No client initialized"
-        }
-
-    current_url = dannet_client.base_url
+    client = get_client()
+    current_url = client.base_url
+    session = current_session()
 
     # Determine server type
     if current_url == LOCAL_URL:
@@ -1330,7 +5476,7 @@ def get_current_dannet_server() -> Dict[str, str]:
     # Try to check server status
     try:
         # Simple connectivity test
-        test_response = dannet_client.client.get(f"{current_url}/", timeout=5.0)
+        test_response = client.client.get(f"{current_url}/", timeout=5.0)
         status = f"Connected (HTTP {test_response.status_code})"
     except Exception as e:
         status = f"Connection issue: {str(e)[:100]}"
@@ -1338,7 +5484,10 @@ def get_current_dannet_server() -> Dict[str, str]:
     return {
         "server_url": current_url,
         "server_type": server_type,
-        "status": status
+        "status": status,
+        "scope": "session" if session is not None and session in _session_servers else "default",
+        "routing": (upstream_router.stats()
+                    if upstream_router is not None and current_url == upstream_router.primary else None),
     }
 
 
@@ -1355,12 +5504,65 @@ def get_cache_stats() -> Dict[str, Any]:
         Dict with:
         - cache_size: Total number of cached entries
         - cached_keys: List of (base_url, resource_id) pairs currently cached
+        - schema_snapshot_version: Dataset version of the schemas served from the
+          bundled (or refreshed) snapshot
+        - label_cache_size: Number of resource labels cached for enrich_labels
+        - shared_cache: With --workers, the worker answering, and the entries of
+          the cache shared by all workers plus this worker's hits, misses and stores
+        - warm_up: With --warm-up, its state, duration and what it loaded, plus the
+          resource cache hit rate of tool calls with and without the warmed entries
+        - prefetch: With --prefetch, its policy and how many entities it scheduled,
+          fetched, dropped and saw used (hit_rate = used / fetched)
+        - inference_routing: How SPARQL queries without an explicit inference
+          setting were routed (inference, base, observe, auto), the double
+          executions this avoided, and the relations known or learned to be derived
     """
     return {
         "cache_size": len(_resource_cache),
         "cached_keys": [{"base_url": k[0], "resource_id": k[1]} for k in _resource_cache],
         "schema_cache_size": len(_schema_cache),
-        "cached_schemas": list(_schema_cache.keys()),
+        "cached_schemas": _schema_cache.keys(),
+        "schema_snapshot_version": schema_snapshot_version(),
+        "label_cache_size": len(_label_cache),
+        "shared_cache": {"worker": worker_index, **shared_cache.stats()} if shared_cache is not None else None,
+        "warm_up": cache_warmer.stats() if cache_warmer is not None else None,
+        "prefetch": prefetcher.stats() if prefetcher is not None else None,
+        "inference_routing": inference_router.stats(),
+    }
+
+
+@mcp.tool()
+def get_profile_report(top_n: int = 10, tool: Optional[str] = None) -> Dict[str, Any]:
+    """
+    List the heaviest recently profiled tool calls and resource reads.
+
+    Only available when the server runs with --profile, which profiles a sampled
+    fraction of calls. Useful for finding calls that are CPU-bound on the server
+    side rather than waiting on DanNet.
+
+    Args:
+        top_n: Number of calls to return (default: 10)
+        tool: Only report calls of this tool or resource URI (optional)
+
+    Returns:
+        Dict with:
+        - profile_dir: Directory holding per-tool collapsed-stack files (*.folded)
+        - sample_rate: Fraction of calls being profiled
+        - calls: Profiled calls by descending CPU time, each with name, arguments,
+          started_at, wall_ms, cpu_ms, samples and hottest_frames (self samples)
+
+    Example:
+        report = get_profile_report(5, "get_word_overview")
+        # => {"calls": [{"name": "get_word_overview", "cpu_ms": 41.2, ...}], ...}
+    """
+    if profiler is None:
+        return {"error": "Profiling is disabled - start the server with --profile <dir>", "calls": []}
+    calls = [c for c in list(profiler.recent) if tool is None or c["name"] == tool]
+    calls.sort(key=lambda c: -c["cpu_ms"])
+    return {
+        "profile_dir": profiler.directory,
+        "sample_rate": profiler.sample_rate,
+        "calls": calls[:top_n],
     }
 
 
@@ -1684,7 +5886,8 @@ def analyze_namespace_usage(entity_data: Dict[str, Any]) -> Dict[str, Any]:
 
 
 @mcp.tool()
-def sparql_query(query: str, timeout: int = 8000, max_results: int = 100, distinct: bool = True, inference: bool | None = None) -> Dict[str, Any]:
+def sparql_query(query: str, timeout: int = 8000, max_results: int = 100, distinct: bool = True, inference: bool | None = None,
+                 lint: str = "enforce", enrich_labels: bool = False) -> Dict[str, Any]:
     """
     Execute a SPARQL SELECT query against the DanNet triplestore.
 
@@ -1796,6 +5999,8 @@ def sparql_query(query: str, timeout: int = 8000, max_results: int = 100, distin
     }
 
     # TEMPLATE 11: Rank synsets by taxonomic similarity to a known synset
+    # (this scans the whole graph; rank_similar_synsets computes the same
+    # ranking locally in milliseconds)
     # The custom dnf:path / dnf:lch / dnf:wup functions score how close two
     # synsets sit in the wn:hypernym hierarchy; higher = more similar, and a
     # synset scores 1.0 against itself. All three take two synsets and return a
@@ -1825,21 +6030,48 @@ def sparql_query(query: str, timeout: int = 8000, max_results: int = 100, distin
         distinct: Auto-apply DISTINCT to SELECT queries (default: True).
                   Set to False when you need duplicate rows, e.g. for frequency counts.
         inference: Control model selection for query execution (default: None).
-                   None = auto-detect: tries base model first, retries with inference
+                   None = auto-detect: queries on relations known to be derived
+                   (e.g. wn:hyponym) go straight to the inference model, queries
+                   inference cannot change go to the base model only; otherwise
+                   the base model is tried first, with a retry with inference
                    if SELECT results are empty (best for most queries).
                    True = force inference model: needed for inverse relations like
                    wn:hyponym, wn:holonym, etc. that are derived by OWL reasoning.
                    False = force base model only, no retry.
+        lint: Pre-flight check of the rules above, before anything is sent (default: "enforce").
+              "enforce" = apply the safe rewrites (OR-filters on URIs become VALUES,
+              a missing LIMIT is added) and reject queries estimated to scan
+              too much (cartesian products, text FILTERs over unanchored patterns,
+              ORDER BY/GROUP BY over unanchored patterns of 1M+ rows).
+              "warn" = apply the rewrites, report problems but run the query anyway.
+              "off" = send the query unchanged.
+        enrich_labels: Add a "labels" dict with the label of every URI in the results
+                       (default: False). Saves selecting ?label variables: the labels
+                       are looked up afterwards in batches and cached.
 
     Returns:
         Dict containing SPARQL results in standard JSON format:
         - head: Query metadata with variable names
         - results: Bindings array with variable-value mappings
         Each value includes type (uri/literal) and language information when applicable
+        - lint: Present when the pre-flight check found something: estimated_rows,
+          findings (rule, severity, message) and the rewritten_query if changed
+        - labels: {uri: label} for the URIs in the results (only with enrich_labels=True)
 
     Note: Only SELECT queries are supported. The query is validated before execution.
     """
     try:
+        if lint not in ("enforce", "warn", "off"):
+            raise DanNetError(f"Unknown lint mode '{lint}'; use 'enforce', 'warn' or 'off'")
+        analysis = SparqlAnalysis(query, max_results)
+        if lint != "off":
+            if analysis.errors and lint == "enforce":
+                raise DanNetError(
+                    f"Query rejected before execution (estimated ~{analysis.estimated_rows:,} rows scanned): "
+                    f"{'; '.join(analysis.errors)}. Rewrite the query, or pass lint='warn' to run it anyway"
+                )
+            query = analysis.query
+
         # Make the SPARQL request using proper URL encoding
         client = get_client()
         
@@ -1860,12 +6092,89 @@ def sparql_query(query: str, timeout: int = 8000, max_results: int = 100, distin
             request_params["inference"] = "true" if inference else "false"
 
         # Use the standalone retry-enabled function
-        return _make_sparql_request(client, f"{client.base_url}/dannet/sparql", request_params)
+        if inference is None:
+            result = routed_sparql_request(client, request_params, analysis)
+        else:
+            result = _make_sparql_request(client, f"{client.base_url}/dannet/sparql", request_params)
+        if lint != "off" and analysis.findings:
+            result = {**result, "lint": analysis.to_dict()}
+        if enrich_labels:
+            uris = {value["value"]: None for binding in result.get("results", {}).get("bindings", [])
+                    for value in binding.values() if value.get("type") == "uri"}
+            result = {**result, "labels": resolve_labels(list(uris))}
+        return result
 
     except Exception as e:
         raise RuntimeError(f"SPARQL query failed: {e}")
 
 
+@mcp.tool()
+def describe_terms(terms: Union[str, List[str]], language: str = "en") -> Dict[str, Any]:
+    """
+    Explain schema terms: properties, relations, classes and ontological types
+    such as dns:usedForObject, wn:hypernym, ontolex:isEvokedBy or dnc:Animal.
+
+    Answered from an index of the schemas of dns, dnc, wn, ontolex, skos,
+    lexinfo, marl, rdf, rdfs, owl and dc, built once per process from the
+    bundled schema snapshot. Much cheaper than reading dannet://schema/{prefix}
+    when you only need to know what a few terms mean; pass every term you are
+    unsure of in one call.
+
+    Args:
+        terms: Prefixed names or full URIs, e.g. ["dns:usedForObject", "wn:hypernym"]
+        language: Preferred language of labels and comments ("en" or "da");
+                  falls back to whatever the schema provides
+
+    Returns:
+        Dict with:
+        - terms: Per term found, its uri, the schema defining it and, where the
+          schema declares them: type, label, comment, domain, range, super
+          (super-properties or super-classes) and inverse
+        - unknown: Terms not in the index, each with suggestions of terms
+          sharing its local name (e.g. "wn:usedFor" suggests "dns:usedFor")
+
+    Example:
+        describe_terms(["dns:usedForObject", "wn:hypernym", "dnc:Animal"])
+        # => {"terms": {"wn:hypernym": {"uri": "https://globalwordnet.github.io/schemas/wn#hypernym",
+        #               "schema": "wn", "label": "hypernym", "inverse": ["wn:hyponym"], ...}, ...},
+        #     "unknown": {}}
+    """
+    try:
+        index = get_schema_index()
+        found: Dict[str, Dict[str, Any]] = {}
+        unknown: Dict[str, List[str]] = {}
+        for term in [terms] if isinstance(terms, str) else terms:
+            entry = index.lookup(term)
+            if entry is None:
+                unknown[term] = index.suggest(term)
+                continue
+            described: Dict[str, Any] = {}
+            for field in SCHEMA_TERM_ORDER:
+                value = entry.get(field)
+                if isinstance(value, dict):
+                    value = value.get(language) or value.get("en") or next(iter(value.values()), "")
+                if value:
+                    described[field] = value
+            found[term] = described
+        return {"terms": found, "unknown": unknown}
+
+    except Exception as e:
+        raise RuntimeError(f"Failed to describe terms: {e}")
+
+
+def precomputed_resource(fn: Callable[[], str]) -> Callable[[], str]:
+    """
+    Serve a resource built from constant data as precomputed text: `fn` runs
+    once, at import, rather than on every read.
+    """
+    text = fn()
+
+    @functools.wraps(fn)
+    def wrapper() -> str:
+        return text
+    return wrapper
+
+
 @mcp.resource("dannet://ontological-types")
 def get_ontological_types_schema() -> str:
     """
@@ -1940,18 +6249,26 @@ def get_schema_resource(prefix: str) -> str:
         dns_schema = get_schema_resource("dns")
     """
     try:
-        if prefix in _schema_cache:
-            return _schema_cache[prefix]
-        client = get_client()
-        response = client.client.get(f"{client.base_url}/schema/{prefix}")
-        response.raise_for_status()
-        _schema_cache[prefix] = response.text
-        return _schema_cache[prefix]
+        with tracer.span("schema cache", key=prefix) as span:
+            text = _schema_cache.get(prefix)
+            span.set(hit=text is not None)
+            if text is not None:
+                return text
+            text = snapshot_schema(prefix)
+            if text is not None:
+                _schema_cache[prefix] = text
+                watch_schema_version()
+                return text
+            client = get_client()
+            response = client.client.get(f"{client.base_url}/schema/{prefix}")
+            response.raise_for_status()
+            return _schema_cache.setdefault(prefix, response.text)
     except Exception as e:
         return f"Error accessing schema '{prefix}': {e}"
 
 
 @mcp.resource("dannet://schemas")
+@precomputed_resource
 def list_available_schemas() -> str:
     """
     List all available RDF schemas with descriptions and relevance to DanNet.
@@ -2081,6 +6398,7 @@ def list_available_schemas() -> str:
 
 
 @mcp.resource("dannet://namespaces")
+@precomputed_resource
 def get_namespace_documentation() -> str:
     """
     Comprehensive documentation of all namespaces used in DanNet RDF data.
@@ -2187,6 +6505,28 @@ def get_namespace_documentation() -> str:
     return json.dumps(namespaces, indent=2)
 
 
+@mcp.resource("dannet://context")
+def get_entity_context() -> str:
+    """
+    The JSON-LD @context of DanNet entities, shared by every entity tool result.
+
+    get_entity_info, get_synset_info, get_word_info and get_sense_info leave the
+    @context out of their results (unless include_context=True); its prefix
+    mappings are identical across entities and are published here once instead.
+    Covers every prefix used by the entities returned so far.
+
+    Returns:
+        JSON object: {"@context": {"dn": "https://wordnet.dk/dannet/data/", ...}}
+    """
+    return json.dumps({"@context": entity_context()}, indent=2)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint (HTTP mode), served next to /mcp."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 def _detect_available_server() -> str:
     """
     Detect if local DanNet server is available, fallback to remote.
@@ -2209,6 +6549,366 @@ def _detect_available_server() -> str:
     return REMOTE_URL
 
 
+# How long (seconds) the outcome of a previous launch's server detection is trusted
+BACKEND_CACHE_TTL = 24 * 3600
+
+
+class ServerProbe:
+    """
+    Runs _detect_available_server in the background, so startup never waits on it.
+
+    The outcome is stored in the data directory. Until the probe is done, the
+    outcome of the previous launch (if recent) is used; without one, callers
+    needing the URL wait for the probe.
+    """
+
+    def __init__(self):
+        self.cached = self._read_cache()
+        self._url: Optional[str] = None
+        self._done = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    @staticmethod
+    def _read_cache() -> Optional[str]:
+        try:
+            with open(_data_path("backend.json"), encoding='utf-8') as f:
+                cached = json.load(f)
+            if time.time() - cached["checked_at"] < BACKEND_CACHE_TTL:
+                return cached["url"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _run(self) -> None:
+        global dannet_client
+        try:
+            self._url = _detect_available_server()
+            os.makedirs(DATA_DIR, exist_ok=True)
+            with open(_data_path("backend.json"), 'w', encoding='utf-8') as f:
+                json.dump({"url": self._url, "checked_at": time.time()}, f)
+        except Exception as e:
+            logger.debug(f"Could not store the detected server: {e}")
+        finally:
+            self._done.set()
+
+        # A client created from an outdated cached choice (and not switched since) is replaced
+        if self.cached and self._url and self._url != self.cached:
+            with _client_lock:
+                if dannet_client is not None and dannet_client.base_url == self.cached.rstrip('/'):
+                    logger.info(f"Detected server changed to {self._url}")
+                    dannet_client = client_for(self._url)
+
+    def base_url(self) -> str:
+        if not self._done.is_set() and self.cached:
+            return self.cached
+        self._done.wait()
+        return self._url or REMOTE_URL
+
+
+# Schemas loaded by the warm-up: those the schema resources document
+WARM_UP_SCHEMAS = ("dns", "dnc", "wn", "ontolex", "skos", "lexinfo", "marl")
+# Entity requests in flight during the warm-up
+WARM_UP_CONCURRENCY = 4
+
+
+class CacheWarmer:
+    """
+    Loads the most central synsets, the schemas and their term index into the caches at startup.
+
+    The DanNet web service warms its entity cache at boot for its largest
+    synsets, since those are the slowest to look up; this does the same for
+    the MCP server's caches with the top synsets by indegree in the relation
+    graph (synset-to-synset relations pointing at them, the measure of the
+    service's synset-indegree cache). It runs in a background thread, so the
+    server is ready meanwhile; tool calls arriving early just miss the cache.
+    With --workers, worker 0 loads the synsets, into the shared cache; the
+    other workers are started with synsets=0 and only build their local indexes.
+
+    Resource cache lookups are counted per outcome (Metrics.observe_cache). The
+    first hit on a warmed entry counts as "warmed": without the warm-up it would
+    have been a miss, so stats() can report the hit rate with and without it.
+    """
+
+    def __init__(self, synsets: int):
+        self.synsets = synsets
+        self.state = "pending"
+        self.duration: Optional[float] = None
+        self.loaded = 0
+        self.failed = 0
+        self.schemas = 0
+        self._warmed: Set[tuple] = set()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, name="warm-up", daemon=True).start()
+
+    def _fetch(self, client: "DanNetClient", synset_id: str) -> None:
+        current_tool.set("warm_up")
+        try:
+            client.get_record(synset_id)
+            with self._lock:
+                self._warmed.add((client.base_url, synset_id))
+                self.loaded += 1
+        except Exception as e:
+            logger.debug(f"Warm-up of {synset_id} failed: {e}")
+            with self._lock:
+                self.failed += 1
+
+    def _run(self) -> None:
+        current_tool.set("warm_up")
+        self.state = "running"
+        start = time.perf_counter()
+        try:
+            for prefix in WARM_UP_SCHEMAS:
+                if not get_schema_resource(prefix).startswith("Error accessing"):
+                    self.schemas += 1
+            get_schema_index()
+            graph = get_relation_graph()
+            if graph is None:
+                raise DanNetError("relation graph unavailable")
+            client = get_client()
+            todo = [s for s in graph.top_by_indegree(self.synsets) if (client.base_url, s) not in _resource_cache]
+            with ThreadPoolExecutor(max_workers=WARM_UP_CONCURRENCY, thread_name_prefix="warm-up") as pool:
+                list(pool.map(lambda synset_id: self._fetch(client, synset_id), todo))
+            self.state = "done"
+        except Exception as e:
+            logger.warning(f"Cache warm-up stopped early: {e}")
+            self.state = "failed"
+        self.duration = time.perf_counter() - start
+        logger.info(f"Cache warm-up {self.state} in {self.duration:.1f}s: {self.loaded} synsets "
+                    f"({self.failed} failed), {self.schemas} schemas")
+
+    def claim(self, cache_key: tuple) -> bool:
+        """Whether this is the first hit on an entry the warm-up loaded."""
+        with self._lock:
+            if cache_key in self._warmed:
+                self._warmed.discard(cache_key)
+                return True
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with metrics._lock:
+            counts: Dict[str, int] = {}
+            for (tool, outcome), n in metrics.cache_lookups.items():
+                if tool not in ("warm_up", "prefetch"):
+                    counts[outcome] = counts.get(outcome, 0) + n
+        lookups = sum(counts.values())
+        hits_without = counts.get("hit", 0) + counts.get("prefetched", 0)
+        hits = hits_without + counts.get("warmed", 0)
+        return {
+            "state": self.state,
+            "duration_seconds": round(self.duration, 3) if self.duration is not None else None,
+            "synsets_requested": self.synsets,
+            "synsets_loaded": self.loaded,
+            "synsets_failed": self.failed,
+            "schemas_loaded": self.schemas,
+            "lookups": lookups,
+            "warmed_hits": counts.get("warmed", 0),
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "hit_rate_without_warm_up": round(hits_without / lookups, 3) if lookups else None,
+        }
+
+
+cache_warmer: Optional[CacheWarmer] = None
+
+
+def _prefetch_search_results(result: Any) -> List[str]:
+    """Synsets of get_word_synsets results, in result order."""
+    if isinstance(result, list):
+        return [r.synset_id for r in result if isinstance(r, SearchResult) and r.synset_id]
+    if isinstance(result, dict) and result.get('synset_id'):
+        return [result['synset_id']]
+    return []
+
+
+def _prefetch_relations(*relations: str) -> Callable[[Any], List[str]]:
+    """Synsets referenced by the given relations of an entity result, relation by relation."""
+    def candidates(result: Any) -> List[str]:
+        ids: List[str] = []
+        if isinstance(result, dict):
+            for relation in relations:
+                values = result.get(relation, [])
+                ids += [parse_resource_id(v) for v in (values if isinstance(values, list) else [values])
+                        if isinstance(v, str) and v.startswith('dn:')]
+        return ids
+    return candidates
+
+
+# What an agent typically asks for after each tool: tool -> likely next entity IDs, most likely first
+PREFETCH_CANDIDATES: Dict[str, Callable[[Any], List[str]]] = {
+    "get_word_synsets": _prefetch_search_results,
+    "get_synset_info": _prefetch_relations("wn:hypernym", "wn:hyponym"),
+    "get_word_info": _prefetch_relations("ontolex:evokes"),
+}
+# Default --prefetch-policy: tool=number of entities to prefetch after it
+DEFAULT_PREFETCH_POLICY = "get_word_synsets=5,get_synset_info=4,get_word_info=3"
+
+
+class Prefetcher:
+    """
+    Speculatively loads the entities a tool call's result suggests will be asked for next.
+
+    After a tool in the policy returns, its first candidates (PREFETCH_CANDIDATES)
+    that are not cached yet are fetched into the resource cache by a small pool of
+    background workers. The pool size is the concurrency budget; a token bucket
+    limits the request rate. Candidates beyond a short queue are dropped rather
+    than delaying later, likelier ones.
+
+    A tool call that misses on an entity being prefetched waits for it instead
+    of requesting it again. The first use of a prefetched entity counts as a
+    "prefetched" cache lookup; stats() relates those to the prefetches made, so
+    the policy can be tuned.
+    """
+
+    def __init__(self, policy: Dict[str, int], concurrency: int = 2, rate: float = 10.0):
+        self.policy = policy
+        self.concurrency = concurrency
+        self.rate = rate
+        self.max_queued = 4 * concurrency
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._pending: Dict[tuple, threading.Event] = {}
+        self._started: Set[tuple] = set()
+        self._prefetched: Set[tuple] = set()
+        self._tokens = float(concurrency)
+        self._refilled = time.monotonic()
+        self.counts = {"scheduled": 0, "fetched": 0, "failed": 0, "dropped": 0, "used": 0, "waited": 0}
+
+    @staticmethod
+    def parse_policy(spec: str) -> Dict[str, int]:
+        """
+        "get_word_synsets=5,get_synset_info=4" -> {"get_word_synsets": 5, "get_synset_info": 4}.
+        Raises ValueError for malformed counts and tools without a prefetch rule.
+        """
+        policy = {}
+        for item in filter(None, (part.strip() for part in spec.split(','))):
+            tool, _, n = item.partition('=')
+            policy[tool] = int(n) if n else 1
+        unknown = set(policy) - set(PREFETCH_CANDIDATES)
+        if unknown:
+            raise ValueError(f"No prefetch rule for {', '.join(sorted(unknown))}; "
+                             f"available: {', '.join(PREFETCH_CANDIDATES)}")
+        return policy
+
+    def after(self, tool: str, result: Any) -> None:
+        """Schedule the prefetches suggested by a tool's result; returns at once."""
+        limit = self.policy.get(tool)
+        if not limit:
+            return
+        try:
+            candidates = PREFETCH_CANDIDATES[tool](result)
+        except Exception as e:
+            logger.debug(f"No prefetch candidates from {tool}: {e}")
+            return
+        client = get_client()
+        scheduled = 0
+        for resource_id in dict.fromkeys(candidates):
+            if scheduled >= limit:
+                break
+            key = (client.base_url, resource_id)
+            with self._lock:
+                if key in _resource_cache or key in self._pending:
+                    continue
+                if len(self._pending) >= self.max_queued:
+                    self.counts["dropped"] += 1
+                    continue
+                self._pending[key] = threading.Event()
+                self.counts["scheduled"] += 1
+            self._pool.submit(self._fetch, client, resource_id, key)
+            scheduled += 1
+
+    def _take_token(self) -> None:
+        """Block until the rate limit allows another request."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(float(self.concurrency), self._tokens + (now - self._refilled) * self.rate)
+                self._refilled = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def _fetch(self, client: "DanNetClient", resource_id: str, key: tuple) -> None:
+        current_tool.set("prefetch")
+        try:
+            self._take_token()
+            with self._lock:
+                # A tool call may have fetched it meanwhile
+                if key in _resource_cache:
+                    return
+                self._started.add(key)
+            client.get_record(resource_id)
+            with self._lock:
+                self._prefetched.add(key)
+                self.counts["fetched"] += 1
+        except Exception as e:
+            logger.debug(f"Prefetch of {resource_id} failed: {e}")
+            with self._lock:
+                self.counts["failed"] += 1
+        finally:
+            with self._lock:
+                event = self._pending.pop(key, None)
+                self._started.discard(key)
+            if event is not None:
+                event.set()
+
+    def wait(self, cache_key: tuple) -> bool:
+        """
+        On a cache miss: wait for a prefetch of the entry whose request is under
+        way; True if there was one. A prefetch still queued is not waited for,
+        as it could take longer than requesting the entry directly.
+        """
+        if current_tool.get() == "prefetch":
+            return False
+        with self._lock:
+            event = self._pending.get(cache_key) if cache_key in self._started else None
+        if event is None:
+            return False
+        event.wait(TIMEOUT)
+        with self._lock:
+            self.counts["waited"] += 1
+        return True
+
+    def claim(self, cache_key: tuple) -> bool:
+        """Whether this is the first use of an entry the prefetcher loaded."""
+        with self._lock:
+            if cache_key in self._prefetched:
+                self._prefetched.discard(cache_key)
+                self.counts["used"] += 1
+                return True
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self.counts)
+        fetched = counts["fetched"]
+        return {
+            "policy": self.policy,
+            "concurrency": self.concurrency,
+            "rate_per_second": self.rate,
+            **counts,
+            "in_flight": len(self._pending),
+            # Share of prefetched entities a tool call went on to use
+            "hit_rate": round(counts["used"] / fetched, 3) if fetched else None,
+        }
+
+
+# Set from the command line (--prefetch)
+prefetcher: Optional[Prefetcher] = None
+
+
+def observe_cache_lookup(cache_key: tuple, hit: bool) -> None:
+    """Count a resource cache lookup, telling first hits on warmed and prefetched entries apart."""
+    if not hit:
+        metrics.observe_cache("miss")
+    elif cache_warmer is not None and cache_warmer.claim(cache_key):
+        metrics.observe_cache("warmed")
+    elif prefetcher is not None and prefetcher.claim(cache_key):
+        metrics.observe_cache("prefetched")
+    else:
+        metrics.observe_cache("hit")
+
+
 @mcp.prompt()
 def analyze_danish_word(word: str, include_examples: bool = True) -> str:
     """
@@ -2441,9 +7141,106 @@ Analyze:
 Create a sense map that helps learners understand how one word form carries multiple meanings in Danish."""
 
 
+def fork_workers(workers: int, host: str, port: int) -> Optional[socket.socket]:
+    """
+    Bind the HTTP port and fork `workers` processes to serve it (--workers).
+
+    In each worker, returns the listening socket, with the worker's shared and
+    local caches set up; the kernel hands every connection to one of them. In
+    the parent, supervises the workers, replacing any that die, until it is
+    stopped; then returns None. A worker exiting with a usage error (status 2),
+    or a replacement dying again within WORKER_MIN_UPTIME, stops all of them and
+    exits with its status instead. Forking happens before any thread is
+    started, so every worker begins from a clean copy of the configured module.
+    """
+    global shared_cache, worker_index, _followed_versions
+    listener = socket.create_server((host, port), backlog=2048)
+    os.makedirs(DATA_DIR, exist_ok=True)
+    # Lives as long as the deployment, like the cache of a single process
+    path = _data_path(f"shared-cache-{os.getpid()}.sqlite3")
+    pids: Dict[int, int] = {}
+    started_at: Dict[int, float] = {}
+    replaced: Set[int] = set()
+    stopping = False
+    failed = 0
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in pids:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    def start(index: int) -> bool:
+        """Fork worker `index`; True in the worker."""
+        pid = os.fork()
+        if pid:
+            pids[pid] = index
+            started_at[pid] = time.monotonic()
+        return pid == 0
+
+    worker = next((index for index in range(workers) if start(index)), None)
+    if worker is None:
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        logger.info(f"Serving on {host}:{port} with {workers} worker processes")
+        while pids and worker is None:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            index = pids.pop(pid, None)
+            uptime = time.monotonic() - started_at.pop(pid, 0.0)
+            if index is None or stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code == 2 or (index in replaced and uptime < WORKER_MIN_UPTIME):
+                logger.error(f"Worker {index} exited ({code}) after {uptime:.1f} s; stopping the server")
+                failed = code if code > 0 else 1
+                stop(None, None)
+                continue
+            logger.warning(f"Worker {index} exited ({code}); starting a new one")
+            replaced.add(index)
+            time.sleep(1)
+            if start(index):
+                worker = index
+    if worker is None:
+        listener.close()
+        for suffix in ("", "-wal", "-shm"):
+            with contextlib.suppress(OSError):
+                os.remove(path + suffix)
+        if failed:
+            sys.exit(failed)
+        return None
+
+    worker_index = worker
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    shared_cache = SharedCache(path)
+    # The shared cache holds the entities; what each worker keeps besides is bounded
+    for cache in (_resource_cache, _payload_sizes, _label_cache):
+        cache.max_entries = WORKER_CACHE_ENTRIES
+    _followed_versions = (stored_data_version(), schema_snapshot_version())
+    return listener
+
+
+def serve_worker(listener: socket.socket) -> None:
+    """Serve the streamable HTTP app on the listening socket of fork_workers."""
+    # Imported here, as the transports of FastMCP do, to keep startup fast
+    import uvicorn
+
+    # Any worker may get any request of a session, so none can keep session state
+    mcp.settings.stateless_http = True
+    config = uvicorn.Config(mcp.streamable_http_app(), log_level=mcp.settings.log_level.lower())
+    uvicorn.Server(config).run(sockets=[listener])
+
+
 def main():
     """Main entry point with command line argument parsing"""
-    global dannet_client, mcp
+    global DATA_DIR, cassette_recorder, cassette_replay, profiler, default_base_url, server_probe, cache_warmer
+    global prefetcher, upstream_router
 
     parser = argparse.ArgumentParser(
         description="DanNet MCP Server - Access Danish WordNet data via MCP. Defaults to local server if available, otherwise uses remote server."
@@ -2458,6 +7255,117 @@ def main():
         type=str,
         help="Custom base URL for DanNet API"
     )
+    parser.add_argument(
+        "--upstream",
+        action="append",
+        metavar="URL",
+        help="DanNet server to send requests to; repeat it to route each request to the fastest healthy one "
+             "and fail over between them ('local' and 'remote' are accepted)"
+    )
+    parser.add_argument(
+        "--health-interval",
+        type=float,
+        default=10.0,
+        metavar="SECONDS",
+        help="Seconds between health checks of the upstreams (default: 10)"
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=str,
+        help=f"Directory for local copies of the DanNet exports (default: {DATA_DIR})"
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        metavar="CASSETTE",
+        help="Record all upstream traffic and tool calls to a cassette file (gzipped JSONL)"
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        metavar="CASSETTE",
+        help="Serve upstream requests from a recorded cassette instead of the network"
+    )
+    parser.add_argument(
+        "--replay-latency",
+        choices=["original", "zero"],
+        default="original",
+        help="Delay replayed responses by their recorded duration, or not at all (default: original)"
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        metavar="DIR",
+        help="Profile a sample of tool calls, writing collapsed stacks per tool to DIR"
+    )
+    parser.add_argument(
+        "--profile-sample",
+        type=float,
+        default=0.1,
+        help="Fraction of tool calls to profile (default: 0.1)"
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=1.0,
+        metavar="MS",
+        help="Stack sampling interval (default: 1 ms)"
+    )
+    parser.add_argument(
+        "--trace-file",
+        type=str,
+        help="Append a trace of every tool call to this JSONL file"
+    )
+    parser.add_argument(
+        "--trace-otlp",
+        type=str,
+        metavar="URL",
+        help="Send traces to an OpenTelemetry collector (OTLP/HTTP JSON, e.g. http://localhost:4318)"
+    )
+    parser.add_argument(
+        "--trace-sample",
+        type=float,
+        default=1.0,
+        help="Fraction of tool calls to trace (default: 1.0)"
+    )
+    parser.add_argument(
+        "--trace-slow",
+        type=float,
+        metavar="MS",
+        help="Also trace every tool call taking at least this many milliseconds, regardless of sampling"
+    )
+    parser.add_argument(
+        "--warm-up",
+        type=int,
+        default=0,
+        metavar="N",
+        help="At startup, load the N synsets with the highest indegree and the schemas into the cache "
+             "in the background (default: 0 = off)"
+    )
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="After tool calls, load the entities likely to be asked for next into the cache in the background"
+    )
+    parser.add_argument(
+        "--prefetch-policy",
+        type=str,
+        default=DEFAULT_PREFETCH_POLICY,
+        metavar="TOOL=N,...",
+        help=f"Entities to prefetch after each tool (default: {DEFAULT_PREFETCH_POLICY})"
+    )
+    parser.add_argument(
+        "--prefetch-concurrency",
+        type=int,
+        default=2,
+        help="Prefetch requests in flight at most (default: 2)"
+    )
+    parser.add_argument(
+        "--prefetch-rate",
+        type=float,
+        default=10.0,
+        help="Prefetch requests per second at most (default: 10)"
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -2474,6 +7382,13 @@ def main():
         default=8000,
         help="HTTP server port (default: 8000)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Serve HTTP from N worker processes sharing the port and a cache (default: 1)"
+    )
     parser.add_argument(
         "--host",
         type=str,
@@ -2486,11 +7401,68 @@ def main():
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    if args.data_dir:
+        DATA_DIR = os.path.expanduser(args.data_dir)
+
+    # Every usage error is reported here, before --workers forks
+    if args.workers > 1:
+        if not args.http:
+            parser.error("--workers requires --http")
+        if args.record:
+            parser.error("--record cannot be combined with --workers")
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be combined")
+    if args.upstream and (args.base_url or args.local or args.replay):
+        parser.error("--upstream cannot be combined with --base-url, --local or --replay")
+    prefetch_policy = None
+    if args.prefetch:
+        try:
+            prefetch_policy = Prefetcher.parse_policy(args.prefetch_policy)
+        except ValueError as e:
+            parser.error(f"--prefetch-policy: {e}")
+
+    listener = None
+    if args.workers > 1:
+        # Before anything starts a thread; the workers run the rest of main()
+        listener = fork_workers(args.workers, args.host, args.port)
+        if listener is None:
+            return
+
+    if args.profile:
+        profiler = Profiler(os.path.expanduser(args.profile), args.profile_sample, args.profile_interval / 1000)
+        logger.info(f"Profiling {args.profile_sample:.0%} of tool calls into {args.profile}")
+
+    if args.trace_file:
+        tracer.exporters.append(JsonlSpanExporter(os.path.expanduser(args.trace_file)))
+    if args.trace_otlp:
+        tracer.exporters.append(OtlpSpanExporter(args.trace_otlp))
+    if tracer.exporters:
+        tracer.sample_rate = args.trace_sample
+        if args.trace_slow is not None:
+            tracer.slow_threshold = args.trace_slow / 1000
+        atexit.register(tracer.close)
+        logger.info(f"Tracing {args.trace_sample:.0%} of tool calls")
+
     # Check environment variable for local mode
     env_local = os.getenv('DANNET_MCP_LOCAL', '').lower() == 'true'
 
+    if args.replay:
+        cassette_replay = ReplayTransport(os.path.expanduser(args.replay), args.replay_latency)
+        logger.info(f"Replaying upstream traffic from {args.replay} ({args.replay_latency} latency)")
+    if args.upstream:
+        urls = [{"local": LOCAL_URL, "remote": REMOTE_URL}.get(url.lower(), url) for url in args.upstream]
+        upstream_router = UpstreamRouter(urls, args.health_interval)
+        logger.info(f"Routing requests between the upstreams {', '.join(urls)}")
+
+    # Tool schemas are built while the transport starts up
+    threading.Thread(target=mcp.register_pending_tools, daemon=True).start()
+
     # Determine base URL with precedence: CLI args > env vars > auto-detect > remote fallback
-    if args.base_url:
+    base_url = None
+    if upstream_router is not None:
+        # Clients and caches use the first upstream's URL; the router picks the actual server
+        base_url = upstream_router.primary
+    elif args.base_url:
         # Explicit base URL argument takes highest precedence
         base_url = args.base_url
         logger.info(f"Using explicitly specified base URL: {base_url}")
@@ -2503,19 +7475,39 @@ def main():
             logger.info("Local mode enabled via --local command line flag")
         elif env_local:
             logger.info("Local mode enabled via DANNET_MCP_LOCAL environment variable")
+    elif cassette_replay is not None:
+        # Replay: the server the cassette was recorded against
+        base_url = cassette_replay.base_url or REMOTE_URL
     else:
-        # Auto-detect: try local first, fallback to remote
-        base_url = _detect_available_server()
-
-    # Initialize client with the chosen base URL
-    dannet_client = DanNetClient(base_url)
-
-    logger.info(f"Starting DanNet MCP Server with base URL: {base_url}")
+        # Auto-detect in the background: try local first, fallback to remote
+        server_probe = ServerProbe()
+
+    if args.record:
+        recorded_url = base_url or server_probe.base_url()
+        cassette_recorder = CassetteRecorder(os.path.expanduser(args.record), recorded_url)
+        atexit.register(cassette_recorder.close)
+        logger.info(f"Recording upstream traffic and tool calls to {args.record}")
+
+    if base_url:
+        default_base_url = base_url
+        logger.info(f"Starting DanNet MCP Server with base URL: {base_url}")
+    else:
+        logger.info("Starting DanNet MCP Server, detecting the DanNet server in the background")
+    # The client is created on first use (get_client); have it ready meanwhile
+    threading.Thread(target=get_client, daemon=True).start()
+    if args.warm_up > 0:
+        cache_warmer = CacheWarmer(args.warm_up if owns_data_dir() else 0)
+    if prefetch_policy is not None:
+        prefetcher = Prefetcher(prefetch_policy, args.prefetch_concurrency, args.prefetch_rate)
+        logger.info(f"Prefetching after tool calls: {args.prefetch_policy}")
 
     # Update MCP server settings for HTTP mode if requested
     if args.http:
         mcp.settings.host = args.host
         mcp.settings.port = args.port
+        if listener is not None:
+            serve_worker(listener)
+            return
         logger.info(f"Running in HTTP mode on {args.host}:{args.port}")
         mcp.run(transport="streamable-http")
     else: